@@ -0,0 +1,117 @@
+"""Benchmarks for ai_analyst.py (offline: no yfinance download is made)."""
+
+import numpy as np
+import pandas as pd
+
+from harness import SEED, benchmark, engine_inputs, import_project, seeded_ohlcv
+
+PROJECT = 'projects/advanced/ai_stock_analyst'
+
+
+@benchmark('analyst', params=[126, 2520])
+def technical_indicators(n_bars):
+    """Indicator block of AIStockAnalyst.technical_analysis on offline OHLCV."""
+    ai_analyst = import_project(PROJECT, 'ai_analyst')
+    df = seeded_ohlcv(n_bars)
+    return lambda: ai_analyst.compute_technical_indicators(df)
+
+
+@benchmark('analyst', params=[10, 500])
+def universe_summary(n_tickers):
+    """indicators.technical_summary over a 2-year daily panel."""
+    indicators = import_project(PROJECT, 'indicators')
+    panel = indicators.to_panel({f'T{i:04d}': seeded_ohlcv(504, seed=i) for i in range(n_tickers)})
+    return lambda: indicators.technical_summary(panel)
+
+
+@benchmark('analyst', params=[10])
+def universe_summary_tz_aware(n_tickers):
+    """indicators.technical_summary over yfinance-style America/New_York histories."""
+    indicators = import_project(PROJECT, 'indicators')
+    histories = {f'T{i:04d}': seeded_ohlcv(504, seed=i, tz='America/New_York') for i in range(n_tickers)}
+    return lambda: indicators.technical_summary(indicators.to_panel(histories))
+
+
+def _gappy_histories(n_tickers, n_bars=504, missing=0.05):
+    """Seeded histories that each miss a random 5% of the dates (holidays, data gaps)."""
+    rng = np.random.default_rng(SEED)
+    return {f'T{i:04d}': seeded_ohlcv(n_bars, seed=i)[rng.random(n_bars) >= missing]
+            for i in range(n_tickers)}
+
+
+@benchmark('analyst', params=[10, 500])
+def universe_summary_gaps(n_tickers):
+    """indicators.technical_summary when tickers trade on different dates."""
+    indicators = import_project(PROJECT, 'indicators')
+    panel = indicators.to_panel(_gappy_histories(n_tickers))
+    return lambda: indicators.technical_summary(panel)
+
+
+@benchmark('analyst', params=[10, 500])
+def engine_feature_table(n_tickers):
+    """indicators.feature_table (every date × ticker) over a 2-year daily panel."""
+    indicators = import_project(PROJECT, 'indicators')
+    panel = indicators.to_panel({f'T{i:04d}': seeded_ohlcv(504, seed=i) for i in range(n_tickers)})
+    return lambda: indicators.feature_table(panel)
+
+
+@benchmark('analyst', params=[500])
+def engine_feature_table_gaps(n_tickers):
+    """indicators.feature_table when tickers trade on different dates."""
+    indicators = import_project(PROJECT, 'indicators')
+    panel = indicators.to_panel(_gappy_histories(n_tickers))
+    return lambda: indicators.feature_table(panel)
+
+
+@benchmark('analyst', params=[252, 390])
+def strategy_backtest_grid(n_bars):
+    """All strategy types × risk levels of the Feature 3 simulator on one history."""
+    strategy_backtest = import_project(PROJECT, 'strategy_backtest')
+    df = seeded_ohlcv(n_bars)
+    return lambda: strategy_backtest.backtest_grid({s: df for s in strategy_backtest.STRATEGY_DATA})
+
+
+@benchmark('analyst', params=[100, 1000])
+def max_sharpe_portfolio(n_assets):
+    """Long-only max-Sharpe weights (frontier + golden section) for `n_assets` assets."""
+    portfolio_optimizer = import_project(PROJECT, 'portfolio_optimizer')
+    returns = portfolio_optimizer.synthetic_returns(n_assets)
+
+    def run():
+        # Fresh optimizer each call so cached solutions don't warm-start the next repeat
+        return portfolio_optimizer.PortfolioOptimizer(returns).max_sharpe()
+    return run
+
+
+@benchmark('analyst', params=[100, 1000])
+def risk_parity_portfolio(n_assets):
+    """Equal risk contribution weights for `n_assets` assets."""
+    portfolio_optimizer = import_project(PROJECT, 'portfolio_optimizer')
+    optimizer = portfolio_optimizer.PortfolioOptimizer(portfolio_optimizer.synthetic_returns(n_assets))
+    return optimizer.risk_parity
+
+
+@benchmark('analyst', params=[10_000, 1_000_000])
+def altman_credit_scores(n_issuers):
+    """Altman Z'' scores and implied ratings for a universe of issuers."""
+    credit_scoring = import_project(PROJECT, 'credit_scoring')
+    fundamentals = credit_scoring.synthetic_fundamentals(n_issuers)
+    return lambda: credit_scoring.credit_scores(fundamentals)
+
+
+@benchmark('analyst', number=1, repeat=3, params=[1000])
+def consensus_analyze(n_rows):
+    """MultiModelEngine.analyze called once per row."""
+    enhanced_engine = import_project(PROJECT, 'enhanced_engine')
+    engine = enhanced_engine.MultiModelEngine()
+    rows = engine_inputs(n_rows)
+    return lambda: [engine.analyze(row) for row in rows]
+
+
+@benchmark('analyst', params=[1000, 100_000])
+def consensus_compiled(n_rows):
+    """MultiModelEngine.analyze_batch (compiled lookup tables) over all rows."""
+    enhanced_engine = import_project(PROJECT, 'enhanced_engine')
+    engine = enhanced_engine.MultiModelEngine()
+    rows = pd.DataFrame(engine_inputs(n_rows))
+    return lambda: engine.analyze_batch(rows)
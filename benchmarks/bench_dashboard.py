@@ -0,0 +1,38 @@
+"""Benchmarks for the financial dashboard's metric calculations."""
+
+import numpy as np
+import pandas as pd
+
+from harness import SEED, benchmark, import_project, seeded_ohlcv
+
+PROJECT = 'projects/intermediate/financial_dashboard'
+
+
+def _silence_streamlit():
+    """st.cache_data warns that there is no Streamlit runtime; expected here."""
+    import streamlit.logger
+    streamlit.logger.set_log_level('error')
+
+
+# case -> (trading days, bars per day)
+CASES = {'1Y-daily': (252, 1), '5Y-daily': (1260, 1), '1Y-minute': (252, 390)}
+
+
+@benchmark('dashboard', params=list(CASES))
+def calculate_metrics(case):
+    """market_data.calculate_metrics (the metrics shown in app.py)."""
+    _silence_streamlit()
+    market_data = import_project(PROJECT, 'market_data')
+    days, per_day = CASES[case]
+    df = seeded_ohlcv(days * per_day, freq='min' if per_day > 1 else 'B')
+    return lambda: market_data.calculate_metrics(df, periods_per_year=252 * per_day)
+
+
+@benchmark('dashboard', params=[10, 500])
+def calculate_metrics_table(n_tickers):
+    """market_data.calculate_metrics_table for a watchlist of `n_tickers`."""
+    _silence_streamlit()
+    market_data = import_project(PROJECT, 'market_data')
+    rng = np.random.default_rng(SEED)
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (252, n_tickers)), axis=0)))
+    return lambda: market_data.calculate_metrics_table(closes)
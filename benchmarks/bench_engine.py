@@ -0,0 +1,46 @@
+"""Benchmarks for the multi-model engine in projects/advanced/ai_stock_analyst."""
+
+import random
+
+import numpy as np
+
+from harness import SEED, benchmark, engine_inputs, import_project, quiet
+
+PROJECT = 'projects/advanced/ai_stock_analyst'
+
+
+@benchmark('engine', params=[1, 1000])
+def multi_model_analyze(n):
+    """MultiModelEngine.analyze over `n` inputs."""
+    engine = import_project(PROJECT, 'enhanced_engine').MultiModelEngine()
+    inputs = engine_inputs(n)
+    return lambda: [engine.analyze(data) for data in inputs]
+
+
+@benchmark('engine', number=1, repeat=5, params=[100, 1000])
+def backtester_run_simulation(iterations):
+    """MarketBacktester.run_simulation from a fresh analyst with a fixed seed."""
+    engine = import_project(PROJECT, 'enhanced_engine')
+
+    def run():
+        random.seed(SEED)
+        analyst = engine.EnhancedAIAnalyst(initial_capital=100000)
+        with quiet():
+            engine.MarketBacktester(analyst).run_simulation('BENCH', iterations=iterations)
+
+    return run
+
+
+@benchmark('engine', params=[100, 10_000])
+def performance_calculate_metrics(n_trades):
+    """PerformanceAnalytics.calculate_metrics over `n_trades` recorded trades."""
+    engine = import_project(PROJECT, 'enhanced_engine')
+    rng = np.random.default_rng(SEED)
+    analytics = engine.PerformanceAnalytics()
+    entries = rng.uniform(50, 300, n_trades)
+    exits = entries * (1 + rng.normal(0, 0.03, n_trades))
+    for entry, exit_, direction, size, hours in zip(
+            entries, exits, rng.choice(['LONG', 'SHORT'], n_trades),
+            rng.uniform(1_000, 20_000, n_trades), rng.uniform(1, 72, n_trades)):
+        analytics.record_trade(float(entry), float(exit_), str(direction), float(size), float(hours))
+    return analytics.calculate_metrics
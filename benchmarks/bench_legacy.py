@@ -0,0 +1,84 @@
+"""Benchmarks for curriculum/legacy kernels."""
+
+import numpy as np
+
+from harness import SEED, benchmark, import_project
+
+PROJECT = 'curriculum/legacy'
+
+
+def _grid(size):
+    return np.linspace(-2.25, 0.75, size), np.linspace(-1.25, 1.25, size)
+
+
+@benchmark('legacy', number=1, repeat=3, params=[50])
+def mandelbrot_reference(size):
+    """Pure-Python reference `mandelbrot` on a size x size grid, 200 iterations."""
+    x, y = _grid(size)
+    mandlebrot = import_project(PROJECT, 'mandlebrot')
+    return lambda: mandlebrot.mandelbrot(x, y, 200, verbose=False)
+
+
+@benchmark('legacy', number=1, repeat=3, params=[50, 500])
+def mandelbrot_vectorized(size):
+    """NumPy `mandelbrot_vectorized` on a size x size grid, 200 iterations."""
+    x, y = _grid(size)
+    mandlebrot = import_project(PROJECT, 'mandlebrot')
+    return lambda: mandlebrot.mandelbrot_vectorized(x, y, 200, verbose=False)
+
+
+@benchmark('legacy', repeat=3)
+def yield_curve_build():
+    """Parse data/yield_curve.csv, fit the par splines and bootstrap every date."""
+    yield_curve = import_project(PROJECT, 'yield_curve')
+    return yield_curve.YieldCurve.from_csv
+
+
+@benchmark('legacy', params=[10_000, 1_000_000])
+def yield_curve_discount(n_queries):
+    """Discount factors at random (date, tenor) pairs."""
+    yield_curve = import_project(PROJECT, 'yield_curve')
+    curve = yield_curve.YieldCurve.from_csv()
+    rng = np.random.default_rng(SEED)
+    dates, tenors = rng.choice(curve.dates, n_queries), rng.uniform(0, 30, n_queries)
+    return lambda: curve.discount(dates, tenors)
+
+
+@benchmark('legacy', number=1, repeat=3, params=[100])
+def bond_book_history(n_bonds):
+    """Reprice a bond book on every date of the yield curve history."""
+    yield_curve = import_project(PROJECT, 'yield_curve')
+    curve = yield_curve.YieldCurve.from_csv()
+    book = yield_curve.synthetic_bond_book(n_bonds)
+    return lambda: curve.price_bonds(book)
+
+
+@benchmark('legacy', repeat=3)
+def route_graph_build():
+    """Read the route and airport tables and build the CSR graph with edge distances."""
+    route_graph = import_project(PROJECT, 'route_graph')
+    return route_graph.RouteGraph.from_csv
+
+
+@benchmark('legacy', params=[2])
+def route_graph_reachable(hops):
+    """Airports reachable from LGA within `hops` flights."""
+    route_graph = import_project(PROJECT, 'route_graph')
+    graph = route_graph.RouteGraph.from_csv()
+    return lambda: graph.reachable('LGA', hops)
+
+
+@benchmark('legacy')
+def route_graph_shortest_path():
+    """Cached shortest path GKA -> LGA by distance."""
+    route_graph = import_project(PROJECT, 'route_graph')
+    graph = route_graph.RouteGraph.from_csv()
+    return lambda: graph.shortest_path('GKA', 'LGA')
+
+
+@benchmark('legacy', repeat=3)
+def route_graph_hubs():
+    """Degree, route counts and PageRank of every airport."""
+    route_graph = import_project(PROJECT, 'route_graph')
+    graph = route_graph.RouteGraph.from_csv()
+    return lambda: graph.hubs(10)
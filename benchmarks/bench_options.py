@@ -0,0 +1,46 @@
+"""Benchmarks for the batch options engine (Module 4.2)."""
+
+from harness import SEED, benchmark, import_project
+
+PROJECT = 'curriculum/04-financial-analysis/02-options-pricing'
+
+
+def _chain(n_contracts):
+    options = import_project(PROJECT, 'options_engine')
+    K, T, sigma, is_call = options.synthetic_chain(n_contracts, seed=SEED)
+    return options, K, T, sigma, is_call
+
+
+@benchmark('options', params=[100_000])
+def price_and_greeks(n_contracts):
+    """bs_price + bs_greeks for a whole chain."""
+    options, K, T, sigma, is_call = _chain(n_contracts)
+
+    def reprice():
+        options.bs_price(100.0, K, T, 0.05, sigma, is_call)
+        options.bs_greeks(100.0, K, T, 0.05, sigma, is_call)
+    return reprice
+
+
+@benchmark('options', number=1, params=[100_000])
+def implied_volatility(n_contracts):
+    """Vectorized Newton/bisection IV solve for a whole chain."""
+    options, K, T, sigma, is_call = _chain(n_contracts)
+    prices = options.bs_price(100.0, K, T, 0.05, sigma, is_call)
+    return lambda: options.implied_volatility(prices, 100.0, K, T, 0.05, is_call)
+
+
+@benchmark('options', number=1, repeat=3, params=[100_000])
+def straddle_price_mc(mc_paths):
+    """Vectorized straddlePricerMC (252 daily steps per path)."""
+    options = import_project(PROJECT, 'options_engine')
+    return lambda: options.straddle_price_mc(mc_paths=mc_paths, seed=SEED)
+
+
+@benchmark('options')
+def strategy_pnl_surface():
+    """P&L surface of every sample-chain strategy over 41 spots × 5 vols × 4 dates."""
+    import_project(PROJECT, 'options_engine')
+    strategies = import_project(PROJECT, 'option_strategies')
+    book = strategies.StrategyBook(strategies.all_strategies(strategies.load_chain()), spot=100, days=30)
+    return book.pnl_surface
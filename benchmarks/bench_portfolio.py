@@ -0,0 +1,54 @@
+"""Benchmarks for the stock portfolio tracker."""
+
+import numpy as np
+import pandas as pd
+
+from harness import SEED, benchmark, import_project
+
+PROJECT = 'projects/beginner/stock_portfolio_tracker'
+
+
+@benchmark('portfolio', params=[4, 10_000])
+def calculate_portfolio_value(n_positions):
+    """stock_tracker.calculate_portfolio_value for `n_positions` lots."""
+    tracker = import_project(PROJECT, 'stock_tracker')
+    if n_positions == len(tracker.portfolio):
+        return tracker.calculate_portfolio_value
+
+    rng = np.random.default_rng(SEED)
+    tickers = np.array([f"T{i:04d}" for i in range(n_positions // 4)])
+    holdings = pd.DataFrame({
+        'Ticker': rng.choice(tickers, n_positions),
+        'Shares': rng.integers(1, 500, n_positions),
+        'Avg Cost': rng.uniform(10, 500, n_positions),
+    })
+    prices = dict(zip(tickers, rng.uniform(10, 500, len(tickers))))
+    return lambda: tracker.calculate_portfolio_value(holdings, prices)
+
+
+def _var_book(n_tickers, n_days=1260):
+    """Factor-model daily returns and dollar exposures for `n_tickers` tickers."""
+    rng = np.random.default_rng(SEED)
+    factors = rng.standard_normal((n_days, 5)) * 0.01
+    returns = factors @ rng.standard_normal((5, n_tickers)) * 0.3 + rng.standard_normal((n_days, n_tickers)) * 0.01
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    exposures = pd.Series(rng.uniform(1e3, 1e5, n_tickers), index=tickers)
+    return pd.DataFrame(returns, columns=tickers), exposures
+
+
+@benchmark('portfolio', params=['historical', 'parametric', 'monte_carlo'])
+def portfolio_var_breakdown(method):
+    """PortfolioVaR build + marginal/component breakdown for a 2,000-ticker book."""
+    portfolio_var = import_project(PROJECT, 'portfolio_var')
+    returns, exposures = _var_book(2000)
+    return lambda: portfolio_var.PortfolioVaR(returns, exposures, method).breakdown()
+
+
+@benchmark('portfolio', params=['historical', 'monte_carlo'])
+def incremental_var(method):
+    """VaR change from a two-ticker trade on a 500-ticker book (pre-trade check)."""
+    portfolio_var = import_project(PROJECT, 'portfolio_var')
+    returns, exposures = _var_book(500)
+    engine = portfolio_var.PortfolioVaR(returns, exposures, method)
+    trade = {'T0001': 5_000.0, 'T0002': -5_000.0}
+    return lambda: engine.incremental_var(trade)
@@ -0,0 +1,220 @@
+"""
+Benchmark Harness
+=================
+A small asv-style runner: benchmarks register a setup function that returns
+the callable to time, the harness times it with `timeit`, writes the results
+as JSON and compares them against a saved baseline.
+
+Setup work (building inputs, importing modules) is never timed. A setup that
+raises `SkipBenchmark` or `ImportError` (e.g. an optional dependency such as
+yfinance is missing) is recorded as skipped instead of failing the run.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / 'data'
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE_PATH = RESULTS_DIR / 'baseline.json'
+
+SEED = 42
+BENCHMARKS = {}
+
+
+class SkipBenchmark(Exception):
+    """Raised from a setup function when a benchmark cannot run here."""
+
+
+def benchmark(group, number=None, repeat=5, params=None):
+    """
+    Register a benchmark.
+
+    The decorated function is the setup: it receives the parameter (when
+    `params` is given) and returns a zero-argument callable to time.
+    `number` calls are timed per repeat; None lets timeit pick a count that
+    runs for at least 0.2s.
+    """
+    def register(setup):
+        for param in (params or [None]):
+            name = f"{group}.{setup.__name__}" + (f"[{param}]" if param is not None else '')
+            BENCHMARKS[name] = {
+                'setup': setup, 'param': param, 'group': group,
+                'number': number, 'repeat': repeat,
+            }
+        return setup
+    return register
+
+
+def import_project(relative_dir, module):
+    """Import `module` from a project directory (projects are not packages)."""
+    path = str(REPO_ROOT / relative_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the prints of code under test."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def seeded_ohlcv(n_bars, seed=SEED, start='2015-01-01', freq='B', tz=None):
+    """Deterministic synthetic OHLCV frame indexed by date (tz-aware if `tz` is given, like yfinance)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.003, n_bars)),
+        'High': close * (1 + np.abs(rng.normal(0, 0.008, n_bars))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.008, n_bars))),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 10_000_000, n_bars),
+    }, index=pd.date_range(start, periods=n_bars, freq=freq, tz=tz, name='Date'))
+
+
+def engine_inputs(n, seed=SEED):
+    """`n` market-data dicts in the shape MarketBacktester feeds the EnhancedAIAnalyst engine."""
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(n):
+        price = 150 + rng.uniform(-20, 50)
+        volatility = rng.uniform(0.01, 0.05)
+        inputs.append({
+            'price': price,
+            'sma_20': price * rng.uniform(0.95, 1.05),
+            'sma_50': price * rng.uniform(0.92, 1.08),
+            'rsi': rng.uniform(20, 80),
+            'macd': rng.uniform(-2, 2),
+            'atr': price * volatility,
+            'volatility': volatility,
+            'pe_ratio': rng.uniform(10, 40),
+            'roe': rng.uniform(0.05, 0.30),
+            'debt_equity': rng.uniform(0.1, 2.5),
+            'revenue_growth': rng.uniform(-0.05, 0.25),
+            'news_sentiment': rng.uniform(-0.8, 0.8),
+            'social_sentiment': rng.uniform(-0.8, 0.8),
+            'analyst_rating': rng.choice(['buy', 'hold', 'sell']),
+            'insider_activity': rng.choice(['buying', 'neutral', 'selling']),
+        })
+    return inputs
+
+
+# ============================================================
+# Running
+# ============================================================
+
+def _time(func, number, repeat):
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'mean': statistics.fmean(runs),
+        'stdev': statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run(selected=None, repeat=None):
+    """Run registered benchmarks whose name contains any of `selected`."""
+    results = {}
+    for name, spec in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        try:
+            with quiet():
+                func = spec['setup'](spec['param']) if spec['param'] is not None else spec['setup']()
+                func()  # warm-up, also surfaces errors before timing
+            with quiet():
+                stats = _time(func, spec['number'], repeat or spec['repeat'])
+            results[name] = {'status': 'ok', **stats}
+            print(f"  ✅ {name:<55} {_fmt(stats['median'])}  (±{_fmt(stats['stdev'])})")
+        except (SkipBenchmark, ImportError) as exc:
+            results[name] = {'status': 'skipped', 'reason': str(exc)}
+            print(f"  ⏭️  {name:<55} skipped: {exc}")
+    return results
+
+
+def _fmt(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def environment():
+    """Machine and library versions stored next to the timings."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'seed': SEED,
+    }
+
+
+# ============================================================
+# Results & Baseline Comparison
+# ============================================================
+
+def save_results(results, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'environment': environment(), 'benchmarks': results}, indent=2))
+    return path
+
+
+def load_results(path):
+    return json.loads(Path(path).read_text())['benchmarks']
+
+
+def compare(results, baseline, threshold=0.20):
+    """
+    Print current vs baseline timings and return the names that regressed.
+
+    Runs are compared on their fastest repeat, which is the least sensitive
+    to other load on the machine. A benchmark regresses when it is more than
+    `threshold` (relative) slower than the baseline.
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<55} {'Baseline':>11} {'Current':>11} {'Ratio':>7}")
+    print("-" * 88)
+    for name, current in results.items():
+        base = baseline.get(name)
+        if current['status'] != 'ok' or not base or base.get('status') != 'ok':
+            continue
+        ratio = current['min'] / base['min']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  🔴 slower'
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = '  🟢 faster'
+        print(f"{name:<55} {_fmt(base['min'])} {_fmt(current['min'])} {ratio:6.2f}x{flag}")
+    return regressions
@@ -0,0 +1,63 @@
+"""
+🏁 Benchmark Runner
+===================
+Runs every bench_*.py suite with fixed seeds and offline data, stores the
+timings as JSON and compares them against a baseline.
+
+Usage:
+    python run_benchmarks.py                      # run all, compare with baseline if present
+    python run_benchmarks.py -k engine mandelbrot # only names containing these
+    python run_benchmarks.py --save-baseline      # store this run as the baseline
+    python run_benchmarks.py --fail-on-regression # exit 1 if anything got slower
+"""
+
+import argparse
+import importlib
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import harness
+
+SUITES = sorted(p.stem for p in Path(__file__).resolve().parent.glob('bench_*.py'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suites')
+    parser.add_argument('-k', nargs='*', default=None, help='Only run benchmarks whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=None, help='Override repeats per benchmark')
+    parser.add_argument('--output', type=Path, default=None, help='Results JSON (default: results/<timestamp>.json)')
+    parser.add_argument('--baseline', type=Path, default=harness.BASELINE_PATH, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Also write this run to the baseline path')
+    parser.add_argument('--threshold', type=float, default=0.20, help='Relative slowdown counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 on regressions')
+    args = parser.parse_args()
+
+    for suite in SUITES:
+        importlib.import_module(suite)
+
+    print(f"\n🏁 Running benchmarks (seed={harness.SEED})\n")
+    results = harness.run(args.k, args.repeat)
+
+    output = args.output or harness.RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    print(f"\n💾 Results written to {harness.save_results(results, output)}")
+
+    if args.save_baseline:
+        print(f"📌 Baseline written to {harness.save_results(results, args.baseline)}")
+        return
+
+    if not args.baseline.exists():
+        print("ℹ️  No baseline yet; run with --save-baseline to create one")
+        return
+
+    regressions = harness.compare(results, harness.load_results(args.baseline), args.threshold)
+    if regressions:
+        print(f"\n🔴 {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
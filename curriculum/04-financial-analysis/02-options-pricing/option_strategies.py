@@ -0,0 +1,228 @@
+"""
+🎯 Options Strategy Engine
+==========================
+Multi-leg option strategies (straddles, strangles, vertical spreads, iron
+condors) built from an options chain, with payoffs and mark-to-market P&L
+evaluated for a whole book of strategies over a grid of scenarios.
+
+A `StrategyBook` prices every distinct contract over the (spot × vol ×
+time) scenario grid in one broadcast Black-Scholes evaluation, then maps
+contract P&L to strategy P&L with one matrix product. Scenarios are
+relative to the current spot, so a new tick only means calling
+`pnl_surface` again with the new spot.
+
+Usage:
+    from option_strategies import all_strategies, StrategyBook
+    from options_engine import load_chain
+
+    book = StrategyBook(all_strategies(load_chain()), spot=100, days=30)
+    surface = book.pnl_surface()                  # (strategies, spots, vols, times)
+    print(book.summary().head())
+
+    python option_strategies.py --spot 100 --days 30
+"""
+
+import argparse
+import itertools
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from options_engine import bs_greeks, bs_price, load_chain
+
+Leg = namedtuple('Leg', ['option_type', 'strike', 'quantity', 'iv', 'mid'])
+Strategy = namedtuple('Strategy', ['name', 'legs'])
+
+
+# ============================================================
+# Strategy Builders
+# ============================================================
+
+def _leg(chain, option_type, strike, quantity):
+    row = chain[(chain['Type'].str.lower() == option_type) & (chain['Strike'] == strike)]
+    if row.empty:
+        raise KeyError(f"No {option_type} at strike {strike} in the chain")
+    row = row.iloc[0]
+    return Leg(option_type, float(strike), quantity, float(row['IV']), float(row['Mid']))
+
+
+def straddle(chain, strike, quantity=1):
+    """Long call + long put at the same strike (negative quantity: short)."""
+    return Strategy(f"Straddle {strike:g}",
+                    [_leg(chain, 'call', strike, quantity), _leg(chain, 'put', strike, quantity)])
+
+
+def strangle(chain, put_strike, call_strike, quantity=1):
+    """Long OTM put + long OTM call."""
+    return Strategy(f"Strangle {put_strike:g}/{call_strike:g}",
+                    [_leg(chain, 'put', put_strike, quantity), _leg(chain, 'call', call_strike, quantity)])
+
+
+def vertical_spread(chain, long_strike, short_strike, option_type='call'):
+    """Buy one strike, sell another of the same type (bull call / bear put, etc.)."""
+    return Strategy(f"{option_type.title()} spread {long_strike:g}/{short_strike:g}",
+                    [_leg(chain, option_type, long_strike, 1), _leg(chain, option_type, short_strike, -1)])
+
+
+def iron_condor(chain, put_long, put_short, call_short, call_long):
+    """Short put spread + short call spread: profits while the spot stays inside."""
+    return Strategy(f"Iron condor {put_long:g}/{put_short:g}/{call_short:g}/{call_long:g}",
+                    [_leg(chain, 'put', put_long, 1), _leg(chain, 'put', put_short, -1),
+                     _leg(chain, 'call', call_short, -1), _leg(chain, 'call', call_long, 1)])
+
+
+def all_strategies(chain):
+    """Every straddle, strangle, vertical spread and iron condor the chain's strikes allow."""
+    chain = chain if 'Mid' in chain else chain.assign(Mid=(chain['Bid'] + chain['Ask']) / 2)
+    strikes = sorted(chain['Strike'].unique())
+    strategies = [straddle(chain, k) for k in strikes]
+    for low, high in itertools.combinations(strikes, 2):
+        strategies.append(strangle(chain, low, high))
+        strategies.append(vertical_spread(chain, low, high, 'call'))
+        strategies.append(vertical_spread(chain, high, low, 'put'))
+    strategies += [iron_condor(chain, *k) for k in itertools.combinations(strikes, 4)]
+    return strategies
+
+
+# ============================================================
+# Strategy Book
+# ============================================================
+
+class StrategyBook:
+    """
+    A set of strategies evaluated together.
+
+    Strategies share contracts (every straddle at 100 uses the same call), so
+    the book keeps one row per distinct contract and a strategies × contracts
+    quantity matrix: scenarios are priced once per contract and a matrix
+    product turns them into strategy P&L.
+
+    `premium` is what each contract was traded at: 'model' (Black-Scholes at
+    the quoted IV, so P&L is zero at the current market) or 'mid' (the quote).
+    `days` is calendar days to expiry (one expiry for the whole chain).
+    """
+
+    def __init__(self, strategies, spot, days, rate=0.05, premium='model', multiplier=1):
+        self.strategies = list(strategies)
+        self.names = [s.name for s in self.strategies]
+        self.spot = float(spot)
+        self.rate = rate
+        self.multiplier = multiplier
+
+        contracts = {}
+        for strategy in self.strategies:
+            for leg in strategy.legs:
+                contracts.setdefault((leg.option_type, leg.strike), leg)
+        keys = list(contracts)
+        column = {key: j for j, key in enumerate(keys)}
+
+        self.is_call = np.array([t == 'call' for t, _ in keys])
+        self.strike = np.array([k for _, k in keys])
+        self.iv = np.array([contracts[key].iv for key in keys])
+        self.expiry = np.full(len(keys), days / 365)
+        self.quantity = np.zeros((len(self.strategies), len(keys)))
+        for i, strategy in enumerate(self.strategies):
+            for leg in strategy.legs:
+                self.quantity[i, column[(leg.option_type, leg.strike)]] += leg.quantity
+
+        if premium == 'model':
+            self.premium = bs_price(self.spot, self.strike, self.expiry, rate, self.iv, self.is_call)
+        else:
+            self.premium = np.array([contracts[key].mid for key in keys])
+
+    def __len__(self):
+        return len(self.strategies)
+
+    def _to_strategies(self, contract_pnl):
+        """Contract-level P&L (contracts, ...) -> strategy P&L (strategies, ...)."""
+        return np.tensordot(self.quantity, contract_pnl, axes=1) * self.multiplier
+
+    def payoff(self, spots):
+        """Expiry P&L per strategy (net of premium) for an array of spots -> (strategies, spots)."""
+        spots = np.asarray(spots, dtype=float)
+        intrinsic = np.maximum(np.where(self.is_call[:, None], spots - self.strike[:, None],
+                                        self.strike[:, None] - spots), 0)
+        return self._to_strategies(intrinsic - self.premium[:, None])
+
+    def pnl_surface(self, spot=None, spot_moves=None, vol_shifts=None, days_forward=None):
+        """
+        Mark-to-market P&L over a scenario grid -> (strategies, spots, vols, times).
+
+        spot_moves: relative spot changes (default -20%..+20%), vol_shifts:
+        absolute shifts added to every contract's IV (default -10..+10 vol
+        points), days_forward: calendar days elapsed (default today, 1 week,
+        2 weeks, expiry). `spot` overrides the book's current spot.
+        """
+        spot = self.spot if spot is None else spot
+        spot_moves = np.linspace(-0.2, 0.2, 41) if spot_moves is None else np.asarray(spot_moves, dtype=float)
+        vol_shifts = np.linspace(-0.1, 0.1, 5) if vol_shifts is None else np.asarray(vol_shifts, dtype=float)
+        if days_forward is None:
+            days_forward = [0, 7, 14, self.expiry.max() * 365]
+        days_forward = np.asarray(days_forward, dtype=float)
+
+        # (contracts, spots, vols, times)
+        spots = (spot * (1 + spot_moves))[None, :, None, None]
+        sigma = np.maximum(self.iv[:, None, None, None] + vol_shifts[None, None, :, None], 1e-4)
+        remaining = self.expiry[:, None, None, None] - days_forward[None, None, None, :] / 365
+        strike = self.strike[:, None, None, None]
+        is_call = self.is_call[:, None, None, None]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = bs_price(spots, strike, np.maximum(remaining, 1e-12), self.rate, sigma, is_call)
+        expired = np.maximum(np.where(is_call, spots - strike, strike - spots), 0)
+        value = np.where(remaining > 0, value, expired)
+        return self._to_strategies(value - self.premium[:, None, None, None])
+
+    def greeks(self, spot=None):
+        """Net Delta/Gamma/Theta/Vega/Rho per strategy at the current market."""
+        spot = self.spot if spot is None else spot
+        contracts = bs_greeks(spot, self.strike, self.expiry, self.rate, self.iv, self.is_call)
+        return pd.DataFrame({name: self._to_strategies(values) for name, values in contracts.items()},
+                            index=self.names)
+
+    def summary(self):
+        """
+        Net premium, max profit/loss at expiry and net Greeks per strategy.
+
+        The expiry payoff is piecewise linear with kinks at the strikes, so
+        its extremes over all spots >= 0 are at spot 0, at a strike, or at
+        infinity: max profit is inf when the strategy is net long calls
+        (a long straddle or strangle), max loss is -inf when net short calls.
+        """
+        payoff = self.payoff(np.concatenate([[0.0], np.unique(self.strike)]))
+        net_calls = self._to_strategies(self.is_call.astype(float))
+        table = pd.DataFrame({
+            'net_premium': self._to_strategies(self.premium),
+            'max_profit': np.where(net_calls > 0, np.inf, payoff.max(axis=1)),
+            'max_loss': np.where(net_calls < 0, -np.inf, payoff.min(axis=1)),
+        }, index=self.names)
+        return table.join(self.greeks())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Payoffs and P&L surfaces for every chain strategy')
+    parser.add_argument('--spot', type=float, default=100.0)
+    parser.add_argument('--days', type=float, default=30, help='Calendar days to expiry')
+    parser.add_argument('--rate', type=float, default=0.05)
+    parser.add_argument('--premium', choices=['model', 'mid'], default='model')
+    args = parser.parse_args()
+
+    book = StrategyBook(all_strategies(load_chain()), args.spot, args.days, args.rate, args.premium)
+    print(f"\n🎯 {len(book)} strategies from the sample chain (spot ${args.spot:.2f}, {args.days:.0f} days)\n")
+    with pd.option_context('display.width', 160, 'display.max_columns', 10, 'display.precision', 3):
+        print(book.summary().sort_values('max_profit', ascending=False).head(15))
+
+    start = time.perf_counter()
+    surface = book.pnl_surface()
+    elapsed = time.perf_counter() - start
+    print(f"\n⏱️  P&L surface {surface.shape} ({surface.size:,} scenario values) in {elapsed * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    book.pnl_surface(spot=args.spot * 1.01)
+    print(f"⏱️  Re-evaluated after a +1% tick in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,32 @@
 # coding: utf-8
+"""Mandelbrot escape counts: a pure-Python reference plus fast engines.
+
+All engines return exactly the same matrix as `mandelbrot`:
+
+- `mandelbrot`             - reference triple loop (slow, easy to read)
+- `mandelbrot_vectorized`  - NumPy, iterates only the points still bounded
+- `mandelbrot_jit`         - Numba kernel, parallel over rows (needs numba)
+- `mandelbrot_tiled`       - splits the frame into row tiles and renders them
+                             in a process pool with either fast engine
+
+Run this file to time a frame, e.g. 4K at 1,000 iterations:
+
+    python mandlebrot.py --width 3840 --height 2160 --iterations 1000
+"""
+
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
 def mandelbrot(X, Y, max_iterations=1000, verbose=True):
     """Computes the Mandelbrot set.
@@ -14,7 +39,7 @@ def mandelbrot(X, Y, max_iterations=1000, verbose=True):
     :param Y: set of y coordinates
     :param max_iterations: maximum number of iterations to perform before
         forcing to stop the sequence
-    :param show_out: flag indicating whether to print on console which line
+    :param verbose: flag indicating whether to print on console which line
         number is being computed
     :return: Matrix containing the escape iteration number for every point
         specified in input
@@ -25,6 +50,8 @@ def mandelbrot(X, Y, max_iterations=1000, verbose=True):
 
     # Iterate of the y coordinates
     for i, y in enumerate(Y):
+        if verbose:
+            print(f"Computing line {i + 1}/{len(Y)}")
         for j, x in enumerate(X):
             n = 0
             c = x + 1j*y
@@ -35,3 +62,144 @@ def mandelbrot(X, Y, max_iterations=1000, verbose=True):
             out_arr[i, j] = n
 
     return out_arr
+
+
+def mandelbrot_vectorized(X, Y, max_iterations=1000, verbose=True):
+    """Vectorized version of `mandelbrot` with identical output.
+
+    Every iteration advances only the points that have not escaped yet:
+    escaped points are recorded and dropped from the working arrays, so
+    the cost per iteration shrinks as the orbits diverge. Points inside the
+    main cardioid or the period-2 bulb never escape, so they are set to
+    `max_iterations` up front instead of being iterated.
+    :param verbose: print the number of points still iterating every
+        100 iterations
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    cr = np.broadcast_to(X[None, :], (len(Y), len(X))).ravel()
+    ci = np.broadcast_to(Y[:, None], (len(Y), len(X))).ravel()
+    out = np.zeros(cr.size)
+
+    q = (cr - 0.25)**2 + ci**2
+    interior = (q * (q + (cr - 0.25)) < 0.25 * ci**2) | ((cr + 1)**2 + ci**2 < 1 / 16)
+    out[interior] = max_iterations
+
+    # Points with |c| > 2 stop at n = 0, exactly like the reference loop
+    idx = np.flatnonzero((np.hypot(cr, ci) <= 2) & ~interior)
+    cr, ci = cr[idx], ci[idx]
+    zr, zi = cr.copy(), ci.copy()
+
+    for n in range(1, max_iterations + 1):
+        if idx.size == 0:
+            break
+        # Real/imaginary parts spelled out as in Python's complex multiply;
+        # NumPy's complex ufuncs may round differently and change the counts
+        zr, zi = zr * zr - zi * zi + cr, zr * zi + zi * zr + ci
+        bounded = np.hypot(zr, zi) <= 2
+        out[idx[~bounded]] = n
+        idx, zr, zi, cr, ci = idx[bounded], zr[bounded], zi[bounded], cr[bounded], ci[bounded]
+        if verbose and n % 100 == 0:
+            print(f"Iteration {n}/{max_iterations}: {idx.size:,} points still bounded")
+
+    out[idx] = max_iterations
+    return out.reshape(len(Y), len(X))
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _escape_counts(X, Y, max_iterations):
+        out = np.zeros((len(Y), len(X)))
+        for i in prange(len(Y)):
+            for j in range(len(X)):
+                # Same real arithmetic as mandelbrot_vectorized (no fastmath,
+                # so nothing is fused and the rounding matches Python's)
+                cr, ci = X[j], Y[i]
+                zr, zi = cr, ci
+                n = 0
+                while n < max_iterations and math.hypot(zr, zi) <= 2:
+                    zr, zi = zr*zr - zi*zi + cr, zr*zi + zi*zr + ci
+                    n += 1
+                out[i, j] = n
+        return out
+
+
+def mandelbrot_jit(X, Y, max_iterations=1000, verbose=True):
+    """Numba-compiled version of `mandelbrot` with identical output.
+
+    Rows run in parallel on all cores. The first call includes compilation
+    (cached on disk afterwards).
+    """
+    if not HAS_NUMBA:
+        raise ImportError("mandelbrot_jit needs numba (pip install numba)")
+    if verbose:
+        print(f"Computing {len(Y)}x{len(X)} points with numba")
+    return _escape_counts(np.asarray(X, dtype=float), np.asarray(Y, dtype=float), max_iterations)
+
+
+ENGINES = {'vectorized': mandelbrot_vectorized, 'jit': mandelbrot_jit}
+
+
+def _render_tile(args):
+    engine, X, Y, max_iterations = args
+    return ENGINES[engine](X, Y, max_iterations, verbose=False)
+
+
+def mandelbrot_tiled(X, Y, max_iterations=1000, verbose=True, engine=None,
+                     tile_rows=64, processes=None):
+    """Render the frame as row tiles in a process pool.
+
+    Tiles are small enough that each fits in cache and the pool stays
+    balanced (rows through the set take far longer than rows outside it).
+    :param engine: 'vectorized' or 'jit'; defaults to 'jit' when numba is
+        installed
+    :param tile_rows: number of Y rows per tile
+    :param processes: pool size, defaults to the number of CPUs
+    """
+    engine = engine or ('jit' if HAS_NUMBA else 'vectorized')
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    tiles = [(engine, X, Y[r:r + tile_rows], max_iterations) for r in range(0, len(Y), tile_rows)]
+
+    out = np.empty((len(Y), len(X)))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for k, tile in enumerate(pool.map(_render_tile, tiles)):
+            r = k * tile_rows
+            out[r:r + len(tile)] = tile
+            if verbose:
+                print(f"Tile {k + 1}/{len(tiles)} done")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the Mandelbrot engines')
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--engine', choices=list(ENGINES), default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--check', action='store_true',
+                        help='Compare against the reference on a small frame first')
+    args = parser.parse_args()
+
+    if args.check:
+        x = np.linspace(-2.25, 0.75, 120)
+        y = np.linspace(-1.25, 1.25, 80)
+        expected = mandelbrot(x, y, args.iterations, verbose=False)
+        for name, engine in ENGINES.items():
+            if name == 'jit' and not HAS_NUMBA:
+                continue
+            same = np.array_equal(engine(x, y, args.iterations, verbose=False), expected)
+            print(f"{name:>10}: {'identical' if same else 'MISMATCH'}")
+
+    x = np.linspace(-2.25, 0.75, args.width)
+    y = np.linspace(-1.25, 1.25, args.height)
+    start = time.perf_counter()
+    out = mandelbrot_tiled(x, y, args.iterations, verbose=False,
+                           engine=args.engine, processes=args.processes)
+    print(f"{args.width}x{args.height} @ {args.iterations} iterations: "
+          f"{time.perf_counter() - start:.2f}s ({(out == args.iterations).mean():.1%} in the set)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""Treasury yield curve: parsed once, bootstrapped once, queried in bulk.
+
+`data/yield_curve.csv` holds daily par yields (percent) for 11 tenors in a
+wide `z[0]..z[10]` layout with 'None' for missing quotes. `YieldCurve`
+turns it into a dense tenor × date matrix and then precomputes, for every
+date:
+
+1. a natural cubic spline through that day's quoted par yields (missing
+   tenors are skipped, flat beyond the first/last quote),
+2. a zero curve bootstrapped from it on a fixed grid (1m, 3m, then every
+   6 months to 30y; bills discount at simple interest, longer tenors are
+   semiannual par bonds), and
+3. a cubic spline through the zero curve, kept as one coefficient array
+   for all dates.
+
+Zero-rate, discount-factor and forward queries take arrays of dates and
+tenors and only gather coefficients, so a query never rebuilds a spline.
+A date between quotes uses the last curve on or before it.
+
+    curve = YieldCurve.from_csv()
+    curve.zero_rate('2008-09-15', [1, 2, 5, 10])
+    curve.discount(dates, 5.0)                   # 5y discount factor on many dates
+    prices = curve.price_bonds(book)             # dates × bonds over the whole history
+
+Run this file to time the build, a million queries and a bond book:
+
+    python yield_curve.py --bonds 100
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline
+
+YIELD_CURVE_CSV = Path(__file__).resolve().parents[2] / 'data' / 'yield_curve.csv'
+
+# Bootstrap grid (years): bills, then semiannual coupon dates
+BILL_TENORS = np.array([1 / 12, 0.25])
+ZERO_GRID = np.concatenate([BILL_TENORS, np.arange(1, 61) / 2])
+
+
+def tenor_years(label):
+    """'3-month' -> 0.25, '10-year' -> 10.0"""
+    count, unit = label.split('-')
+    return int(count) / 12 if unit.startswith('month') else float(count)
+
+
+def read_yield_curve_csv(path=YIELD_CURVE_CSV):
+    """
+    Quotes as a dates × tenor-label DataFrame (percent, NaN where missing).
+
+    Same layout rules as scripts/price_store.py: one date per row in `y`,
+    one tenor per `z[i]` column, tenor labels in the first rows of `x`.
+    """
+    df = pd.read_csv(path, na_values=['None'])
+    value_cols = [c for c in df.columns if c.startswith('z[')]
+    tenors = df['x'].dropna().tolist()[:len(value_cols)]
+    quotes = pd.DataFrame(df[value_cols].to_numpy(dtype=float), columns=tenors,
+                          index=pd.DatetimeIndex(pd.to_datetime(df['y']), name='Date'))
+    return quotes.sort_index(kind='stable')
+
+
+# ============================================================
+# Curve Construction
+# ============================================================
+
+def _par_on_grid(tenors, par):
+    """
+    Par yields (decimal) of every date interpolated onto ZERO_GRID.
+
+    Dates sharing the same set of quoted tenors share the spline knots, so
+    each such group is fitted as one multi-column spline.
+    """
+    out = np.full((par.shape[0], len(ZERO_GRID)), np.nan)
+    quoted = ~np.isnan(par)
+    patterns, group = np.unique(quoted, axis=0, return_inverse=True)
+    for g, pattern in enumerate(patterns):
+        if pattern.sum() < 2:
+            continue
+        rows = np.flatnonzero(group.ravel() == g)
+        x = tenors[pattern]
+        spline = CubicSpline(x, par[np.ix_(rows, np.flatnonzero(pattern))], axis=1, bc_type='natural')
+        out[rows] = spline(np.clip(ZERO_GRID, x[0], x[-1]))
+    return out
+
+
+def bootstrap_zero(par_grid):
+    """
+    Continuously compounded zero rates on ZERO_GRID from par yields on it.
+
+    Bills: DF = 1 / (1 + y t). Coupon tenors: a semiannual par bond prices
+    at 1, so DF_n = (1 - c/2 · Σ DF_i over earlier coupon dates) / (1 + c/2).
+    All dates are bootstrapped together, one grid point at a time.
+    """
+    n_bills = len(BILL_TENORS)
+    discount = np.empty_like(par_grid)
+    discount[:, :n_bills] = 1 / (1 + par_grid[:, :n_bills] * BILL_TENORS)
+
+    annuity = np.zeros(len(par_grid))
+    for j in range(n_bills, len(ZERO_GRID)):
+        half_coupon = par_grid[:, j] / 2
+        discount[:, j] = (1 - half_coupon * annuity) / (1 + half_coupon)
+        annuity += discount[:, j]
+    return -np.log(discount) / ZERO_GRID
+
+
+class YieldCurve:
+    """
+    Daily zero curves bootstrapped from par yield quotes.
+
+    `quotes` is a dates × tenor-label frame of par yields in percent (as
+    returned by `read_yield_curve_csv` or `PriceStore.yield_curve`).
+    """
+
+    def __init__(self, quotes):
+        quotes = quotes.sort_index(kind='stable')
+        self.dates = quotes.index.to_numpy(dtype='datetime64[ns]')
+        self.tenor_labels = list(quotes.columns)
+        self.tenors = np.array([tenor_years(t) for t in self.tenor_labels])
+        # Dense tenor × date matrix of the raw quotes (percent)
+        self.rates = np.ascontiguousarray(quotes.to_numpy(dtype=float).T)
+
+        self.zero_grid = bootstrap_zero(_par_on_grid(self.tenors, self.rates.T / 100))
+        spline = CubicSpline(ZERO_GRID, self.zero_grid, axis=1)
+        # (dates × intervals, 4): the coefficients of one query sit next to each other
+        self._intervals = len(ZERO_GRID) - 1
+        self._coef = np.ascontiguousarray(spline.c.transpose(2, 1, 0)).reshape(-1, 4)
+
+    @classmethod
+    def from_csv(cls, path=YIELD_CURVE_CSV):
+        return cls(read_yield_curve_csv(path))
+
+    @property
+    def quotes(self):
+        """Raw quotes as a dates × tenors DataFrame (percent)."""
+        return pd.DataFrame(self.rates.T, index=pd.DatetimeIndex(self.dates, name='Date'),
+                            columns=self.tenor_labels)
+
+    def _rows(self, dates):
+        """Curve row in effect on each date (-1 before the first quote), same shape as `dates`."""
+        shape = np.shape(dates)
+        flat = np.ravel(dates)
+        if flat.dtype != 'datetime64[ns]':
+            flat = np.asarray(pd.to_datetime(flat), dtype='datetime64[ns]')
+        return (np.searchsorted(self.dates, flat, 'right') - 1).reshape(shape)
+
+    def _zero(self, rows, t):
+        """Zero rates for broadcastable row indices and tenors (flat outside the grid)."""
+        rows, t = np.broadcast_arrays(rows, np.asarray(t, dtype=float))
+        t = np.clip(t, ZERO_GRID[0], ZERO_GRID[-1])
+        k = np.clip(np.searchsorted(ZERO_GRID, t, 'right') - 1, 0, len(ZERO_GRID) - 2)
+        a, b, c, d = np.take(self._coef, np.maximum(rows, 0) * self._intervals + k, axis=0).T
+        dx = t - ZERO_GRID[k]
+        z = ((a.T * dx + b.T) * dx + c.T) * dx + d.T
+        return np.where(rows >= 0, z, np.nan)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    def zero_rate(self, dates, tenors):
+        """
+        Continuously compounded zero rates (decimal).
+
+        `dates` (n,) and `tenors` in years broadcast like NumPy arrays: a
+        single date with many tenors gives a curve, many dates with one
+        tenor a time series, dates[:, None] with tenors[None, :] a grid.
+        """
+        return self._zero(self._rows(dates), tenors)
+
+    def discount(self, dates, tenors):
+        """Discount factors exp(-z t)."""
+        tenors = np.asarray(tenors, dtype=float)
+        return np.exp(-self.zero_rate(dates, tenors) * tenors)
+
+    def forward(self, dates, start, end):
+        """Continuously compounded forward rate between tenors `start` and `end`."""
+        start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+        z1, z2 = self.zero_rate(dates, start), self.zero_rate(dates, end)
+        return (z2 * end - z1 * start) / (end - start)
+
+    def curve(self, date, tenors=None):
+        """Zero curve of one date as a Series indexed by tenor (years)."""
+        tenors = ZERO_GRID if tenors is None else np.asarray(tenors, dtype=float)
+        return pd.Series(self.zero_rate(date, tenors), index=pd.Index(tenors, name='Tenor'))
+
+    # ------------------------------------------------------------
+    # Bond Book
+    # ------------------------------------------------------------
+
+    def price_bonds(self, book, dates=None, max_cells=5_000_000):
+        """
+        Price a bond book on many dates -> DataFrame dates × bonds.
+
+        `book` has 'Maturity' and 'Coupon' (annual, percent) columns and
+        optionally 'Face' (default 100) and 'Frequency' (default 2). Prices
+        are dirty (no accrued-interest split); matured bonds are NaN. Every
+        date uses its own curve. All cash flows are laid out once and
+        priced against chunks of dates of at most `max_cells` cells.
+        """
+        dates = self.dates if dates is None else np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+        maturity = np.asarray(pd.to_datetime(book['Maturity']), dtype='datetime64[D]')
+        coupon = book['Coupon'].to_numpy(dtype=float) / 100
+        face = book['Face'].to_numpy(dtype=float) if 'Face' in book else np.full(len(book), 100.0)
+        freq = book['Frequency'].to_numpy(dtype=int) if 'Frequency' in book else np.full(len(book), 2)
+
+        # Coupon dates counted back from maturity to the first valuation date
+        step = 12 // freq
+        maturity_month = maturity.astype('datetime64[M]')
+        first_month = dates.min().astype('datetime64[M]')
+        count = np.maximum((maturity_month - first_month).astype(int) // step + 1, 1)
+        bond = np.repeat(np.arange(len(book)), count)
+        k = np.arange(len(bond)) - np.repeat(np.cumsum(count) - count, count)
+
+        months = maturity_month[bond] - k * step[bond]
+        days_in_month = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+        day = (maturity - maturity_month.astype('datetime64[D]')).astype(int)[bond]
+        pay_date = months.astype('datetime64[D]') + np.minimum(day, days_in_month - 1)
+        amount = face[bond] * coupon[bond] / freq[bond] + np.where(k == 0, face[bond], 0.0)
+
+        starts = np.cumsum(count) - count
+        rows = self._rows(dates)
+        # Year fractions from day counts since the epoch
+        pay_years = pay_date.astype('datetime64[D]').astype(float) / 365.25
+        value_years = dates.astype('datetime64[ns]').astype(float) / (86_400e9 * 365.25)
+        chunk = max(1, max_cells // len(bond))
+        prices = np.empty((len(dates), len(book)))
+        for lo in range(0, len(dates), chunk):
+            hi = min(lo + chunk, len(dates))
+            t = pay_years[None, :] - value_years[lo:hi, None]
+            live = t > 0
+            pv = np.where(live, amount * np.exp(-self._zero(rows[lo:hi, None], t) * t), 0.0)
+            prices[lo:hi] = np.add.reduceat(pv, starts, axis=1)
+            prices[lo:hi][~np.logical_or.reduceat(live, starts, axis=1)] = np.nan
+        return pd.DataFrame(prices, index=pd.DatetimeIndex(dates, name='Date'), columns=book.index)
+
+
+def synthetic_bond_book(n_bonds=100, start='1990-01-01', seed=42):
+    """Bonds maturing 1-30 years after `start` with 1-9% coupons."""
+    rng = np.random.default_rng(seed)
+    maturity = pd.Timestamp(start) + pd.to_timedelta(rng.uniform(365, 30 * 365, n_bonds).round(), unit='D')
+    return pd.DataFrame({
+        'Maturity': maturity,
+        'Coupon': rng.uniform(1, 9, n_bonds).round(3),
+        'Face': 100.0,
+    }, index=pd.Index([f"BOND{i:03d}" for i in range(n_bonds)], name='Bond'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bootstrap the Treasury curve and time bulk queries')
+    parser.add_argument('--source', type=Path, default=YIELD_CURVE_CSV)
+    parser.add_argument('--bonds', type=int, default=100, help='Synthetic bond book size')
+    parser.add_argument('--queries', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    curve = YieldCurve.from_csv(args.source)
+    build = time.perf_counter() - start
+    print(f"\n📈 {len(curve.dates):,} dates × {len(curve.tenors)} tenors "
+          f"({curve.dates[0].astype('datetime64[D]')} .. {curve.dates[-1].astype('datetime64[D]')}), "
+          f"parsed and bootstrapped in {build * 1000:.0f} ms")
+
+    last = curve.dates[-1]
+    print("\nZero curve on the last date (%):")
+    print((curve.curve(last, [0.25, 1, 2, 5, 10, 30]) * 100).round(3).to_string())
+
+    rng = np.random.default_rng(42)
+    dates = rng.choice(curve.dates, args.queries)
+    tenors = rng.uniform(0, 30, args.queries)
+    start = time.perf_counter()
+    curve.discount(dates, tenors)
+    print(f"\n⏱️  {args.queries:,} discount factors in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    book = synthetic_bond_book(args.bonds)
+    start = time.perf_counter()
+    prices = curve.price_bonds(book)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {args.bonds} bonds repriced on {len(prices):,} dates in {elapsed:.2f}s")
+    print(prices.iloc[::len(prices) // 5, :5].round(2).to_string())
+
+
+if __name__ == '__main__':
+    main()
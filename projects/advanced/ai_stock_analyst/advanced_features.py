@@ -8,14 +8,28 @@ Completing the remaining features:
 - Feature 7: Daily Market Brain
 """
 
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
+from math import isnan
 
 
 class RiskManager:
     """Personal Risk Manager - Feature 4"""
     
+    # Long-run capital market assumptions per asset class (annual)
+    ASSET_CLASSES = ["US Stocks", "International Stocks", "REITs", "Bonds", "Cash/Money Market"]
+    EXPECTED_RETURNS = [0.070, 0.075, 0.065, 0.040, 0.030]
+    VOLATILITIES = [0.16, 0.18, 0.20, 0.06, 0.005]
+    CORRELATIONS = [
+        [1.00, 0.80, 0.60, 0.10, 0.00],
+        [0.80, 1.00, 0.50, 0.05, 0.00],
+        [0.60, 0.50, 1.00, 0.20, 0.00],
+        [0.10, 0.05, 0.20, 1.00, 0.10],
+        [0.00, 0.00, 0.00, 0.10, 1.00],
+    ]
+    MAX_POSITION = {"conservative": 5, "moderate": 10, "aggressive": 15}
+    
+    _optimizer = None   # shared asset-class optimizer (covariance and solutions cached)
+    
     def analyze_risk_profile(self, age, risk_tolerance, investment_horizon, goals):
         """
         Analyze risk profile and create personalized allocation strategy.
@@ -49,6 +63,10 @@ class RiskManager:
             bar = "█" * int(percentage / 2)
             print(f"{asset:.<30} {percentage:>3.0f}% {bar}")
         
+        expected, volatility, sharpe = self._optimizer.stats([p / 100 for p in allocations.values()])
+        print(f"\nExpected Return: {expected:.1%} | Volatility: {volatility:.1%} | Sharpe: {sharpe:.2f}")
+        print("(Efficient portfolio at the risk level of your Rule-of-110 mix)")
+        
         # Risk controls
         print(f"\n\n⚙️ RISK CONTROL MECHANISMS")
         print("-" * 70)
@@ -61,7 +79,7 @@ class RiskManager:
         print(f"\n\n💰 POSITION SIZING GUIDELINES")
         print("-" * 70)
         
-        max_position = {"conservative": 5, "moderate": 10, "aggressive": 15}[risk_tolerance]
+        max_position = self.MAX_POSITION[risk_tolerance]
         max_sector = {"conservative": 15, "moderate": 25, "aggressive": 35}[risk_tolerance]
         
         print(f"Max Single Position: {max_position}% of portfolio")
@@ -101,7 +119,21 @@ class RiskManager:
         print(f"\n{'='*70}\n")
     
     def _calculate_allocations(self, age, risk_tolerance, horizon):
-        """Calculate asset allocation percentages."""
+        """
+        Calculate asset allocation percentages.
+        
+        The Rule of 110 mix sets how much risk to take; the optimizer then
+        returns the highest-return efficient portfolio with no more
+        volatility than that mix.
+        """
+        rule_based = self._rule_of_110_allocations(age, risk_tolerance, horizon)
+        optimizer = self._asset_class_optimizer()
+        target_vol = optimizer.stats([p / 100 for p in rule_based.values()])[1]
+        weights = optimizer.target_volatility(target_vol)
+        return {asset: 100 * float(w) for asset, w in zip(self.ASSET_CLASSES, weights)}
+    
+    def _rule_of_110_allocations(self, age, risk_tolerance, horizon):
+        """Classic rule-based allocation percentages."""
         # Base allocation on age (Rule of 110)
         base_equity = min(110 - age, 90)
         
@@ -131,6 +163,40 @@ class RiskManager:
             "Cash/Money Market": cash
         }
     
+    @classmethod
+    def _asset_class_optimizer(cls):
+        """Optimizer over the capital market assumptions, built once per process."""
+        if cls._optimizer is None:
+            from portfolio_optimizer import PortfolioOptimizer
+            cls._optimizer = PortfolioOptimizer.from_assumptions(
+                cls.EXPECTED_RETURNS, cls.VOLATILITIES, cls.CORRELATIONS, names=cls.ASSET_CLASSES)
+        return cls._optimizer
+    
+    def optimize_holdings(self, returns, risk_tolerance='moderate', method='max_sharpe'):
+        """
+        Stock-level weights from a history of daily returns (dates × tickers).
+        
+        method: 'max_sharpe', 'min_variance' or 'risk_parity'. Mean-variance
+        methods cap each holding at the risk tolerance's max single position;
+        with too few holdings to stay under the cap they get equal weights.
+        Returns a Series of weights summing to 1.
+        """
+        from portfolio_optimizer import PortfolioOptimizer
+        
+        cap = self.MAX_POSITION[risk_tolerance] / 100
+        n_assets = returns.shape[1]
+        if method != 'risk_parity' and cap * n_assets <= 1:
+            print(f"⚠️  {n_assets} holdings cannot stay under the {cap:.0%} max position "
+                  f"({risk_tolerance}); using equal weights")
+        optimizer = PortfolioOptimizer(returns, max_weight=cap)
+        if method == 'risk_parity':
+            weights = optimizer.risk_parity()
+        elif method == 'min_variance':
+            weights = optimizer.min_variance()
+        else:
+            weights = optimizer.max_sharpe()
+        return optimizer.as_series(weights)
+    
     def _get_risk_controls(self, risk_tolerance):
         """Get risk control parameters."""
         controls = {
@@ -159,7 +225,7 @@ class RiskManager:
 class StockScreener:
     """AI Stock Screener - Feature 5"""
     
-    def __init__(self):
+    def __init__(self, fundamentals=None):
         self.scoring_weights = {
             'valuation': 0.25,
             'growth': 0.20,
@@ -167,6 +233,37 @@ class StockScreener:
             'profitability': 0.20,
             'momentum': 0.10
         }
+        self.fundamentals = fundamentals
+        self._credit = None   # Altman Z'' table for the whole fundamentals universe
+        self._credit_loaded = False
+    
+    def credit_table(self):
+        """
+        Altman Z'' scores and implied ratings for every ticker in the local
+        fundamentals table (data/fundamentals.csv unless one was given),
+        computed once for the whole universe.
+        """
+        if not self._credit_loaded:
+            from credit_scoring import credit_scores, load_fundamentals
+            fundamentals = self.fundamentals
+            if fundamentals is None:
+                try:
+                    fundamentals = load_fundamentals()
+                except FileNotFoundError:
+                    fundamentals = None
+            self._credit = None if fundamentals is None else credit_scores(fundamentals)
+            self._credit_loaded = True
+        return self._credit
+    
+    def _credit_row(self, ticker, stock_data):
+        """Z'' row for one ticker: local table first, else its yfinance statements."""
+        from credit_scoring import credit_scores, fundamentals_from_yfinance
+        
+        table = self.credit_table()
+        if table is not None and ticker in table.index:
+            return table.loc[ticker]
+        fundamentals = fundamentals_from_yfinance(stock_data)
+        return None if fundamentals is None else credit_scores(fundamentals).iloc[0]
     
     def screen_stock(self, ticker, stock_data):
         """
@@ -179,12 +276,13 @@ class StockScreener:
         print(f"{'='*70}\n")
         
         info = stock_data.info
+        credit = self._credit_row(ticker, stock_data)
         
         # Calculate individual scores
         scores = {
             'Valuation': self._score_valuation(info),
             'Growth': self._score_growth(info),
-            'Financial Health': self._score_financial_health(info),
+            'Financial Health': self._score_financial_health(info, credit),
             'Profitability': self._score_profitability(info),
             'Momentum': self._score_momentum(info)
         }
@@ -205,6 +303,10 @@ class StockScreener:
         final_grade = self._get_grade(total_score)
         print(f"{'OVERALL QUALITY SCORE':.<30} {total_score:>3.0f} {final_grade:>3}")
         
+        if credit is not None and not isnan(credit['z_score']):
+            print(f"\nAltman Z'': {credit['z_score']:.2f} ({credit['zone']} zone) | "
+                  f"Implied rating: {credit['rating']}")
+        
         # Investment recommendation
         print(f"\n\n🎯 SCREENING RESULT")
         print("-" * 70)
@@ -289,8 +391,13 @@ class StockScreener:
         
         return max(0, min(100, score))
     
-    def _score_financial_health(self, info):
-        """Score financial health (0-100)."""
+    def _score_financial_health(self, info, credit=None):
+        """
+        Score financial health (0-100).
+        
+        With an Altman Z'' row (from credit_scoring), the liquidity/leverage
+        checks below are averaged with the score of its implied rating.
+        """
         score = 50
         
         current_ratio = info.get('currentRatio', 0)
@@ -309,7 +416,10 @@ class StockScreener:
         if fcf and fcf > 0:
             score += 15
         
-        return max(0, min(100, score))
+        score = max(0, min(100, score))
+        if credit is not None and not isnan(credit['health_score']):
+            score = (score + credit['health_score']) / 2
+        return score
     
     def _score_profitability(self, info):
         """Score profitability (0-100)."""
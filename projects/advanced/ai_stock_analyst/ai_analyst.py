@@ -13,27 +13,68 @@ Features:
 7. Daily Market Brain
 
 Usage: python ai_analyst.py --feature [1-7] --stock AAPL
+
+Heavy libraries (yfinance, pandas, matplotlib) are imported inside the
+features that need them, so light features such as --feature 7 and --help
+start instantly.
 """
 
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import warnings
-warnings.filterwarnings('ignore')
+import math
+
+
+def compute_technical_indicators(df):
+    """
+    Add SMA, EMA, RSI, MACD and Bollinger Band columns to an OHLCV frame.
+    
+    Used by `AIStockAnalyst.technical_analysis`; works on any frame with a
+    'Close' column, e.g. offline data for benchmarks.
+    """
+    df = df.copy()
+    df['SMA_20'] = df['Close'].rolling(20).mean()
+    df['SMA_50'] = df['Close'].rolling(50).mean()
+    df['SMA_200'] = df['Close'].rolling(200).mean()
+    df['EMA_12'] = df['Close'].ewm(span=12).mean()
+    df['EMA_26'] = df['Close'].ewm(span=26).mean()
+    
+    # RSI
+    delta = df['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rs = gain / loss
+    df['RSI'] = 100 - (100 / (1 + rs))
+    
+    # MACD
+    df['MACD'] = df['EMA_12'] - df['EMA_26']
+    df['Signal'] = df['MACD'].ewm(span=9).mean()
+    df['MACD_Hist'] = df['MACD'] - df['Signal']
+    
+    # Bollinger Bands
+    df['BB_Mid'] = df['Close'].rolling(20).mean()
+    df['BB_Std'] = df['Close'].rolling(20).std()
+    df['BB_Upper'] = df['BB_Mid'] + 2 * df['BB_Std']
+    df['BB_Lower'] = df['BB_Mid'] - 2 * df['BB_Std']
+    return df
+
+
+def _is_missing(value):
+    """True for None and NaN (what pd.isna checks for scalars)."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
 
 class AIStockAnalyst:
     """AI-powered stock analysis toolkit."""
     
-    def __init__(self, ticker: str = None):
+    def __init__(self, ticker: str = None, show_charts: bool = True):
         self.ticker = ticker
         self.stock = None
+        self.show_charts = show_charts
         if ticker:
             self.load_stock(ticker)
     
     def load_stock(self, ticker: str):
         """Load stock data."""
+        import yfinance as yf
+        
         self.ticker = ticker.upper()
         self.stock = yf.Ticker(self.ticker)
         print(f"✅ Loaded data for {self.ticker}")
@@ -177,6 +218,9 @@ class AIStockAnalyst:
         """
         Technical analysis with key indicators.
         Includes: SMA, EMA, RSI, MACD, Bollinger Bands, Support/Resistance
+        
+        Returns the findings as a dict (one `indicators.technical_summary` row);
+        use that module directly to analyse many tickers at once.
         """
         if not self.stock:
             return "❌ Please load a stock first"
@@ -193,29 +237,7 @@ class AIStockAnalyst:
             return
         
         # Calculate indicators
-        df['SMA_20'] = df['Close'].rolling(20).mean()
-        df['SMA_50'] = df['Close'].rolling(50).mean()
-        df['SMA_200'] = df['Close'].rolling(200).mean()
-        df['EMA_12'] = df['Close'].ewm(span=12).mean()
-        df['EMA_26'] = df['Close'].ewm(span=26).mean()
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Hist'] = df['MACD'] - df['Signal']
-        
-        # Bollinger Bands
-        df['BB_Mid'] = df['Close'].rolling(20).mean()
-        df['BB_Std'] = df['Close'].rolling(20).std()
-        df['BB_Upper'] = df['BB_Mid'] + 2 * df['BB_Std']
-        df['BB_Lower'] = df['BB_Mid'] - 2 * df['BB_Std']
+        df = compute_technical_indicators(df)
         
         # Latest values
         latest = df.iloc[-1]
@@ -227,7 +249,7 @@ class AIStockAnalyst:
         print(f"Current Price: ${current_price:.2f}")
         print(f"SMA 20: ${latest['SMA_20']:.2f} → {'Above' if current_price > latest['SMA_20'] else 'Below'}")
         print(f"SMA 50: ${latest['SMA_50']:.2f} → {'Above' if current_price > latest['SMA_50'] else 'Below'}")
-        if not pd.isna(latest['SMA_200']):
+        if not _is_missing(latest['SMA_200']):
             print(f"SMA 200: ${latest['SMA_200']:.2f} → {'Above' if current_price > latest['SMA_200'] else 'Below'}")
         
         # Trend Analysis
@@ -345,49 +367,30 @@ class AIStockAnalyst:
         
         # Plot chart
         self._plot_technical_chart(df)
+        
+        from indicators import technical_summary, to_panel
+        return technical_summary(to_panel({self.ticker: df})).iloc[0].to_dict()
     
     def _plot_technical_chart(self, df):
-        """Plot technical analysis chart."""
-        fig, axes = plt.subplots(3, 1, figsize=(14, 10), gridspec_kw={'height_ratios': [3, 1, 1]})
-        
-        # Price + MAs + Bollinger
-        ax1 = axes[0]
-        ax1.plot(df.index, df['Close'], 'b-', linewidth=1.5, label='Price')
-        ax1.plot(df.index, df['SMA_20'], 'orange', linewidth=1, label='SMA 20')
-        ax1.plot(df.index, df['SMA_50'], 'purple', linewidth=1, label='SMA 50')
-        ax1.fill_between(df.index, df['BB_Lower'], df['BB_Upper'], alpha=0.2, color='gray', label='BB')
-        ax1.set_title(f'{self.ticker} Technical Analysis', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Price ($)')
-        ax1.legend(loc='upper left')
-        ax1.grid(True, alpha=0.3)
-        
-        # RSI
-        ax2 = axes[1]
-        ax2.plot(df.index, df['RSI'], 'purple', linewidth=1.5)
-        ax2.axhline(70, color='red', linestyle='--', alpha=0.5, label='Overbought')
-        ax2.axhline(30, color='green', linestyle='--', alpha=0.5, label='Oversold')
-        ax2.fill_between(df.index, 70, df['RSI'], where=(df['RSI'] >= 70), alpha=0.3, color='red')
-        ax2.fill_between(df.index, 30, df['RSI'], where=(df['RSI'] <= 30), alpha=0.3, color='green')
-        ax2.set_ylabel('RSI')
-        ax2.set_ylim(0, 100)
-        ax2.legend(loc='upper left')
-        ax2.grid(True, alpha=0.3)
-        
-        # MACD
-        ax3 = axes[2]
-        ax3.plot(df.index, df['MACD'], 'b-', linewidth=1, label='MACD')
-        ax3.plot(df.index, df['Signal'], 'r-', linewidth=1, label='Signal')
-        colors = ['g' if x > 0 else 'r' for x in df['MACD_Hist']]
-        ax3.bar(df.index, df['MACD_Hist'], color=colors, alpha=0.3, label='Histogram')
-        ax3.axhline(0, color='black', linestyle='-', linewidth=0.5)
-        ax3.set_ylabel('MACD')
-        ax3.legend(loc='upper left')
-        ax3.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig(f'{self.ticker}_technical_analysis.png', dpi=150, bbox_inches='tight')
-        print(f"📊 Chart saved as '{self.ticker}_technical_analysis.png'")
-        plt.show()
+        """Plot technical analysis chart (saved as PNG; shown unless show_charts is off)."""
+        from chart_renderer import TechnicalChartRenderer
+        
+        path = f'{self.ticker}_technical_analysis.png'
+        if not self.show_charts:
+            # Off-screen Agg figure, nothing registered with pyplot
+            TechnicalChartRenderer().render(self.ticker, df, path)
+            print(f"📊 Chart saved as '{path}'")
+            return
+        
+        import matplotlib.pyplot as plt
+        
+        fig = plt.figure(figsize=(14, 10))
+        try:
+            TechnicalChartRenderer(fig).render(self.ticker, df, path)
+            print(f"📊 Chart saved as '{path}'")
+            plt.show()
+        finally:
+            plt.close(fig)
     
     # ============================================================
     # Feature 3: Trading Strategy Simulator
@@ -408,52 +411,50 @@ class AIStockAnalyst:
         print(f"Risk Level: {risk_level.upper()}")
         print(f"Stock: {self.ticker}\n")
         
-        # Get data based on strategy
-        if strategy_type == 'intraday':
-            period = '5d'
-            interval = '5m'
-        elif strategy_type == 'swing':
-            period = '3mo'
-            interval = '1d'
-        else:  # position
-            period = '1y'
-            interval = '1d'
+        from strategy_backtest import RISK_PARAMS, STRATEGY_DATA, backtest_strategy
         
-        df = self.stock.history(period=period, interval=interval)
+        # Get data based on strategy
+        data = STRATEGY_DATA.get(strategy_type, STRATEGY_DATA['position'])
+        df = self.stock.history(period=data['period'], interval=data['interval'])
         
         if df.empty:
             print("❌ Insufficient data")
             return
         
         # Risk parameters
-        risk_params = {
-            'conservative': {'stop_loss': 0.02, 'take_profit': 0.04, 'position_size': 0.25},
-            'moderate': {'stop_loss': 0.03, 'take_profit': 0.06, 'position_size': 0.50},
-            'aggressive': {'stop_loss': 0.05, 'take_profit': 0.10, 'position_size': 0.75}
-        }
-        
-        params = risk_params.get(risk_level, risk_params['moderate'])
+        params = RISK_PARAMS.get(risk_level, RISK_PARAMS['moderate'])
         
         print(f"📋 STRATEGY PARAMETERS")
         print("-" * 70)
         print(f"Stop Loss: {params['stop_loss']*100:.0f}%")
         print(f"Take Profit: {params['take_profit']*100:.0f}%")
         print(f"Position Size: {params['position_size']*100:.0f}% of capital")
+        print(f"Max Holding: {data['max_hold']} bars of {data['interval']}")
         
-        # Simulate behavior in different conditions
-        print(f"\n\n🌐 MARKET CONDITION SIMULATIONS")
-        print("-" * 70)
+        # Backtest the brackets on the downloaded history, split by market regime
+        level = risk_level if risk_level in RISK_PARAMS else 'moderate'
+        results = backtest_strategy(df, strategy_type if strategy_type in STRATEGY_DATA else 'position', [level])
         
-        scenarios = [
-            ("📈 Bull Market (Trending Up)", self._simulate_bull_market),
-            ("📉 Bear Market (Trending Down)", self._simulate_bear_market),
-            ("↔️ Sideways Market (Range-bound)", self._simulate_sideways_market),
-            ("🌊 High Volatility", self._simulate_volatile_market)
-        ]
+        print(f"\n\n🌐 BACKTEST BY MARKET REGIME ({len(df)} bars, long entry at every close)")
+        print("-" * 70)
         
-        for scenario_name, sim_func in scenarios:
-            print(f"\n{scenario_name}:")
-            sim_func(strategy_type, params)
+        labels = {
+            'trend': "📈 Trending",
+            'range': "↔️ Range-bound",
+            'high_volatility': "🌊 High Volatility",
+        }
+        for (_, regime), row in results['regimes'].iterrows():
+            print(f"\n{labels[regime]}:")
+            print(f"  Trades: {row['trades']:.0f} | Win Rate: {row['win_rate']:.0%} | "
+                  f"Avg Trade: {row['avg_return']:+.2%}")
+            print(f"  Expectancy: {row['expectancy']:+.2%} of capital per trade | "
+                  f"Avg Hold: {row['avg_bars']:.1f} bars")
+            print(f"  Exits: {row['stop_rate']:.0%} stop-loss, {row['target_rate']:.0%} take-profit, "
+                  f"{1 - row['stop_rate'] - row['target_rate']:.0%} time")
+        
+        account = results['account'].iloc[0]
+        print(f"\n💼 One position at a time: {account['trades']:.0f} trades, "
+              f"{account['total_return']:+.1%} total return, {account['max_drawdown']:.1%} max drawdown")
         
         print(f"\n\n💡 KEY INSIGHTS")
         print("-" * 70)
@@ -472,30 +473,7 @@ class AIStockAnalyst:
             print("• Focus: Strategic entries, macro trends, patience")
         
         print(f"\n{'='*70}\n")
-    
-    def _simulate_bull_market(self, strategy, params):
-        """Simulate bull market behavior."""
-        print(f"  Win Rate: ~65-75%")
-        print(f"  Expected: Multiple winning trades, let profits run")
-        print(f"  Action: Trail stops, reduce position sizing on strength")
-    
-    def _simulate_bear_market(self, strategy, params):
-        """Simulate bear market behavior."""
-        print(f"  Win Rate: ~35-45%")
-        print(f"  Expected: More stop-outs, short rallies")
-        print(f"  Action: Tighter stops, smaller positions, wait for reversal")
-    
-    def _simulate_sideways_market(self, strategy, params):
-        """Simulate sideways market behavior."""
-        print(f"  Win Rate: ~50-55%")
-        print(f"  Expected: Whipsaws, range-bound moves")
-        print(f"  Action: Buy support/sell resistance, avoid breakout trades")
-    
-    def _simulate_volatile_market(self, strategy, params):
-        """Simulate volatile market behavior."""
-        print(f"  Win Rate: ~45-60%")
-        print(f"  Expected: Large swings, faster profit/loss targets")
-        print(f"  Action: Wider stops, smaller positions, quick profits")
+        return results
     
     # ============================================================
     # Utility Methods
@@ -503,7 +481,7 @@ class AIStockAnalyst:
     
     def _format_large_number(self, num):
         """Format large numbers (billions, millions)."""
-        if not num or pd.isna(num):
+        if not num or _is_missing(num):
             return "N/A"
         if num >= 1e12:
             return f"${num/1e12:.2f}T"
@@ -516,55 +494,11 @@ class AIStockAnalyst:
     
     def _format_percent(self, value):
         """Format percentage values."""
-        if not value or pd.isna(value):
+        if not value or _is_missing(value):
             return "N/A"
         return f"{value*100:.2f}%"
 
 
-# ============================================================
-# CLI Interface
-# ============================================================
-
-def main():
-    """Main CLI interface."""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='AI-Powered Stock Analysis Toolkit')
-    parser.add_argument('--feature', type=int, choices=range(1, 8), required=True,
-                       help='Feature number (1-7)')
-    parser.add_argument('--stock', type=str, required=True,
-                       help='Stock ticker symbol')
-    parser.add_argument('--period', type=str, default='6mo',
-                       help='Time period for analysis')
-    parser.add_argument('--strategy', type=str, default='swing',
-                       choices=['intraday', 'swing', 'position'],
-                       help='Trading strategy type')
-    parser.add_argument('--risk', type=str, default='moderate',
-                       choices=['conservative', 'moderate', 'aggressive'],
-                       help='Risk level')
-    
-    args = parser.parse_args()
-    
-    analyst = AIStockAnalyst(args.stock)
-    
-    features = {
-        1: ('Personal Market Analyst', lambda: analyst.fundamental_analysis()),
-        2: ('Technical Chart Breakdown', lambda: analyst.technical_analysis(args.period)),
-        3: ('Trading Strategy Simulator', lambda: analyst.simulate_strategy(args.strategy, args.risk)),
-    }
-    
-    if args.feature in features:
-        name, func = features[args.feature]
-        print(f"\n🤖 Running: {name}\n")
-        func()
-    else:
-        print(f"Feature {args.feature} is under construction. Check back soon!")
-
-
-if __name__ == "__main__":
-    main()
-
-
 # ============================================================
 # Integration of Advanced Features (4-7)
 # ============================================================
@@ -603,8 +537,8 @@ def run_risk_manager():
 
 def run_stock_screener(ticker):
     """Feature 5: AI Stock Screener"""
-    from advanced_features import StockScreener
     import yfinance as yf
+    from advanced_features import StockScreener
     
     stock = yf.Ticker(ticker)
     screener = StockScreener()
@@ -621,7 +555,10 @@ def run_daily_brain():
     brain.generate_daily_routine()
 
 
-# Update main() to include new features
+# ============================================================
+# CLI Interface
+# ============================================================
+
 def main():
     """Main CLI interface."""
     import argparse
@@ -639,21 +576,27 @@ def main():
     parser.add_argument('--risk', type=str, default='moderate',
                        choices=['conservative', 'moderate', 'aggressive'],
                        help='Risk level')
+    parser.add_argument('--no-show', action='store_true',
+                       help='Only save charts as PNG (non-interactive Agg backend)')
     
     args = parser.parse_args()
     
+    import warnings
+    warnings.filterwarnings('ignore')
+    
     # Features that require a stock ticker
     if args.feature in [1, 2, 3, 5] and not args.stock:
         print("❌ Error: --stock required for this feature")
         return
     
-    if args.stock:
-        analyst = AIStockAnalyst(args.stock)
+    # Only the yfinance-backed features build an analyst (and import the stack)
+    def analyst():
+        return AIStockAnalyst(args.stock, show_charts=not args.no_show)
     
     features = {
-        1: ('Personal Market Analyst', lambda: analyst.fundamental_analysis()),
-        2: ('Technical Chart Breakdown', lambda: analyst.technical_analysis(args.period)),
-        3: ('Trading Strategy Simulator', lambda: analyst.simulate_strategy(args.strategy, args.risk)),
+        1: ('Personal Market Analyst', lambda: analyst().fundamental_analysis()),
+        2: ('Technical Chart Breakdown', lambda: analyst().technical_analysis(args.period)),
+        3: ('Trading Strategy Simulator', lambda: analyst().simulate_strategy(args.strategy, args.risk)),
         4: ('Personal Risk Manager', run_risk_manager),
         5: ('AI Stock Screener', lambda: run_stock_screener(args.stock)),
         6: ('News Impact Analyzer', lambda: print("Feature 6 coming in next update!")),
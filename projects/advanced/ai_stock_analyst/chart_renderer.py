@@ -0,0 +1,270 @@
+"""
+Batch Technical Chart Renderer
+==============================
+Renders the three-panel technical analysis chart (price + SMAs + Bollinger
+Bands, RSI, MACD) for a whole watchlist, headless.
+
+- One figure and one set of artists per process, updated in place for every
+  ticker instead of building (and leaking) a new pyplot figure each time
+- Agg canvas only: no GUI toolkit, no pyplot figure registry
+- Tickers are spread over a pool of worker processes; an offline CSV is
+  parsed once and each worker only receives the frames it renders
+
+Usage:
+    # Offline, from a long-format CSV with Date, Ticker and OHLCV columns
+    python chart_renderer.py --source ../../../data/sample_stock_prices.csv --out charts
+
+    # Live data via yfinance for a watchlist file (one ticker per line)
+    python chart_renderer.py --watchlist watchlist.txt --period 6mo --processes 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from ai_analyst import compute_technical_indicators
+
+
+class TechnicalChartRenderer:
+    """
+    Reusable technical analysis chart.
+
+    Pass a pyplot figure to draw into an interactive window; by default an
+    off-screen Agg figure is created. `render` only swaps the data of the
+    existing artists, so rendering many tickers costs one figure in memory.
+    """
+
+    def __init__(self, fig=None, figsize=(14, 10), dpi=150):
+        from matplotlib.patches import Patch
+        from matplotlib.collections import PolyCollection
+
+        if fig is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+        self.fig = fig
+        self.dpi = dpi
+
+        grid = fig.add_gridspec(3, 1, height_ratios=[3, 1, 1])
+        self.ax_price = fig.add_subplot(grid[0])
+        self.ax_rsi = fig.add_subplot(grid[1], sharex=self.ax_price)
+        self.ax_macd = fig.add_subplot(grid[2], sharex=self.ax_price)
+
+        # Price + MAs + Bollinger
+        ax = self.ax_price
+        self.price, = ax.plot([], [], 'b-', linewidth=1.5, label='Price')
+        self.sma_20, = ax.plot([], [], 'orange', linewidth=1, label='SMA 20')
+        self.sma_50, = ax.plot([], [], 'purple', linewidth=1, label='SMA 50')
+        self.title = ax.set_title('', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Price ($)')
+        ax.legend(handles=[self.price, self.sma_20, self.sma_50,
+                           Patch(color='gray', alpha=0.2, label='BB')], loc='upper left')
+        ax.grid(True, alpha=0.3)
+
+        # RSI
+        ax = self.ax_rsi
+        self.rsi, = ax.plot([], [], 'purple', linewidth=1.5)
+        ax.axhline(70, color='red', linestyle='--', alpha=0.5, label='Overbought')
+        ax.axhline(30, color='green', linestyle='--', alpha=0.5, label='Oversold')
+        ax.set_ylabel('RSI')
+        ax.set_ylim(0, 100)
+        ax.legend(loc='upper left')
+        ax.grid(True, alpha=0.3)
+
+        # MACD (histogram bars are one PolyCollection whose vertices are replaced)
+        ax = self.ax_macd
+        self.macd, = ax.plot([], [], 'b-', linewidth=1, label='MACD')
+        self.signal, = ax.plot([], [], 'r-', linewidth=1, label='Signal')
+        self.hist = PolyCollection([], alpha=0.3, label='Histogram')
+        ax.add_collection(self.hist)
+        ax.axhline(0, color='black', linestyle='-', linewidth=0.5)
+        ax.set_ylabel('MACD')
+        ax.legend(handles=[self.macd, self.signal, Patch(color='g', alpha=0.3, label='Histogram')],
+                  loc='upper left')
+        ax.grid(True, alpha=0.3)
+
+        self.ax_price.xaxis_date()
+        # Lay out with a title in place so the space above the price panel is kept
+        self.title.set_text('TICKER Technical Analysis')
+        fig.tight_layout()
+        self.title.set_text('')
+        self._fills = []
+
+    def render(self, ticker, df, path=None):
+        """
+        Draw `df` (OHLCV, indicators added if missing) and save it to `path`.
+
+        Returns the path written, or None when `path` is None (the figure is
+        only updated, e.g. before plt.show()).
+        """
+        import matplotlib.dates as mdates
+
+        if 'MACD_Hist' not in df:
+            df = compute_technical_indicators(df)
+
+        index = df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        x = mdates.date2num(index.to_numpy())
+        col = {name: df[name].to_numpy(dtype=float) for name in
+               ('Close', 'SMA_20', 'SMA_50', 'BB_Lower', 'BB_Upper', 'RSI', 'MACD', 'Signal', 'MACD_Hist')}
+
+        self.price.set_data(x, col['Close'])
+        self.sma_20.set_data(x, col['SMA_20'])
+        self.sma_50.set_data(x, col['SMA_50'])
+        self.rsi.set_data(x, col['RSI'])
+        self.macd.set_data(x, col['MACD'])
+        self.signal.set_data(x, col['Signal'])
+        self.title.set_text(f'{ticker} Technical Analysis')
+
+        # Fills depend on `where` masks, so they are rebuilt (and the old ones removed)
+        for fill in self._fills:
+            fill.remove()
+        rsi = col['RSI']
+        self._fills = [
+            self.ax_price.fill_between(x, col['BB_Lower'], col['BB_Upper'], alpha=0.2, color='gray'),
+            self.ax_rsi.fill_between(x, 70, rsi, where=rsi >= 70, alpha=0.3, color='red'),
+            self.ax_rsi.fill_between(x, 30, rsi, where=rsi <= 30, alpha=0.3, color='green'),
+        ]
+
+        # Histogram bars: (n, 4, 2) rectangle vertices and a vectorized colour choice
+        hist = np.nan_to_num(col['MACD_Hist'])
+        half = 0.4 * (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+        verts = np.empty((len(x), 4, 2))
+        verts[:, :, 0] = x[:, None] + np.array([-half, -half, half, half])
+        verts[:, :, 1] = np.column_stack([np.zeros_like(hist), hist, hist, np.zeros_like(hist)])
+        self.hist.set_verts(verts)
+        self.hist.set_facecolor(np.where(hist > 0, 'g', 'r'))
+
+        if len(x):
+            self.ax_price.set_xlim(x[0], x[-1])
+            self._fit_y(self.ax_price, col['Close'], col['SMA_20'], col['SMA_50'], col['BB_Lower'], col['BB_Upper'])
+            self._fit_y(self.ax_macd, col['MACD'], col['Signal'], hist, 0.0)
+
+        if path is None:
+            return None
+        self.fig.savefig(path, dpi=self.dpi, bbox_inches='tight')
+        return path
+
+    @staticmethod
+    def _fit_y(ax, *series):
+        values = np.concatenate([np.atleast_1d(s) for s in series])
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        pad = 0.05 * (hi - lo) or 1.0
+        ax.set_ylim(lo - pad, hi + pad)
+
+
+# ============================================================
+# Batch Rendering (worker processes)
+# ============================================================
+
+_renderer = None
+_period = None
+
+
+def _init_worker(period):
+    """Per-process setup: one renderer, and the yfinance period for downloads."""
+    global _renderer, _period
+    import matplotlib
+    matplotlib.use('Agg')
+    _renderer = TechnicalChartRenderer()
+    _period = period
+
+
+def load_csv_history(path):
+    """Long-format CSV -> {ticker: OHLCV frame indexed by date}."""
+    import pandas as pd
+
+    prices = pd.read_csv(path)
+    date_col = 'Date' if 'Date' in prices else 'Timestamp'
+    prices[date_col] = pd.to_datetime(prices[date_col])
+    prices = prices.sort_values([date_col], kind='stable')
+    return {ticker: group.set_index(date_col) for ticker, group in prices.groupby('Ticker')}
+
+
+def _render_one(ticker, out_dir, df=None):
+    """Render one chart from `df`, or from a yfinance download when it is None."""
+    try:
+        if df is None:
+            import yfinance as yf
+            df = yf.Ticker(ticker).history(period=_period)
+        if df.empty:
+            return ticker, None, 'no data'
+        path = Path(out_dir) / f'{ticker}_technical_analysis.png'
+        _renderer.render(ticker, df, path)
+        return ticker, str(path), None
+    except Exception as exc:  # one bad ticker must not stop the batch
+        return ticker, None, f'{type(exc).__name__}: {exc}'
+
+
+def render_watchlist(tickers, out_dir='charts', source=None, period='6mo', processes=None):
+    """
+    Render a PNG per ticker into `out_dir` using a pool of worker processes.
+
+    `source` is an optional long-format CSV, or the {ticker: frame} mapping
+    from `load_csv_history` (offline); it is parsed once here and each task
+    gets only its ticker's frame. Otherwise the workers download prices from
+    yfinance for `period`. Returns {ticker: path or error message}.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    processes = processes or os.cpu_count()
+
+    history = source
+    if source is not None and not isinstance(source, dict):
+        history = load_csv_history(source)
+
+    results = {}
+    if history is not None:
+        results = {t: '❌ no data' for t in tickers if t not in history}
+        tickers = [t for t in tickers if t in history]
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(period,)) as pool:
+        futures = [pool.submit(_render_one, ticker, out_dir,
+                               history[ticker] if history is not None else None)
+                   for ticker in tickers]
+        for i, future in enumerate(futures, 1):
+            ticker, path, error = future.result()
+            results[ticker] = path or f'❌ {error}'
+            if i % 50 == 0 or i == len(futures):
+                print(f"  Rendered {i}/{len(futures)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render technical analysis charts for a watchlist')
+    parser.add_argument('tickers', nargs='*', help='Tickers (default: all in --source)')
+    parser.add_argument('--watchlist', type=Path, help='File with one ticker per line')
+    parser.add_argument('--source', type=Path, help='Offline long-format price CSV')
+    parser.add_argument('--period', default='6mo', help='yfinance period when no --source is given')
+    parser.add_argument('--out', type=Path, default=Path('charts'), help='Output directory')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.watchlist:
+        tickers += [line.strip().upper() for line in args.watchlist.read_text().splitlines() if line.strip()]
+    history = load_csv_history(args.source) if args.source else None
+    if not tickers and history:
+        tickers = sorted(history)
+    if not tickers:
+        parser.error("give tickers, --watchlist or --source")
+
+    print(f"\n🖼️  Rendering {len(tickers)} charts → {args.out}/\n")
+    start = time.perf_counter()
+    results = render_watchlist(tickers, args.out, history, args.period, args.processes)
+    failed = {t: r for t, r in results.items() if r.startswith('❌')}
+
+    print(f"\n✅ {len(results) - len(failed)} charts in {time.perf_counter() - start:.1f}s")
+    for ticker, error in failed.items():
+        print(f"  {ticker}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Altman Z'' Credit Scoring
+=========================
+Altman Z'' (Z double prime) scores and implied credit ratings for a whole
+universe of issuers at once, from a local fundamentals table instead of
+per-ticker API calls.
+
+    Z'' = 6.56 x1 + 3.26 x2 + 6.72 x3 + 1.05 x4
+
+    x1 = working capital / total assets
+    x2 = retained earnings / total assets
+    x3 = EBIT / total assets
+    x4 = market value of equity / total liabilities
+
+The implied rating uses the score + 3.25 and the cut-offs of
+`altmanZDPImpliedRating` (curriculum/legacy/8_altman_z_double_prime.ipynb).
+All ratings come from one `np.searchsorted` over the sorted cut-offs.
+
+Usage:
+    from credit_scoring import credit_scores, load_fundamentals
+    table = credit_scores(load_fundamentals())   # one row per ticker
+
+    python credit_scoring.py --source ../../../data/fundamentals.csv
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FUNDAMENTALS_CSV = Path(__file__).resolve().parents[3] / 'data' / 'fundamentals.csv'
+
+FUNDAMENTAL_COLUMNS = ['CurrentAssets', 'CurrentLiabilities', 'TotalAssets', 'TotalLiabilities',
+                       'RetainedEarnings', 'EBIT', 'MarketCap']
+
+COEFFICIENTS = np.array([6.56, 3.26, 6.72, 1.05])
+RATING_OFFSET = 3.25
+
+# Cut-offs of the adjusted score, ascending, and the ratings between them:
+# adjusted score <= 1.75 is D, (1.75, 2.5] is CCC-, ..., above 8.15 is AAA
+RATING_CUTOFFS = np.array([1.75, 2.5, 3.2, 3.75, 4.15, 4.5, 4.75, 4.95, 5.25, 5.65,
+                           5.85, 6.25, 6.4, 6.65, 6.85, 7.0, 7.3, 7.6, 8.15])
+RATINGS = ['D', 'CCC-', 'CCC', 'CCC+', 'B-', 'B', 'B+', 'BB-', 'BB', 'BB+',
+           'BBB-', 'BBB', 'BBB+', 'A-', 'A', 'A+', 'AA-', 'AA', 'AA+', 'AAA']
+RATING = pd.CategoricalDtype(RATINGS, ordered=True)
+
+# Altman's original zones of the raw score
+ZONE = pd.CategoricalDtype(['Distress', 'Grey', 'Safe'], ordered=True)
+ZONE_CUTOFFS = np.array([1.1, 2.6])
+
+
+def load_fundamentals(path=FUNDAMENTALS_CSV):
+    """Fundamentals table indexed by ticker (columns as in FUNDAMENTAL_COLUMNS)."""
+    return pd.read_csv(path, index_col='Ticker')
+
+
+# ============================================================
+# Scoring
+# ============================================================
+
+def altman_ratios(fundamentals):
+    """x1..x4 as an (n, 4) array."""
+    f = {c: fundamentals[c].to_numpy(dtype=float) for c in FUNDAMENTAL_COLUMNS}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.column_stack([
+            (f['CurrentAssets'] - f['CurrentLiabilities']) / f['TotalAssets'],
+            f['RetainedEarnings'] / f['TotalAssets'],
+            f['EBIT'] / f['TotalAssets'],
+            f['MarketCap'] / f['TotalLiabilities'],
+        ])
+    ratios[~np.isfinite(ratios)] = np.nan
+    return ratios
+
+
+def altman_z_double_prime(fundamentals):
+    """Z'' score per row (NaN where an input is missing or a denominator is 0)."""
+    return altman_ratios(fundamentals) @ COEFFICIENTS
+
+
+def implied_rating(z_scores):
+    """Implied rating codes (0 = D .. 19 = AAA, -1 where the score is NaN)."""
+    z_scores = np.asarray(z_scores, dtype=float)
+    # Number of cut-offs strictly below the adjusted score = rating index
+    codes = np.searchsorted(RATING_CUTOFFS, z_scores + RATING_OFFSET, side='left')
+    return np.where(np.isnan(z_scores), -1, codes)
+
+
+def credit_scores(fundamentals):
+    """
+    Altman Z'' table for a universe, one row per ticker.
+
+    Columns: x1..x4, z_score, rating (ordered categorical, D < ... < AAA),
+    zone (Distress / Grey / Safe) and health_score: the rating's notch
+    scaled to 0 (D) .. 100 (AAA), the screener's financial-health factor.
+    """
+    ratios = altman_ratios(fundamentals)
+    z = ratios @ COEFFICIENTS
+    codes = implied_rating(z)
+    zones = np.where(np.isnan(z), -1, np.searchsorted(ZONE_CUTOFFS, z, side='right'))
+    return pd.DataFrame({
+        'x1': ratios[:, 0],
+        'x2': ratios[:, 1],
+        'x3': ratios[:, 2],
+        'x4': ratios[:, 3],
+        'z_score': z,
+        'rating': pd.Categorical.from_codes(codes, dtype=RATING),
+        'zone': pd.Categorical.from_codes(zones, dtype=ZONE),
+        'health_score': np.where(codes >= 0, codes / (len(RATINGS) - 1) * 100, np.nan),
+    }, index=fundamentals.index)
+
+
+def fundamentals_from_yfinance(stock):
+    """
+    One-row fundamentals table from a yfinance Ticker (latest annual report).
+
+    Returns None when the statements lack an item or cannot be downloaded,
+    so callers can fall back to their other checks.
+    """
+    try:
+        balance, income = stock.balance_sheet, stock.income_stmt
+        latest = balance.columns[0]
+        items = {
+            'CurrentAssets': balance.loc['Current Assets', latest],
+            'CurrentLiabilities': balance.loc['Current Liabilities', latest],
+            'TotalAssets': balance.loc['Total Assets', latest],
+            'TotalLiabilities': balance.loc['Total Liabilities Net Minority Interest', latest],
+            'RetainedEarnings': balance.loc['Retained Earnings', latest],
+            'EBIT': income.loc['EBIT', income.columns[0]],
+            'MarketCap': stock.info['marketCap'],
+        }
+    except Exception:
+        return None
+    return pd.DataFrame([items], index=pd.Index([stock.ticker], name='Ticker'))
+
+
+def synthetic_fundamentals(n_issuers, seed=42):
+    """Random but internally consistent fundamentals for `n_issuers` tickers."""
+    rng = np.random.default_rng(seed)
+    assets = rng.lognormal(3, 1.5, n_issuers)
+    liabilities = assets * rng.uniform(0.2, 1.1, n_issuers)
+    current_assets = assets * rng.uniform(0.1, 0.6, n_issuers)
+    return pd.DataFrame({
+        'CurrentAssets': current_assets,
+        'CurrentLiabilities': current_assets * rng.uniform(0.4, 1.8, n_issuers),
+        'TotalAssets': assets,
+        'TotalLiabilities': liabilities,
+        'RetainedEarnings': assets * rng.normal(0.15, 0.3, n_issuers),
+        'EBIT': assets * rng.normal(0.08, 0.08, n_issuers),
+        'MarketCap': assets * rng.lognormal(0, 0.8, n_issuers),
+    }, index=pd.Index([f"T{i:05d}" for i in range(n_issuers)], name='Ticker'))
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    import time
+
+    parser = argparse.ArgumentParser(description="Altman Z'' scores and implied ratings")
+    parser.add_argument('--source', default=FUNDAMENTALS_CSV, help='Fundamentals CSV (one row per ticker)')
+    parser.add_argument('--universe', type=int, default=100_000, help='Synthetic universe size to time')
+    args = parser.parse_args()
+
+    table = credit_scores(load_fundamentals(args.source))
+    with pd.option_context('display.width', 160):
+        print(f"\n🏦 Altman Z'' credit scores\n")
+        print(table.sort_values('z_score', ascending=False).round(3))
+
+    universe = synthetic_fundamentals(args.universe)
+    start = time.perf_counter()
+    scored = credit_scores(universe)
+    elapsed = time.perf_counter() - start
+    print(f"\n⏱️  {len(scored):,} issuers scored in {elapsed * 1000:.1f} ms")
+    print(scored['rating'].value_counts(sort=False).to_string())
+
+
+if __name__ == "__main__":
+    main()
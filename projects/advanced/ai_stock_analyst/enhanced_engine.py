@@ -15,8 +15,10 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Callable
 from collections import deque
+import functools
 import json
 import random
+import time
 
 # =============================================================================
 # DATA CLASSES
@@ -66,9 +68,22 @@ class PerformanceMetrics:
 # MULTI-MODEL AI ENGINE
 # =============================================================================
 
+DIRECTIONS = ['LONG', 'SHORT', 'NEUTRAL']
+DIRECTION = pd.CategoricalDtype(DIRECTIONS)
+
+
+def _above(threshold: float) -> float:
+    """Bin edge for `x > threshold` (np.digitize bins are closed on the left)."""
+    return np.nextafter(threshold, np.inf)
+
+
 class ModelEngine:
     """Base class for AI model engines"""
     
+    # The thresholds of `analyze` as np.digitize-style bins, used by CompiledConsensus:
+    # (input, bin edges, score points per bin), inputs from `rule_inputs`
+    RULES: List[tuple] = []
+    
     def __init__(self, name: str, specialty: str):
         self.name = name
         self.specialty = specialty
@@ -76,13 +91,44 @@ class ModelEngine:
     
     def analyze(self, data: Dict) -> MarketSignal:
         raise NotImplementedError
+    
+    def rule_inputs(self, col: Callable) -> Dict:
+        """Arrays for RULES; `col(name, default)` reads a column with `analyze`'s default."""
+        raise NotImplementedError
+    
+    def decide(self, score: int) -> tuple:
+        """(direction, confidence) for a total score"""
+        raise NotImplementedError
 
 class TechnicalModel(ModelEngine):
     """Technical analysis model (inspired by DeepSeek style)"""
     
+    RULES = [
+        ('above_sma_20', [1], [0, 1]),
+        ('above_sma_50', [1], [0, 1]),
+        ('rsi', [30, _above(70)], [2, 0, -2]),
+        ('macd', [0, _above(0)], [-1, 0, 1]),
+    ]
+    
     def __init__(self):
         super().__init__("TechnicalAI", "candlestick_patterns")
     
+    def rule_inputs(self, col: Callable) -> Dict:
+        price = col('price', 100)
+        return {
+            'above_sma_20': price > col('sma_20', price * 0.98),
+            'above_sma_50': price > col('sma_50', price * 0.95),
+            'rsi': col('rsi', 50),
+            'macd': col('macd', 0),
+        }
+    
+    def decide(self, score: int) -> tuple:
+        if score >= 2:
+            return 'LONG', min(0.9, 0.5 + score * 0.1)
+        if score <= -2:
+            return 'SHORT', min(0.9, 0.5 + abs(score) * 0.1)
+        return 'NEUTRAL', 0.3
+    
     def analyze(self, data: Dict) -> MarketSignal:
         """Analyze technical indicators"""
         price = data.get('price', 100)
@@ -122,15 +168,7 @@ class TechnicalModel(ModelEngine):
             reasoning_parts.append("MACD bearish")
         
         # Determine direction
-        if score >= 2:
-            direction = 'LONG'
-            confidence = min(0.9, 0.5 + score * 0.1)
-        elif score <= -2:
-            direction = 'SHORT'
-            confidence = min(0.9, 0.5 + abs(score) * 0.1)
-        else:
-            direction = 'NEUTRAL'
-            confidence = 0.3
+        direction, confidence = self.decide(score)
         
         return MarketSignal(
             direction=direction,
@@ -142,9 +180,31 @@ class TechnicalModel(ModelEngine):
 class FundamentalModel(ModelEngine):
     """Fundamental analysis model (inspired by GPT style)"""
     
+    RULES = [
+        ('pe_ratio', [15, _above(30)], [2, 0, -1]),
+        ('roe', [0, _above(0.10), _above(0.20)], [-2, 0, 1, 2]),
+        ('debt_equity', [0.5, _above(2)], [1, 0, -1]),
+        ('revenue_growth', [0, _above(0.05), _above(0.15)], [-1, 0, 1, 2]),
+    ]
+    
     def __init__(self):
         super().__init__("FundamentalAI", "financial_statements")
     
+    def rule_inputs(self, col: Callable) -> Dict:
+        return {
+            'pe_ratio': col('pe_ratio', 20),
+            'roe': col('roe', 0.15),
+            'debt_equity': col('debt_equity', 0.5),
+            'revenue_growth': col('revenue_growth', 0.05),
+        }
+    
+    def decide(self, score: int) -> tuple:
+        if score >= 3:
+            return 'LONG', min(0.85, 0.5 + score * 0.08)
+        if score <= -2:
+            return 'SHORT', min(0.85, 0.5 + abs(score) * 0.08)
+        return 'NEUTRAL', 0.4
+    
     def analyze(self, data: Dict) -> MarketSignal:
         """Analyze fundamental metrics"""
         pe_ratio = data.get('pe_ratio', 20)
@@ -195,15 +255,7 @@ class FundamentalModel(ModelEngine):
             score -= 1
             reasoning_parts.append(f"Declining revenue ({revenue_growth:.1%})")
         
-        if score >= 3:
-            direction = 'LONG'
-            confidence = min(0.85, 0.5 + score * 0.08)
-        elif score <= -2:
-            direction = 'SHORT'
-            confidence = min(0.85, 0.5 + abs(score) * 0.08)
-        else:
-            direction = 'NEUTRAL'
-            confidence = 0.4
+        direction, confidence = self.decide(score)
         
         return MarketSignal(
             direction=direction,
@@ -215,9 +267,34 @@ class FundamentalModel(ModelEngine):
 class SentimentModel(ModelEngine):
     """Sentiment analysis model (inspired by Claude style)"""
     
+    # Ratings and insider activity enter as +1 / 0 / -1 (buy|buying, other, sell|selling)
+    RULES = [
+        ('news_sentiment', [-0.3, _above(0.3)], [-2, 0, 2]),
+        ('social_sentiment', [-0.4, _above(0.4)], [-1, 0, 1]),
+        ('analyst_rating', [0, 1], [-1, 0, 1]),
+        ('insider_activity', [0, 1], [-1, 0, 2]),
+    ]
+    
     def __init__(self):
         super().__init__("SentimentAI", "news_social_media")
     
+    def rule_inputs(self, col: Callable) -> Dict:
+        rating = col('analyst_rating', 'hold')
+        insider = col('insider_activity', 'neutral')
+        return {
+            'news_sentiment': col('news_sentiment', 0),
+            'social_sentiment': col('social_sentiment', 0),
+            'analyst_rating': (rating == 'buy').astype(int) - (rating == 'sell'),
+            'insider_activity': (insider == 'buying').astype(int) - (insider == 'selling'),
+        }
+    
+    def decide(self, score: int) -> tuple:
+        if score >= 2:
+            return 'LONG', min(0.80, 0.4 + score * 0.1)
+        if score <= -2:
+            return 'SHORT', min(0.80, 0.4 + abs(score) * 0.1)
+        return 'NEUTRAL', 0.3
+    
     def analyze(self, data: Dict) -> MarketSignal:
         """Analyze market sentiment"""
         news_sentiment = data.get('news_sentiment', 0)  # -1 to 1
@@ -262,15 +339,7 @@ class SentimentModel(ModelEngine):
             score -= 1
             reasoning_parts.append("Insider selling")
         
-        if score >= 2:
-            direction = 'LONG'
-            confidence = min(0.80, 0.4 + score * 0.1)
-        elif score <= -2:
-            direction = 'SHORT'
-            confidence = min(0.80, 0.4 + abs(score) * 0.1)
-        else:
-            direction = 'NEUTRAL'
-            confidence = 0.3
+        direction, confidence = self.decide(score)
         
         return MarketSignal(
             direction=direction,
@@ -314,6 +383,35 @@ class RiskModel(ModelEngine):
 # MULTI-MODEL CONSENSUS ENGINE (Alpha Arena Style)
 # =============================================================================
 
+def consensus_vote(votes: List[tuple], weights: Dict[str, float]) -> tuple:
+    """
+    Weighted vote over (source, direction, confidence) model signals.
+    
+    Returns (direction, confidence, number of models agreeing); shared by
+    MultiModelEngine.analyze and the CompiledConsensus tables.
+    """
+    direction_scores = {'LONG': 0, 'SHORT': 0, 'NEUTRAL': 0}
+    
+    for source, direction, confidence in votes:
+        direction_scores[direction] += confidence * weights[source]
+    
+    # Determine consensus direction
+    max_direction = max(direction_scores, key=direction_scores.get)
+    max_score = direction_scores[max_direction]
+    
+    # Calculate overall confidence
+    total_weight = sum(weights.values())
+    overall_confidence = max_score / total_weight if total_weight > 0 else 0
+    
+    agreement_count = sum(1 for _, direction, _ in votes if direction == max_direction)
+    return max_direction, overall_confidence, agreement_count
+
+
+def is_actionable(direction: str, confidence: float, strength: float) -> bool:
+    """Whether a consensus is strong enough to propose a trade"""
+    return direction != 'NEUTRAL' and confidence > 0.5 and strength >= 0.66
+
+
 class MultiModelEngine:
     """
     Multi-model consensus system inspired by nof1.ai Alpha Arena.
@@ -339,6 +437,8 @@ class MultiModelEngine:
             'fundamental': deque(maxlen=50),
             'sentiment': deque(maxlen=50)
         }
+        
+        self._compiled = None
     
     def analyze(self, data: Dict) -> Dict:
         """
@@ -355,22 +455,11 @@ class MultiModelEngine:
         signals = [technical_signal, fundamental_signal, sentiment_signal]
         
         # Calculate weighted consensus
-        direction_scores = {'LONG': 0, 'SHORT': 0, 'NEUTRAL': 0}
-        
-        for signal in signals:
-            weight = self.weights[signal.source]
-            direction_scores[signal.direction] += signal.confidence * weight
-        
-        # Determine consensus direction
-        max_direction = max(direction_scores, key=direction_scores.get)
-        max_score = direction_scores[max_direction]
-        
-        # Calculate overall confidence
-        total_weight = sum(self.weights.values())
-        overall_confidence = max_score / total_weight if total_weight > 0 else 0
+        max_direction, overall_confidence, agreement_count = consensus_vote(
+            [(s.source, s.direction, s.confidence) for s in signals], self.weights
+        )
         
         # Check for consensus strength
-        agreement_count = sum(1 for s in signals if s.direction == max_direction)
         consensus_strength = agreement_count / len(signals)
         
         return {
@@ -397,9 +486,29 @@ class MultiModelEngine:
                 'strength': consensus_strength,
                 'agreement': f"{agreement_count}/{len(signals)} models agree"
             },
-            'actionable': max_direction != 'NEUTRAL' and overall_confidence > 0.5 and consensus_strength >= 0.66
+            'actionable': is_actionable(max_direction, overall_confidence, consensus_strength)
         }
     
+    def compiled(self) -> 'CompiledConsensus':
+        """Consensus lookup tables for the current weights (rebuilt after they change)"""
+        if self._compiled is None or self._compiled.weights != self.weights:
+            models = {
+                'technical': self.technical_model,
+                'fundamental': self.fundamental_model,
+                'sentiment': self.sentiment_model,
+            }
+            self._compiled = CompiledConsensus(models, self.weights)
+        return self._compiled
+    
+    def analyze_batch(self, data) -> pd.DataFrame:
+        """
+        Model directions and consensus for many inputs at once.
+        
+        `data` is a DataFrame (or list of dicts) with one row per ticker or
+        bar and the `analyze` fields as columns; see CompiledConsensus.score.
+        """
+        return self.compiled().score(data)
+    
     def generate_proposal(self, ticker: str, data: Dict, portfolio_value: float = 100000) -> Optional[TradeProposal]:
         """Generate a trade proposal if conditions are met"""
         analysis = self.analyze(data)
@@ -472,6 +581,94 @@ class MultiModelEngine:
             for model in self.weights:
                 self.weights[model] = recent_accuracy.get(model, 0.33) / total
 
+class CompiledConsensus:
+    """
+    The MultiModelEngine consensus precompiled into lookup tables.
+    
+    Every model is a step function of a few thresholded inputs, so its
+    direction and confidence depend only on its integer score, and the
+    consensus only on the three scores and the weights. The tables hold the
+    consensus for every score combination under one set of weights; a
+    batch is then scored by binning each input and one gather.
+    The results equal `MultiModelEngine.analyze` row by row.
+    """
+    
+    def __init__(self, models: Dict[str, ModelEngine], weights: Dict[str, float]):
+        self.models = models
+        self.weights = dict(weights)
+        self.rules, self.offsets, self.model_directions = [], [], []
+        decisions = []
+        for model in models.values():
+            rules = [(name, np.asarray(edges, dtype=float), np.asarray(points))
+                     for name, edges, points in model.RULES]
+            low = sum(int(points.min()) for _, _, points in rules)
+            high = sum(int(points.max()) for _, _, points in rules)
+            decided = [model.decide(score) for score in range(low, high + 1)]
+            self.rules.append(rules)
+            self.offsets.append(low)
+            self.model_directions.append(np.array([DIRECTIONS.index(d) for d, _ in decided], dtype=np.int8))
+            decisions.append(decided)
+        
+        self.shape = tuple(len(d) for d in decisions)
+        direction = np.empty(self.shape, dtype=np.int8)
+        confidence = np.empty(self.shape)
+        strength = np.empty(self.shape)
+        actionable = np.empty(self.shape, dtype=bool)
+        for cell in np.ndindex(self.shape):
+            votes = [(source, *decided[i]) for source, decided, i in zip(models, decisions, cell)]
+            max_direction, overall_confidence, agreement_count = consensus_vote(votes, self.weights)
+            consensus_strength = agreement_count / len(votes)
+            direction[cell] = DIRECTIONS.index(max_direction)
+            confidence[cell] = overall_confidence
+            strength[cell] = consensus_strength
+            actionable[cell] = is_actionable(max_direction, overall_confidence, consensus_strength)
+        self.direction, self.confidence = direction.ravel(), confidence.ravel()
+        self.strength, self.actionable = strength.ravel(), actionable.ravel()
+    
+    def scores(self, data: pd.DataFrame) -> List[np.ndarray]:
+        """Integer score of every model for every row."""
+        n = len(data)
+        
+        def col(name, default):
+            # Missing columns and NaN cells take the default, as a missing key does in analyze
+            if name not in data:
+                return np.full(n, default) if np.isscalar(default) else default
+            column = data[name]
+            if not pd.api.types.is_numeric_dtype(column):
+                return column.fillna(default)
+            values = column.to_numpy(dtype=float)
+            missing = np.isnan(values)
+            return np.where(missing, default, values) if missing.any() else values
+        
+        scores = []
+        for model, rules in zip(self.models.values(), self.rules):
+            inputs = model.rule_inputs(col)
+            score = np.zeros(n, dtype=np.intp)
+            for name, edges, points in rules:
+                x = np.asarray(inputs[name], dtype=float)
+                # The bins of np.digitize(x, edges); one compare per edge is faster for 1-3 edges
+                score += points[sum((x >= edge).view(np.int8) for edge in edges)]
+            scores.append(score)
+        return scores
+    
+    def score(self, data) -> pd.DataFrame:
+        """
+        Directions of each model plus consensus direction, confidence,
+        strength and actionable flag, one row per row of `data`.
+        """
+        data = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        cells = [score - offset for score, offset in zip(self.scores(data), self.offsets)]
+        flat = np.ravel_multi_index(cells, self.shape)
+        table = {source: pd.Categorical.from_codes(directions[cell], dtype=DIRECTION)
+                 for source, directions, cell in zip(self.models, self.model_directions, cells)}
+        table.update({
+            'direction': pd.Categorical.from_codes(self.direction[flat], dtype=DIRECTION),
+            'confidence': self.confidence[flat],
+            'strength': self.strength[flat],
+            'actionable': self.actionable[flat],
+        })
+        return pd.DataFrame(table, index=data.index)
+
 # =============================================================================
 # INTELLIGENT RISK MANAGEMENT (Alpha Arena Style)
 # =============================================================================
@@ -496,6 +693,7 @@ class IntelligentRiskManager:
         self.max_trades_per_day = 10
         self.cooldown_seconds = 300  # 5 minute cooldown between trades
         self.volatility_threshold = 0.05  # 5% daily volatility threshold
+        self.max_var_pct = 0.02  # 1-day VaR limit as a share of current capital
         
         # State
         self.is_trading_paused = False
@@ -527,6 +725,22 @@ class IntelligentRiskManager:
         
         return True, "Trading allowed"
     
+    def check_var_limit(self, var_engine, trades: Optional[Dict[str, float]] = None) -> tuple[bool, str]:
+        """
+        Pre-trade VaR check.
+        
+        `var_engine` is a portfolio_var.PortfolioVaR for the current book
+        (stock portfolio tracker). With `trades` ({ticker: $ change}) the
+        check uses the VaR after them, via incremental VaR (no rebuild).
+        """
+        var = var_engine.var
+        if trades:
+            var += var_engine.incremental_var(trades)[0]
+        limit = self.max_var_pct * self.current_capital
+        if var > limit:
+            return False, f"VaR Limit: ${var:,.0f} exceeds ${limit:,.0f} ({self.max_var_pct:.1%} of capital)"
+        return True, f"VaR ${var:,.0f} within ${limit:,.0f} limit"
+    
     def adjust_position_size(self, base_size: float, volatility: float) -> float:
         """Adjust position size based on current conditions"""
         # Reduce size during high volatility
@@ -697,6 +911,139 @@ class PerformanceAnalytics:
 """
         return report
 
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+
+class Instrumentation:
+    """
+    Per-stage timers and counters for the analysis pipeline.
+    
+    Disabled instrumentation costs nothing: `attach` replaces methods on the
+    instances being watched with timed wrappers, and `detach` deletes the
+    wrappers so the original class methods are used again.
+    
+    Each stage records calls, errors, total and self time (total minus
+    time spent in nested stages) and the slowest call. Stages with an
+    outcome function also count outcomes, e.g. proposals generated vs
+    rejected.
+    """
+    
+    def __init__(self, namespace: str = 'analyst'):
+        self.namespace = namespace
+        self.stages = {}
+        self.outcomes = {}
+        self._stack = []
+        self._attached = []
+    
+    def _stage(self, name: str) -> Dict:
+        if name not in self.stages:
+            self.stages[name] = {'calls': 0, 'errors': 0, 'total_seconds': 0.0,
+                                 'self_seconds': 0.0, 'max_seconds': 0.0}
+        return self.stages[name]
+    
+    def wrap(self, func: Callable, name: str, outcome: Optional[Callable] = None) -> Callable:
+        """Return `func` timed as stage `name`; `outcome(result)` labels the result."""
+        stats = self._stage(name)
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                stats['errors'] += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                stats['calls'] += 1
+                stats['total_seconds'] += elapsed
+                stats['self_seconds'] += elapsed - nested
+                stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+            if outcome is not None:
+                key = (name, outcome(result))
+                self.outcomes[key] = self.outcomes.get(key, 0) + 1
+            return result
+        
+        return timed
+    
+    def attach(self, obj, method: str, name: str, outcome: Optional[Callable] = None):
+        """Time `obj.method` as stage `name` until `detach` is called."""
+        setattr(obj, method, self.wrap(getattr(obj, method), name, outcome))
+        self._attached.append((obj, method))
+    
+    def detach(self):
+        """Remove all wrappers, restoring the uninstrumented methods."""
+        for obj, method in self._attached:
+            if method in vars(obj):
+                delattr(obj, method)
+        self._attached = []
+    
+    def reset(self):
+        """Zero all timers and counters."""
+        for stats in self.stages.values():
+            stats.update(calls=0, errors=0, total_seconds=0.0, self_seconds=0.0, max_seconds=0.0)
+        self.outcomes = {}
+    
+    def snapshot(self) -> Dict:
+        """JSON-serialisable copy of the current timers and counters."""
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'stages': {
+                name: {**stats, 'mean_seconds': stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0}
+                for name, stats in self.stages.items()
+            },
+            'outcomes': [
+                {'stage': stage, 'outcome': str(label), 'count': count}
+                for (stage, label), count in self.outcomes.items()
+            ],
+        }
+    
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self) -> str:
+        """Current values in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_stage_seconds Wall time spent in each pipeline stage.",
+            f"# TYPE {ns}_stage_seconds summary",
+        ]
+        for name, stats in self.stages.items():
+            lines.append(f'{ns}_stage_seconds_sum{{stage="{name}"}} {stats["total_seconds"]:.9f}')
+            lines.append(f'{ns}_stage_seconds_count{{stage="{name}"}} {stats["calls"]}')
+        
+        gauges = [
+            ('stage_self_seconds_total', 'counter', 'Time in each stage excluding nested stages.', 'self_seconds'),
+            ('stage_max_seconds', 'gauge', 'Slowest single call of each stage.', 'max_seconds'),
+            ('stage_errors_total', 'counter', 'Calls that raised an exception.', 'errors'),
+        ]
+        for metric, kind, help_text, key in gauges:
+            lines.append(f"# HELP {ns}_{metric} {help_text}")
+            lines.append(f"# TYPE {ns}_{metric} {kind}")
+            for name, stats in self.stages.items():
+                lines.append(f'{ns}_{metric}{{stage="{name}"}} {stats[key]}')
+        
+        lines.append(f"# HELP {ns}_stage_outcomes_total Results of each stage by outcome.")
+        lines.append(f"# TYPE {ns}_stage_outcomes_total counter")
+        for (stage, label), count in self.outcomes.items():
+            lines.append(f'{ns}_stage_outcomes_total{{stage="{stage}",outcome="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+    
+    def print_summary(self):
+        """Print stages sorted by self time."""
+        print(f"\n  ⏱️ PIPELINE TIMINGS")
+        print(f"  {'-'*60}")
+        print(f"  {'Stage':<22}{'Calls':>8}{'Total ms':>11}{'Self ms':>10}{'Mean µs':>10}")
+        for name, stats in sorted(self.stages.items(), key=lambda kv: -kv[1]['self_seconds']):
+            mean = stats['total_seconds'] / stats['calls'] * 1e6 if stats['calls'] else 0.0
+            print(f"  {name:<22}{stats['calls']:>8}{stats['total_seconds'] * 1e3:>11.2f}"
+                  f"{stats['self_seconds'] * 1e3:>10.2f}{mean:>10.1f}")
+
 # =============================================================================
 # MAIN ENHANCED AI ANALYST
 # =============================================================================
@@ -707,12 +1054,53 @@ class EnhancedAIAnalyst:
     Combines multi-model analysis, intelligent risk management, and performance tracking.
     """
     
-    def __init__(self, initial_capital: float = 100000):
+    def __init__(self, initial_capital: float = 100000, var_engine=None):
         self.multi_model = MultiModelEngine()
         self.risk_manager = IntelligentRiskManager(initial_capital)
         self.analytics = PerformanceAnalytics()
         self.pending_proposals = []
         self.active_trades = []
+        self.instrumentation = None
+        # Optional portfolio_var.PortfolioVaR of the book: proposals must pass
+        # the VaR limit, and executed trades are applied to it until closed
+        self.var_engine = var_engine
+        self._var_trades = {}
+    
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Start timing every pipeline stage; returns the `Instrumentation`.
+        
+        Stages: model.technical / model.fundamental / model.sentiment,
+        consensus (includes the models; see self time), risk.check,
+        risk.adjust_size, risk.var, risk.status, proposal, approve and close.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        inst = self.instrumentation
+        inst.detach()
+        
+        mm = self.multi_model
+        inst.attach(mm.technical_model, 'analyze', 'model.technical', lambda s: s.direction)
+        inst.attach(mm.fundamental_model, 'analyze', 'model.fundamental', lambda s: s.direction)
+        inst.attach(mm.sentiment_model, 'analyze', 'model.sentiment', lambda s: s.direction)
+        inst.attach(mm, 'analyze', 'consensus',
+                    lambda a: a['consensus']['direction'] if a['actionable'] else 'not_actionable')
+        inst.attach(self.risk_manager, 'check_trading_allowed', 'risk.check',
+                    lambda r: 'allowed' if r[0] else 'blocked')
+        inst.attach(self.risk_manager, 'adjust_position_size', 'risk.adjust_size')
+        inst.attach(self.risk_manager, 'check_var_limit', 'risk.var',
+                    lambda r: 'allowed' if r[0] else 'blocked')
+        inst.attach(self.risk_manager, 'get_risk_status', 'risk.status')
+        inst.attach(self, 'generate_trade_proposal', 'proposal',
+                    lambda p: 'generated' if p else 'none')
+        inst.attach(self, 'approve_proposal', 'approve', lambda ok: 'approved' if ok else 'not_found')
+        inst.attach(self, 'close_trade', 'close', lambda ok: 'closed' if ok else 'not_found')
+        return inst
+    
+    def disable_instrumentation(self):
+        """Stop timing; collected numbers stay readable on `self.instrumentation`."""
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
     
     def analyze_stock(self, ticker: str, data: Dict) -> Dict:
         """Run full multi-model analysis on a stock"""
@@ -745,16 +1133,34 @@ class EnhancedAIAnalyst:
             adjusted_size = self.risk_manager.adjust_position_size(base_size, volatility)
             proposal.size_pct = adjusted_size / self.risk_manager.current_capital
             
+            if self.var_engine is not None:
+                allowed, reason = self.risk_manager.check_var_limit(self.var_engine, self._var_trade(proposal))
+                if not allowed:
+                    print(f"⚠️ Trading blocked: {reason}")
+                    return None
+            
             self.pending_proposals.append(proposal)
         
         return proposal
     
+    def _var_trade(self, proposal: TradeProposal) -> Optional[Dict[str, float]]:
+        """Exposure change of a proposal for the VaR engine (None if it has no history for the ticker)."""
+        if proposal.ticker not in self.var_engine.column:
+            return None
+        notional = proposal.size_pct * self.risk_manager.current_capital
+        return {proposal.ticker: notional if proposal.direction == 'LONG' else -notional}
+    
     def approve_proposal(self, proposal_id: str) -> bool:
         """Approve and execute a trade proposal"""
         for proposal in self.pending_proposals:
             if proposal.id == proposal_id:
                 proposal.status = 'executed'
                 self.active_trades.append(proposal)
+                if self.var_engine is not None:
+                    trade = self._var_trade(proposal)
+                    if trade:
+                        self.var_engine.apply(trade)
+                        self._var_trades[proposal.id] = trade
                 self.pending_proposals.remove(proposal)
                 return True
         return False
@@ -780,6 +1186,8 @@ class EnhancedAIAnalyst:
                 )
                 
                 self.active_trades.remove(trade)
+                if trade.id in self._var_trades:
+                    self.var_engine.apply({t: -v for t, v in self._var_trades.pop(trade.id).items()})
                 return True
         return False
     
@@ -839,9 +1247,43 @@ class MarketBacktester:
     def __init__(self, analyst: 'EnhancedAIAnalyst'):
         self.analyst = analyst
         self.history = []
+        self.last_profile = None
 
-    def run_simulation(self, ticker: str, iterations: int = 20):
-        """Simulate multiple trading scenarios to test strategy robustness"""
+    def run_simulation(self, ticker: str, iterations: int = 20, profile: Optional[str] = None):
+        """
+        Simulate multiple trading scenarios to test strategy robustness.
+        
+        `profile` may be 'cprofile' or 'pyinstrument' (if installed) to
+        capture a profile of the whole run; it is printed at the end and
+        kept on `self.last_profile`.
+        """
+        if profile is None:
+            return self._run_simulation(ticker, iterations)
+        
+        if profile == 'cprofile':
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            profiler.runcall(self._run_simulation, ticker, iterations)
+            self.last_profile = pstats.Stats(profiler).sort_stats('cumulative')
+            self.last_profile.print_stats(20)
+        elif profile == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("profile='pyinstrument' needs pyinstrument (pip install pyinstrument)")
+            profiler = Profiler()
+            profiler.start()
+            try:
+                self._run_simulation(ticker, iterations)
+            finally:
+                profiler.stop()
+            self.last_profile = profiler
+            print(profiler.output_text(unicode=True))
+        else:
+            raise ValueError(f"Unknown profiler: {profile!r} (use 'cprofile' or 'pyinstrument')")
+    
+    def _run_simulation(self, ticker: str, iterations: int):
         print(f"\n🚀 STARTING BACKTEST SIMULATION: {ticker} ({iterations} iterations)")
         print(f"─{'─'*70}")
         
@@ -907,15 +1349,81 @@ class MarketBacktester:
         print(f"\n✅ Simulation Complete!")
         print(self.analyst.get_performance_report())
 
+    def replay(self, ticker: str, features: pd.DataFrame, extra: Optional[Dict] = None):
+        """
+        Run the pipeline over a ticker's real history instead of random draws.
+        
+        `features` is a point-in-time table from `indicators.feature_table`
+        (rows from the warm-up period with missing values are skipped);
+        `extra` holds the fundamental/sentiment fields added to every bar.
+        Bars are processed in order: open trades close at the first close
+        through their stop or target (or at the last close), then the risk
+        manager decides whether a new trade may open. Daily counters reset
+        when the date changes, so the daily limits apply per trading day.
+        """
+        rows = features.xs(ticker, level='ticker').dropna()
+        bars = rows.to_dict('records')
+        print(f"\n🚀 REPLAYING HISTORY: {ticker} ({len(bars)} bars, "
+              f"{rows.index[0]:%Y-%m-%d} to {rows.index[-1]:%Y-%m-%d})" if bars else f"\n🚀 REPLAYING HISTORY: {ticker} (no bars)")
+        print(f"─{'─'*70}")
+        
+        risk_manager = self.analyst.risk_manager
+        original_cooldown = risk_manager.cooldown_seconds
+        risk_manager.cooldown_seconds = 0     # wall-clock cooldown means nothing in a replay
+        
+        session, blocked = None, None
+        for i, (date, bar) in enumerate(zip(rows.index, bars)):
+            if date.date() != session:
+                session = date.date()
+                risk_manager.reset_daily_stats()
+            
+            price = bar['price']
+            last_bar = i == len(bars) - 1
+            for trade in [t for t in self.analyst.active_trades if t.ticker == ticker]:
+                if trade.direction == 'LONG':
+                    hit = price <= trade.stop_loss or price >= trade.take_profit
+                else:
+                    hit = price >= trade.stop_loss or price <= trade.take_profit
+                if hit or last_bar:
+                    self.analyst.close_trade(trade.id, price)
+            if last_bar:
+                break
+            
+            allowed, reason = risk_manager.check_trading_allowed()
+            if not allowed:
+                if reason.split(':')[0] != blocked:
+                    print(f"  ⚠️ No new trades from {date:%Y-%m-%d}: {reason}")
+                blocked = reason.split(':')[0]
+                continue
+            blocked = None
+            proposal = self.analyst.generate_trade_proposal(ticker, {**(extra or {}), **bar})
+            if proposal:
+                self.analyst.approve_proposal(proposal.id)
+        
+        risk_manager.cooldown_seconds = original_cooldown
+        
+        print(f"\n✅ Replay Complete!")
+        print(self.analyst.get_performance_report())
 
-def demo():
-    """Run a full demo of the enhanced AI analyst"""
+def demo(metrics: Optional[str] = None, profile: Optional[str] = None,
+         source: Optional[str] = None, ticker: str = 'AAPL'):
+    """
+    Run a full demo of the enhanced AI analyst.
+    
+    `metrics` ('table', 'json' or 'prometheus') turns on pipeline
+    instrumentation and prints it after the backtest; `profile` is passed
+    to `MarketBacktester.run_simulation`. With `source` (a long-format
+    OHLCV CSV) the technical fields come from `indicators.feature_table`
+    and the backtest replays `ticker`'s history instead of random bars.
+    """
     print(f"\n{'='*70}")
     print(f"  🚀 ENHANCED AI STOCK ANALYST - DEMO v2.0")
     print(f"  Powered by Multi-Model AI (Alpha Arena Style)")
     print(f"{'='*70}\n")
     
     analyst = EnhancedAIAnalyst(initial_capital=100000)
+    if metrics:
+        analyst.enable_instrumentation()
     
     # Sample real-world scenario
     sample_data = {
@@ -936,12 +1444,41 @@ def demo():
         'insider_activity': 'neutral'
     }
     
+    features = None
+    if source:
+        from indicators import FEATURE_COLUMNS, feature_table, to_panel
+        features = feature_table(to_panel(pd.read_csv(source)))
+        latest = features.xs(ticker, level='ticker').iloc[-1]
+        sample_data.update(latest.dropna().to_dict())
+        extra = {k: v for k, v in sample_data.items() if k not in FEATURE_COLUMNS}
+    
     # 1. Print Analysis
-    analyst.print_analysis('AAPL', sample_data)
+    analyst.print_analysis(ticker, sample_data)
     
-    # 2. Run Backtest Simulation
+    # 2. Run Backtest Simulation (or replay the real history)
     backtester = MarketBacktester(analyst)
-    backtester.run_simulation('AAPL', iterations=100)
+    if features is not None:
+        backtester.replay(ticker, features, extra)
+    else:
+        backtester.run_simulation(ticker, iterations=100, profile=profile)
+    
+    # 3. Pipeline metrics
+    if metrics == 'table':
+        analyst.instrumentation.print_summary()
+    elif metrics == 'json':
+        print(analyst.instrumentation.to_json())
+    elif metrics == 'prometheus':
+        print(analyst.instrumentation.to_prometheus())
 
 if __name__ == "__main__":
-    demo()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Enhanced AI Stock Analyst demo')
+    parser.add_argument('--metrics', choices=['table', 'json', 'prometheus'],
+                        help='Instrument the pipeline and print per-stage timings')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help='Profile the backtest simulation')
+    parser.add_argument('--source', help='Long-format OHLCV CSV to replay instead of random bars')
+    parser.add_argument('--ticker', default='AAPL', help='Ticker to analyse')
+    args = parser.parse_args()
+    demo(metrics=args.metrics, profile=args.profile, source=args.source, ticker=args.ticker)
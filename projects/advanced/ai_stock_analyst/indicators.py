@@ -0,0 +1,369 @@
+"""
+Universe Technical Indicators
+=============================
+The indicator set of `AIStockAnalyst.technical_analysis` (SMA, EMA, RSI,
+MACD, Bollinger Bands, support/resistance, volume), plus ATR and realised
+volatility, computed for many tickers at once, with the findings returned
+as a typed table instead of printed.
+
+Prices are held as a wide panel: one dates × tickers DataFrame per OHLCV
+field. Every indicator is a column-wise rolling/ewm operation on those
+frames, so there is no groupby and no per-ticker loop.
+
+Usage:
+    from indicators import to_panel, technical_summary, engine_inputs
+
+    panel = to_panel(pd.read_csv('../../../data/sample_stock_prices.csv'))
+    summary = technical_summary(panel)                   # one row per ticker
+    weekly = technical_summary(resample_panel(panel, 'W-FRI'))
+    inputs = engine_inputs(summary)                      # {ticker: EnhancedAIAnalyst dict}
+    features = feature_table(panel)                      # (date, ticker) rows, no look-ahead
+
+    python indicators.py --source ../../../data/sample_stock_prices.csv --timeframes 1D W-FRI
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Signal labels match the wording of technical_analysis; categorical columns
+# keep the table small and make filters like summary.trend == 'Strong Uptrend' cheap
+TREND = pd.CategoricalDtype(['Strong Uptrend', 'Strong Downtrend', 'Sideways/Mixed'])
+RSI_SIGNAL = pd.CategoricalDtype(['Overbought', 'Oversold', 'Neutral'])
+MACD_SIGNAL = pd.CategoricalDtype(['Bullish', 'Bearish'])
+BB_SIGNAL = pd.CategoricalDtype(['Above upper band', 'Below lower band', 'Within bands'])
+VOLUME_SIGNAL = pd.CategoricalDtype(['High', 'Low', 'Normal'])
+
+SUMMARY_COLUMNS = {
+    'date': 'datetime64[ns]',
+    'price': 'float64',
+    'sma_20': 'float64',
+    'sma_50': 'float64',
+    'sma_200': 'float64',
+    'rsi': 'float64',
+    'macd': 'float64',
+    'macd_signal_line': 'float64',
+    'macd_hist': 'float64',
+    'bb_upper': 'float64',
+    'bb_mid': 'float64',
+    'bb_lower': 'float64',
+    'bb_position': 'float64',
+    'support': 'float64',
+    'resistance': 'float64',
+    'atr': 'float64',
+    'volatility': 'float64',
+    'volume': 'float64',
+    'avg_volume_20': 'float64',
+    'volume_ratio': 'float64',
+    'trend': TREND,
+    'rsi_signal': RSI_SIGNAL,
+    'macd_signal': MACD_SIGNAL,
+    'bb_signal': BB_SIGNAL,
+    'volume_signal': VOLUME_SIGNAL,
+}
+
+# Technical fields read by EnhancedAIAnalyst (TechnicalModel, RiskModel and
+# the risk manager's volatility check)
+FEATURE_COLUMNS = ['price', 'sma_20', 'sma_50', 'rsi', 'macd', 'atr', 'volatility']
+
+
+# ============================================================
+# Panel Layout
+# ============================================================
+
+def _naive(dates):
+    """Timezone-aware dates as naive local (wall-clock) times, as chart_renderer plots them."""
+    if getattr(dates, 'tz', None) is not None:
+        return dates.tz_localize(None)
+    if getattr(getattr(dates, 'dt', None), 'tz', None) is not None:
+        return dates.dt.tz_localize(None)
+    return dates
+
+
+def to_panel(prices, fields=FIELDS):
+    """
+    Build a wide panel {field: dates × tickers DataFrame}.
+
+    `prices` is either a long-format frame (Date or Timestamp, Ticker and
+    OHLCV columns, as in data/sample_stock_prices.csv) or a
+    {ticker: OHLCV frame indexed by date} mapping (e.g. yfinance histories).
+    Timezone-aware dates (yfinance always returns them) become naive local
+    times.
+    """
+    if isinstance(prices, dict):
+        fields = [f for f in fields if all(f in df for df in prices.values())]
+        prices = {t: df.set_axis(_naive(df.index)) for t, df in prices.items()}
+        return {f: pd.DataFrame({t: df[f] for t, df in prices.items()}).sort_index() for f in fields}
+
+    date_col = 'Date' if 'Date' in prices else 'Timestamp'
+    dates = _naive(pd.to_datetime(prices[date_col]))
+    fields = [f for f in fields if f in prices]
+    wide = prices.assign(**{date_col: dates}).pivot(index=date_col, columns='Ticker', values=fields)
+    return {f: wide[f].rename_axis(columns=None) for f in fields}
+
+
+def resample_panel(panel, rule):
+    """Aggregate a panel to a coarser timeframe (e.g. 'W-FRI', 'ME', '1h')."""
+    how = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    out = {f: frame.resample(rule).agg(how[f]) for f, frame in panel.items()}
+    # Periods with no trades at all (weekends for intraday data, holidays) are dropped
+    traded = out['Close'].notna().any(axis=1)
+    return {f: frame[traded] for f, frame in out.items()}
+
+
+# ============================================================
+# Indicators
+# ============================================================
+
+def _compact(panel):
+    """
+    Move each ticker's priced rows to the top of its column (in date order).
+
+    Windows then count a ticker's own bars, not the union of all tickers'
+    dates. Returns the compacted panel and the source row of every cell,
+    or (panel, None) when every ticker has a close on every date.
+    """
+    valid = panel['Close'].notna().to_numpy()
+    if valid.all():
+        return panel, None
+    order = np.argsort(~valid, axis=0, kind='stable')
+    tail = np.arange(len(valid))[:, None] >= valid.sum(axis=0)
+    compacted = {}
+    for field, frame in panel.items():
+        values = np.take_along_axis(frame.to_numpy(dtype=float), order, axis=0)
+        values[tail] = np.nan
+        compacted[field] = pd.DataFrame(values, columns=frame.columns)
+    return compacted, order
+
+
+def _expand(frame, order, valid, index):
+    """Inverse of `_compact` for one indicator frame: back onto the panel dates."""
+    values = np.empty(frame.shape)
+    np.put_along_axis(values, order, frame.to_numpy(dtype=float), axis=0)
+    values[~valid] = np.nan
+    return pd.DataFrame(values, index=index, columns=frame.columns)
+
+
+def compute_panel_indicators(panel):
+    """
+    Indicator frames (dates × tickers) keyed like the columns added by
+    `ai_analyst.compute_technical_indicators`, plus ATR (14-bar mean true
+    range) and Volatility (20-bar std of daily returns), computed for all
+    tickers in one pass each.
+
+    Windows run over each ticker's own bars, so a ticker missing dates that
+    others trade on (another exchange's holidays, a gap in the data) gets
+    the same values as computing its history alone.
+    """
+    index, valid = panel['Close'].index, panel['Close'].notna().to_numpy()
+    panel, order = _compact(panel)
+    ind = _panel_indicators(panel)
+    if order is None:
+        return ind
+    return {name: _expand(frame, order, valid, index) for name, frame in ind.items()}
+
+
+def _panel_indicators(panel):
+    """Indicators of a panel whose rows are consecutive bars of every ticker."""
+    close = panel['Close']
+    ind = {}
+    ind['SMA_20'] = close.rolling(20).mean()
+    ind['SMA_50'] = close.rolling(50).mean()
+    ind['SMA_200'] = close.rolling(200).mean()
+    ind['EMA_12'] = close.ewm(span=12).mean()
+    ind['EMA_26'] = close.ewm(span=26).mean()
+
+    # RSI
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    ind['RSI'] = 100 - (100 / (1 + gain / loss))
+
+    # MACD
+    ind['MACD'] = ind['EMA_12'] - ind['EMA_26']
+    ind['Signal'] = ind['MACD'].ewm(span=9).mean()
+    ind['MACD_Hist'] = ind['MACD'] - ind['Signal']
+
+    # Bollinger Bands
+    ind['BB_Mid'] = ind['SMA_20']
+    ind['BB_Std'] = close.rolling(20).std()
+    ind['BB_Upper'] = ind['BB_Mid'] + 2 * ind['BB_Std']
+    ind['BB_Lower'] = ind['BB_Mid'] - 2 * ind['BB_Std']
+
+    # Support/resistance and volume baseline (technical_analysis uses the
+    # last 60 and 20 bars, so short histories use what they have)
+    if 'High' in panel and 'Low' in panel:
+        ind['Resistance'] = panel['High'].rolling(60, min_periods=1).max()
+        ind['Support'] = panel['Low'].rolling(60, min_periods=1).min()
+    if 'Volume' in panel:
+        ind['Avg_Volume_20'] = panel['Volume'].rolling(20, min_periods=1).mean()
+
+    # ATR (close-to-close range when there are no highs/lows) and realised volatility
+    prev_close = close.shift()
+    if 'High' in panel and 'Low' in panel:
+        high, low = panel['High'], panel['Low']
+        true_range = np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+    else:
+        true_range = (close - prev_close).abs()
+    ind['ATR'] = true_range.rolling(14).mean()
+    ind['Volatility'] = close.pct_change(fill_method=None).rolling(20).std()
+    return ind
+
+
+def _latest_rows(close, as_of):
+    """Per ticker, the row position of the last close at or before `as_of`."""
+    n_rows = len(close) if as_of is None else int(close.index.searchsorted(pd.Timestamp(as_of), 'right'))
+    valid = close.notna().to_numpy()[:n_rows]
+    if n_rows == 0:
+        return np.full(close.shape[1], -1)
+    last = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+    return np.where(valid.any(axis=0), last, -1)
+
+
+def technical_summary(panel, as_of=None, indicators=None):
+    """
+    Latest technical reading per ticker as a typed DataFrame.
+
+    One row per ticker (index), columns as in SUMMARY_COLUMNS: indicator
+    values plus the trend/RSI/MACD/Bollinger/volume conclusions that
+    `technical_analysis` prints. `as_of` evaluates the panel at an earlier
+    date; tickers with no price by then are left out. Pass `indicators`
+    (from compute_panel_indicators) to reuse them across several as_of dates.
+    """
+    close = panel['Close']
+    ind = indicators if indicators is not None else compute_panel_indicators(panel)
+    rows = _latest_rows(close, as_of)
+    keep = rows >= 0
+    rows, cols = rows[keep], np.flatnonzero(keep)
+
+    def pick(frame):
+        return frame.to_numpy(dtype=float)[rows, cols]
+
+    def pick_optional(name, source=ind):
+        return pick(source[name]) if name in source else np.full(len(rows), np.nan)
+
+    price = pick(close)
+    sma_20, sma_50 = pick(ind['SMA_20']), pick(ind['SMA_50'])
+    rsi, macd, signal = pick(ind['RSI']), pick(ind['MACD']), pick(ind['Signal'])
+    bb_upper, bb_lower = pick(ind['BB_Upper']), pick(ind['BB_Lower'])
+    volume, avg_volume = pick_optional('Volume', panel), pick_optional('Avg_Volume_20')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bb_position = (price - bb_lower) / (bb_upper - bb_lower) * 100
+        volume_ratio = volume / avg_volume
+
+    summary = pd.DataFrame({
+        'date': close.index.to_numpy()[rows],
+        'price': price,
+        'sma_20': sma_20,
+        'sma_50': sma_50,
+        'sma_200': pick(ind['SMA_200']),
+        'rsi': rsi,
+        'macd': macd,
+        'macd_signal_line': signal,
+        'macd_hist': pick(ind['MACD_Hist']),
+        'bb_upper': bb_upper,
+        'bb_mid': pick(ind['BB_Mid']),
+        'bb_lower': bb_lower,
+        'bb_position': bb_position,
+        'support': pick_optional('Support'),
+        'resistance': pick_optional('Resistance'),
+        'atr': pick(ind['ATR']),
+        'volatility': pick(ind['Volatility']),
+        'volume': volume,
+        'avg_volume_20': avg_volume,
+        'volume_ratio': volume_ratio,
+        'trend': np.select([(price > sma_20) & (sma_20 > sma_50), (price < sma_20) & (sma_20 < sma_50)],
+                           TREND.categories[:2], TREND.categories[2]),
+        'rsi_signal': np.select([rsi > 70, rsi < 30], RSI_SIGNAL.categories[:2], RSI_SIGNAL.categories[2]),
+        'macd_signal': np.where(macd > signal, *MACD_SIGNAL.categories),
+        'bb_signal': np.select([price > bb_upper, price < bb_lower],
+                               BB_SIGNAL.categories[:2], BB_SIGNAL.categories[2]),
+        'volume_signal': np.select([volume_ratio > 1.5, volume_ratio < 0.5],
+                                   VOLUME_SIGNAL.categories[:2], VOLUME_SIGNAL.categories[2]),
+    }, index=pd.Index(close.columns[cols], name='ticker'))
+    return summary.astype(SUMMARY_COLUMNS)
+
+
+def multi_timeframe_summary(panel, timeframes=('1D', 'W-FRI'), as_of=None):
+    """
+    `technical_summary` for several timeframes, indexed by (timeframe, ticker).
+
+    A timeframe equal to the panel's own frequency can be given as None.
+    """
+    frames = {}
+    for rule in timeframes:
+        source = panel if rule is None else resample_panel(panel, rule)
+        frames[rule or 'raw'] = technical_summary(source, as_of)
+    return pd.concat(frames, names=['timeframe', 'ticker'])
+
+
+def feature_table(panel, indicators=None):
+    """
+    Point-in-time engine features for every (date, ticker), as one frame.
+
+    Columns are FEATURE_COLUMNS. Every indicator is a trailing window or
+    ewm, so row (t, ticker) uses bars up to and including t only and a
+    backtest can read it at t without look-ahead. Windows count each
+    ticker's own bars, and dates on which a ticker has no close are left
+    out; warm-up values (e.g. SMA 50 in the first 49 bars) are NaN.
+    """
+    close = panel['Close']
+    ind = indicators if indicators is not None else compute_panel_indicators(panel)
+    frames = [close, ind['SMA_20'], ind['SMA_50'], ind['RSI'], ind['MACD'], ind['ATR'], ind['Volatility']]
+    values = np.stack([f.to_numpy(dtype=float) for f in frames], axis=-1)   # dates × tickers × features
+    priced = ~np.isnan(values[..., 0])
+    rows, cols = np.nonzero(priced)
+    index = pd.MultiIndex.from_arrays([close.index[rows], close.columns[cols]], names=['date', 'ticker'])
+    return pd.DataFrame(values[priced], index=index, columns=FEATURE_COLUMNS)
+
+
+def engine_inputs(summary):
+    """
+    {ticker: data dict} for `EnhancedAIAnalyst.analyze_stock` from a summary
+    (or one date of a feature table: `features.xs(date, level='date')`).
+
+    Only the technical fields are filled; merge fundamentals and sentiment
+    into each dict before analysing. Missing values (e.g. SMA 50 on a short
+    history) are left out so the models fall back to their defaults.
+    """
+    columns = FEATURE_COLUMNS
+    values = summary[columns].to_numpy()
+    return {
+        ticker: {k: float(v) for k, v in zip(columns, row) if not np.isnan(v)}
+        for ticker, row in zip(summary.index, values)
+    }
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    import time
+
+    parser = argparse.ArgumentParser(description='Technical summary for a universe of tickers')
+    parser.add_argument('--source', required=True, help='Long-format OHLCV CSV')
+    parser.add_argument('--timeframes', nargs='+', default=['1D', 'W-FRI'],
+                        help="Resampling rules, e.g. 1D W-FRI ME ('raw' keeps the data as is)")
+    parser.add_argument('--as-of', help='Evaluate at this date instead of the last bar')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    panel = to_panel(pd.read_csv(args.source))
+    timeframes = [None if t == 'raw' else t for t in args.timeframes]
+    summary = multi_timeframe_summary(panel, timeframes, args.as_of)
+    elapsed = time.perf_counter() - start
+
+    columns = ['date', 'price', 'rsi', 'macd', 'bb_position', 'trend', 'rsi_signal', 'macd_signal']
+    with pd.option_context('display.width', 200, 'display.max_columns', 20,
+                           'display.max_rows', 60, 'display.precision', 2):
+        print(summary[columns])
+    print(f"\n⏱️  {panel['Close'].shape[1]} tickers × {len(timeframes)} timeframes in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+"""
+Portfolio Optimizer
+===================
+Efficient frontier, maximum Sharpe, target volatility and risk parity for N
+assets, without one SciPy call per point.
+
+- The covariance (annualized, optionally shrunk towards its diagonal) and
+  its largest eigenvalue are computed once and cached; `update` folds new
+  return rows into running sums instead of recomputing from scratch.
+- Long-only mean-variance portfolios (optionally with a per-asset cap) are
+  solved with accelerated projected gradient steps, finished by an exact
+  KKT solve on the assets that end up held. Every solve starts from the
+  nearest portfolio already solved, so tracing the frontier or
+  re-optimizing after a covariance update takes few iterations.
+- Risk parity uses Newton steps on the convex Spinu formulation.
+- Random portfolios are scored in batched matrix form.
+
+Usage:
+    from portfolio_optimizer import PortfolioOptimizer
+
+    opt = PortfolioOptimizer(daily_returns)          # DataFrame, dates × assets
+    frontier = opt.efficient_frontier(points=50)
+    weights = opt.max_sharpe()
+    parity = opt.risk_parity()
+
+    python portfolio_optimizer.py --assets 1000      # timing on synthetic returns
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# Projection
+# ============================================================
+
+def project_capped_simplex(v, cap=None):
+    """
+    Euclidean projection of `v` onto {w : sum(w) = 1, 0 <= w <= cap}.
+
+    Without a cap this is the classic sort-based simplex projection; with a
+    cap the shift is found by bisection.
+    """
+    n = len(v)
+    if cap is None or cap * n <= 1 + 1e-12:
+        if cap is not None:
+            return np.full(n, 1 / n)
+        u = np.sort(v)[::-1]
+        css = np.cumsum(u) - 1
+        rho = np.nonzero(u - css / np.arange(1, n + 1) > 0)[0][-1]
+        return np.maximum(v - css[rho] / (rho + 1), 0)
+
+    lo, hi = v.min() - cap, v.max()
+    for _ in range(100):
+        tau = 0.5 * (lo + hi)
+        total = np.clip(v - tau, 0, cap).sum()
+        if abs(total - 1) < 1e-12:
+            break
+        if total > 1:
+            lo = tau
+        else:
+            hi = tau
+    return np.clip(v - tau, 0, cap)
+
+
+# ============================================================
+# Optimizer
+# ============================================================
+
+class PortfolioOptimizer:
+    """
+    Mean-variance and risk-parity optimizer over a cached covariance.
+
+    `returns` are periodic returns (rows = periods, columns = assets) and are
+    annualized with `periods_per_year`; alternatively build it from annual
+    assumptions with `from_assumptions`. `max_weight` caps every asset.
+    """
+
+    def __init__(self, returns=None, risk_free=0.02, periods_per_year=252,
+                 max_weight=None, shrinkage=0.0, names=None):
+        self.risk_free = risk_free
+        self.periods_per_year = periods_per_year
+        self.max_weight = max_weight
+        self.shrinkage = shrinkage
+        self._solutions = {}        # risk aversion -> weights, used as warm starts
+        self._mean = self._cov = self._eig_max = None
+
+        if returns is not None:
+            if names is None and hasattr(returns, 'columns'):
+                names = list(returns.columns)
+            values = np.asarray(returns, dtype=float)
+            self._count = 0
+            self._sum = np.zeros(values.shape[1])
+            self._cross = np.zeros((values.shape[1], values.shape[1]))
+            self.update(values)
+        self.names = names
+
+    @classmethod
+    def from_assumptions(cls, expected_returns, volatilities, correlation, names=None, **kwargs):
+        """Optimizer over annual capital-market assumptions instead of return history."""
+        opt = cls(names=names, periods_per_year=1, **kwargs)
+        vol = np.asarray(volatilities, dtype=float)
+        opt._set_moments(np.asarray(expected_returns, dtype=float),
+                         np.asarray(correlation, dtype=float) * np.outer(vol, vol))
+        return opt
+
+    # ------------------------------------------------------------
+    # Cached moments
+    # ------------------------------------------------------------
+
+    def update(self, new_returns):
+        """Add return rows (periods × assets) to the running sums and refresh the covariance."""
+        rows = np.asarray(new_returns, dtype=float)
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        self._count += len(rows)
+        self._sum += rows.sum(axis=0)
+        self._cross += rows.T @ rows
+        mean = self._sum / self._count
+        cov = (self._cross - self._count * np.outer(mean, mean)) / max(self._count - 1, 1)
+        self._set_moments(mean * self.periods_per_year, cov * self.periods_per_year)
+
+    def _set_moments(self, mean, cov):
+        if self.shrinkage:
+            cov = (1 - self.shrinkage) * cov + self.shrinkage * np.diag(np.diag(cov))
+        self._mean, self._cov = mean, cov
+        self._eig_max = None
+        # Previous solutions stay as warm starts: they are close to the new optimum
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def cov(self):
+        return self._cov
+
+    @property
+    def eig_max(self):
+        """Largest covariance eigenvalue (the gradient step size), computed once per covariance."""
+        if self._eig_max is None:
+            self._eig_max = float(np.linalg.eigvalsh(self._cov)[-1])
+        return self._eig_max
+
+    @property
+    def n_assets(self):
+        return len(self._mean)
+
+    # ------------------------------------------------------------
+    # Portfolio statistics
+    # ------------------------------------------------------------
+
+    def stats(self, weights):
+        """(annual return, volatility, Sharpe) of one portfolio."""
+        ret = float(weights @ self._mean)
+        vol = float(np.sqrt(weights @ self._cov @ weights))
+        return ret, vol, (ret - self.risk_free) / vol if vol > 0 else np.nan
+
+    def random_portfolios(self, n_portfolios=10_000, seed=42, chunk=10_000, return_weights=False):
+        """
+        Score Dirichlet-random long-only portfolios in batches.
+
+        Returns a DataFrame of return, volatility and Sharpe (and the weight
+        matrix when `return_weights`).
+        """
+        rng = np.random.default_rng(seed)
+        rets, vols, all_weights = [], [], []
+        for start in range(0, n_portfolios, chunk):
+            w = rng.dirichlet(np.ones(self.n_assets), min(chunk, n_portfolios - start))
+            rets.append(w @ self._mean)
+            vols.append(np.sqrt(np.einsum('ij,ij->i', w @ self._cov, w)))
+            if return_weights:
+                all_weights.append(w)
+        rets, vols = np.concatenate(rets), np.concatenate(vols)
+        table = pd.DataFrame({'return': rets, 'volatility': vols,
+                              'sharpe': (rets - self.risk_free) / vols})
+        return (table, np.vstack(all_weights)) if return_weights else table
+
+    # ------------------------------------------------------------
+    # Mean-variance
+    # ------------------------------------------------------------
+
+    def _warm_start(self, risk_aversion):
+        if not self._solutions:
+            return np.full(self.n_assets, 1 / self.n_assets)
+        keys = np.array(list(self._solutions))
+        nearest = keys[np.argmin(np.abs(np.log(keys) - np.log(risk_aversion)))]
+        return self._solutions[nearest]
+
+    def solve(self, risk_aversion, tol=1e-9, max_iter=20_000, polish_every=50):
+        """
+        Long-only portfolio maximizing  mean'w - risk_aversion/2 · w'Σw.
+
+        Accelerated projected gradient (FISTA with adaptive restart, step
+        1/(risk_aversion · largest eigenvalue)) warm-started from the nearest
+        solved portfolio. Every `polish_every` iterations the assets that are
+        neither at zero nor at the cap are taken as the free set and the KKT
+        system is solved on it directly; if the result satisfies the
+        optimality conditions it is the exact optimum and the loop stops.
+        """
+        if self.n_assets == 1:
+            return np.ones(1)
+        step = 1 / (risk_aversion * self.eig_max)
+        w = y = self._warm_start(risk_aversion)
+        t = 1.0
+        for i in range(1, max_iter + 1):
+            grad = risk_aversion * (self._cov @ y) - self._mean
+            w_next = project_capped_simplex(y - step * grad, self.max_weight)
+            if np.abs(w_next - w).max() < tol:
+                w = w_next
+                break
+            if grad @ (w_next - w) > 0:       # momentum is pointing uphill: restart
+                t = 1.0
+            t_next = 0.5 * (1 + np.sqrt(1 + 4 * t * t))
+            y = w_next + (t - 1) / t_next * (w_next - w)
+            w, t = w_next, t_next
+            if i % polish_every == 0:
+                exact = self._polish(w, risk_aversion, tol)
+                if exact is not None:
+                    w = exact
+                    break
+        self._solutions[risk_aversion] = w
+        return w
+
+    def _polish(self, w, risk_aversion, tol):
+        """Exact solution on the free set guessed from `w`, or None if it is not optimal."""
+        cap = self.max_weight if self.max_weight is not None else np.inf
+        eps = 1e-7
+        upper = w >= cap - eps
+        free = (w > eps) & ~upper
+        if not free.any():
+            return None
+        q = risk_aversion * self._cov
+        k = int(free.sum())
+        kkt = np.zeros((k + 1, k + 1))
+        kkt[:k, :k] = q[np.ix_(free, free)]
+        kkt[:k, k] = kkt[k, :k] = 1
+        rhs = np.empty(k + 1)
+        fixed = q[np.ix_(free, upper)].sum(axis=1) * cap if upper.any() else 0
+        rhs[:k] = self._mean[free] - fixed
+        rhs[k] = 1 - upper.sum() * (cap if upper.any() else 0)
+        try:
+            solution = np.linalg.solve(kkt, rhs)
+        except np.linalg.LinAlgError:
+            return None
+
+        exact = np.where(upper, cap, 0.0)
+        exact[free] = solution[:k]
+        if exact[free].min() < -tol or exact[free].max() > cap + tol:
+            return None
+        # Multiplier signs: assets at zero must not want to increase, capped ones not decrease
+        grad = q @ exact - self._mean + solution[k]
+        at_zero = ~free & ~upper
+        if (at_zero.any() and grad[at_zero].min() < -1e-9) or (upper.any() and grad[upper].max() > 1e-9):
+            return None
+        return np.clip(exact, 0, cap)
+
+    def _risk_aversion_range(self):
+        """Risk aversions spanning the frontier, from (near) minimum variance to maximum return."""
+        spread = max(np.ptp(self._mean), 1e-12)
+        min_var = float(np.diag(self._cov).min())
+        return spread / min_var * 1e3, spread / self.eig_max * 1e-1
+
+    def min_variance(self):
+        return self.solve(self._risk_aversion_range()[0])
+
+    def efficient_frontier(self, points=50, return_weights=False):
+        """
+        Frontier portfolios for `points` risk aversions (high to low), each
+        warm-started from the previous one. Returns a DataFrame of risk
+        aversion, return, volatility and Sharpe (and the weights when asked).
+        """
+        hi, lo = self._risk_aversion_range()
+        lambdas = np.geomspace(hi, lo, points)
+        weights = np.vstack([self.solve(lam) for lam in lambdas])
+        rets = weights @ self._mean
+        vols = np.sqrt(np.einsum('ij,ij->i', weights @ self._cov, weights))
+        table = pd.DataFrame({'risk_aversion': lambdas, 'return': rets, 'volatility': vols,
+                              'sharpe': (rets - self.risk_free) / vols})
+        return (table, weights) if return_weights else table
+
+    def _search(self, objective, lo, hi, iterations=40):
+        """Golden-section search over log risk aversion for the minimum of `objective(weights)`."""
+        a, b = np.log(lo), np.log(hi)
+        ratio = (np.sqrt(5) - 1) / 2
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        fc, fd = objective(self.solve(np.exp(c))), objective(self.solve(np.exp(d)))
+        for _ in range(iterations):
+            if fc < fd:
+                b, d, fd = d, c, fc
+                c = b - ratio * (b - a)
+                fc = objective(self.solve(np.exp(c)))
+            else:
+                a, c, fc = c, d, fd
+                d = a + ratio * (b - a)
+                fd = objective(self.solve(np.exp(d)))
+            if b - a < 1e-4:
+                break
+        return self.solve(np.exp(0.5 * (a + b)))
+
+    def max_sharpe(self, points=20):
+        """
+        Long-only maximum Sharpe portfolio (a point on the frontier): a coarse
+        frontier pass brackets it, golden-section search refines it.
+        """
+        def objective(w):
+            return -self.stats(w)[2]
+        frontier = self.efficient_frontier(points)
+        lambdas = frontier['risk_aversion'].to_numpy()
+        best = int(frontier['sharpe'].to_numpy().argmax())
+        lo, hi = sorted((lambdas[max(best - 1, 0)], lambdas[min(best + 1, len(lambdas) - 1)]))
+        return self._search(objective, lo, hi)
+
+    def target_volatility(self, volatility, points=20, iterations=40):
+        """
+        Highest-return frontier portfolio whose volatility does not exceed
+        `volatility` (the minimum-variance portfolio if none does).
+
+        Volatility falls as risk aversion rises, so the crossing is found by
+        bisection on log risk aversion between two coarse frontier points.
+        """
+        frontier = self.efficient_frontier(points)
+        lambdas = frontier['risk_aversion'].to_numpy()
+        feasible = np.flatnonzero(frontier['volatility'].to_numpy() <= volatility)
+        if feasible.size == 0:
+            return self._solutions[lambdas[0]]
+        if feasible[-1] == len(lambdas) - 1:
+            return self._solutions[lambdas[-1]]
+        hi, lo = np.log(lambdas[feasible[-1]]), np.log(lambdas[feasible[-1] + 1])
+        for _ in range(iterations):
+            mid = 0.5 * (hi + lo)
+            if self.stats(self.solve(np.exp(mid)))[1] <= volatility:
+                hi = mid
+            else:
+                lo = mid
+            if hi - lo < 1e-6:
+                break
+        return self.solve(np.exp(hi))
+
+    # ------------------------------------------------------------
+    # Risk parity
+    # ------------------------------------------------------------
+
+    def risk_parity(self, budget=None, tol=1e-10, max_iter=100):
+        """
+        Portfolio whose assets contribute `budget` shares of total risk
+        (equal by default).
+
+        Minimizes ½ y'Σy - budget'·log(y) by damped Newton steps; the
+        normalized minimizer y / sum(y) has the requested risk contributions.
+        """
+        n = self.n_assets
+        budget = np.full(n, 1 / n) if budget is None else np.asarray(budget, dtype=float) / np.sum(budget)
+        cov = self._cov
+        y = 1 / np.sqrt(np.diag(cov))
+        y *= np.sqrt(1 / (y @ cov @ y))
+
+        def f(x):
+            return 0.5 * x @ cov @ x - budget @ np.log(x)
+
+        for _ in range(max_iter):
+            grad = cov @ y - budget / y
+            hess = cov + np.diag(budget / y**2)
+            step = np.linalg.solve(hess, grad)
+            if grad @ step < tol:
+                break
+            # Backtrack to stay positive and decrease the objective
+            alpha, fy = 1.0, f(y)
+            while np.any(y - alpha * step <= 0) or f(y - alpha * step) > fy - 1e-4 * alpha * (grad @ step):
+                alpha *= 0.5
+                if alpha < 1e-12:
+                    break
+            y = y - alpha * step
+        return y / y.sum()
+
+    def risk_contributions(self, weights):
+        """Share of portfolio variance contributed by each asset."""
+        marginal = self._cov @ weights
+        return weights * marginal / (weights @ marginal)
+
+    def as_series(self, weights):
+        """Weights labelled with the asset names."""
+        return pd.Series(weights, index=self.names)
+
+
+def synthetic_returns(n_assets, n_periods=756, n_factors=5, seed=42):
+    """Factor-model daily returns for timing (dates × assets DataFrame, first factor = market)."""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.3, (n_assets, n_factors))
+    loadings[:, 0] = rng.uniform(0.5, 1.5, n_assets)
+    factors = rng.normal(0, 0.006, (n_periods, n_factors))
+    factors[:, 0] = rng.normal(0.0003, 0.01, n_periods)
+    specific = rng.normal(0, 1, (n_periods, n_assets)) * rng.uniform(0.008, 0.025, n_assets)
+    alpha = rng.normal(0, 0.0002, n_assets)
+    return pd.DataFrame(alpha + factors @ loadings.T + specific,
+                        columns=[f'A{i:04d}' for i in range(n_assets)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the portfolio optimizer on synthetic returns')
+    parser.add_argument('--assets', type=int, default=1000)
+    parser.add_argument('--max-weight', type=float, default=None)
+    parser.add_argument('--points', type=int, default=50, help='Frontier points')
+    args = parser.parse_args()
+
+    returns = synthetic_returns(args.assets)
+    timings = {}
+
+    start = time.perf_counter()
+    opt = PortfolioOptimizer(returns, max_weight=args.max_weight)
+    timings['covariance'] = time.perf_counter() - start
+
+    for name, run in [('frontier', lambda: opt.efficient_frontier(args.points)),
+                      ('max sharpe', opt.max_sharpe),
+                      ('risk parity', opt.risk_parity),
+                      ('update + max sharpe', lambda: (opt.update(returns.tail(5).to_numpy()), opt.max_sharpe())),
+                      ('10k random', lambda: opt.random_portfolios(10_000))]:
+        start = time.perf_counter()
+        result = run()
+        timings[name] = time.perf_counter() - start
+        if name == 'max sharpe':
+            ret, vol, sharpe = opt.stats(result)
+            summary = (f"Max Sharpe: return {ret:.1%}, volatility {vol:.1%}, Sharpe {sharpe:.2f}, "
+                       f"{(result > 1e-6).sum()} holdings")
+        elif name == 'risk parity':
+            rc = opt.risk_contributions(result)
+            parity = f"Risk parity: contributions {rc.min():.5f}..{rc.max():.5f}"
+
+    print(f"\n📊 {args.assets} assets\n")
+    print(summary)
+    print(parity)
+    print()
+    for name, seconds in timings.items():
+        print(f"  ⏱️  {name:<20} {seconds:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
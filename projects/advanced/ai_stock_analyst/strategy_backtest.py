@@ -0,0 +1,256 @@
+"""
+Bracket Strategy Backtest
+=========================
+Backtests the stop-loss / take-profit / position-size brackets of the
+strategy simulator (Feature 3) on real price history.
+
+- Every bar is a candidate long entry at its close; the exit is the first
+  later bar whose low touches the stop or whose high touches the target
+  (found with array operations over a sliding window, no per-bar loop).
+  Gaps through a level fill at the open; a bar touching both counts as a
+  stop. Trades still open after the strategy's holding limit exit at close;
+  intraday trades also exit at the close of their entry's session.
+- Each bar is labelled trend, range or high volatility, and the results are
+  split by the regime at entry.
+- All risk levels are evaluated in one broadcast pass.
+
+Usage:
+    from strategy_backtest import backtest_strategy
+    results = backtest_strategy(df, 'swing')        # df: OHLCV history
+
+    python strategy_backtest.py --source ../../../data/sample_stock_prices.csv --ticker AAPL
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+RISK_PARAMS = {
+    'conservative': {'stop_loss': 0.02, 'take_profit': 0.04, 'position_size': 0.25},
+    'moderate': {'stop_loss': 0.03, 'take_profit': 0.06, 'position_size': 0.50},
+    'aggressive': {'stop_loss': 0.05, 'take_profit': 0.10, 'position_size': 0.75}
+}
+
+# History downloaded by simulate_strategy, the longest a trade is held (bars)
+# and whether it must be flat by the end of the entry's session
+STRATEGY_DATA = {
+    'intraday': {'period': '5d', 'interval': '5m', 'max_hold': 78, 'session_exit': True},
+    'swing': {'period': '3mo', 'interval': '1d', 'max_hold': 10},
+    'position': {'period': '1y', 'interval': '1d', 'max_hold': 60},
+}
+
+REGIMES = ['trend', 'range', 'high_volatility']
+
+
+# ============================================================
+# Regime Detection
+# ============================================================
+
+def detect_regimes(close, window=20, vol_quantile=0.8, trend_efficiency=0.3):
+    """
+    Label every bar 'trend', 'range' or 'high_volatility'.
+
+    High volatility: rolling volatility of log returns above its
+    `vol_quantile` over the history. Otherwise trend when the efficiency
+    ratio (net move / path length over `window` bars) is at least
+    `trend_efficiency`, else range. Short histories use what they have.
+    """
+    close = pd.Series(np.asarray(close, dtype=float))
+    window = max(2, min(window, len(close) - 1))
+    returns = np.log(close).diff()
+    vol = returns.rolling(window, min_periods=2).std().to_numpy()
+    path = close.diff().abs().rolling(window, min_periods=1).sum().to_numpy()
+    net = (close - close.shift(window).fillna(close.iloc[0])).abs().to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efficiency = np.where(path > 0, net / path, 0.0)
+    high_vol = vol > np.nanquantile(vol, vol_quantile) if np.isfinite(vol).any() else np.zeros(len(close), bool)
+    labels = np.where(high_vol, 2, np.where(efficiency >= trend_efficiency, 0, 1))
+    return np.asarray(REGIMES)[labels]
+
+
+# ============================================================
+# Bracket Exits
+# ============================================================
+
+def bar_sessions(df):
+    """Calendar date (exchange local) of every bar, or None if `df` has no timestamps."""
+    if isinstance(df.index, pd.DatetimeIndex):
+        stamps = df.index
+    else:
+        column = next((c for c in ('Datetime', 'Date', 'Timestamp') if c in df), None)
+        if column is None:
+            return None
+        stamps = pd.DatetimeIndex(pd.to_datetime(df[column]))
+    return stamps.normalize().to_numpy()
+
+
+def bracket_exits(df, stop_loss, take_profit, max_hold, sessions=None):
+    """
+    First-touch exits for a long entry at every bar's close.
+
+    `stop_loss` / `take_profit` are arrays of k bracket levels (fractions).
+    With `sessions` (a session label per bar, see `bar_sessions`) a trade
+    never runs past the last bar of its entry's session.
+    Returns (k, n) arrays: exit bar offset (1..max_hold), exit price, and a
+    reason code (0 stop, 1 target, 2 time). Bars with no later bar to exit
+    on (the last bar, or a session's last bar) get offset 0 (no trade).
+    """
+    opens, high, low, close = (df[c].to_numpy(dtype=float) for c in ('Open', 'High', 'Low', 'Close'))
+    n = len(close)
+    hold = max(1, min(max_hold, n - 1))
+
+    # Bars available after each entry: up to the end of the history, or of its session
+    last_bar = np.full(n, n - 1)
+    if sessions is not None:
+        sessions = np.asarray(sessions)
+        ends = np.flatnonzero(np.append(sessions[1:] != sessions[:-1], True))
+        last_bar = ends[np.searchsorted(ends, np.arange(n))]
+    available = np.minimum(hold, last_bar - np.arange(n))
+    inside = np.arange(hold)[None, :] < available[:, None]
+
+    # Bars i+1 .. i+hold for every entry i; NaN past the end of the history
+    pad = np.full(hold, np.nan)
+    windows = [sliding_window_view(np.concatenate([x[1:], pad]), hold)[:n] for x in (opens, high, low, close)]
+    w_open, w_high, w_low, w_close = windows
+
+    sl = np.asarray(stop_loss, dtype=float)[:, None, None]
+    tp = np.asarray(take_profit, dtype=float)[:, None, None]
+    stop = close[None, :, None] * (1 - sl)
+    target = close[None, :, None] * (1 + tp)
+
+    hit_stop = (w_low[None] <= stop) & inside
+    hit_target = (w_high[None] >= target) & inside
+    first_stop = np.where(hit_stop.any(-1), hit_stop.argmax(-1), hold)
+    first_target = np.where(hit_target.any(-1), hit_target.argmax(-1), hold)
+
+    time_exit = np.maximum(available - 1, 0)
+
+    reason = np.where(first_stop <= first_target, 0, 1)
+    step = np.minimum(first_stop, first_target)
+    timed_out = step >= hold
+    reason = np.where(timed_out, 2, reason)
+    step = np.where(timed_out, time_exit[None, :], step)
+
+    rows = np.arange(n)[None, :]
+    bar_open = w_open[rows, step]
+    stop_fill = np.minimum(stop[..., 0], bar_open)          # gap down through the stop
+    target_fill = np.maximum(target[..., 0], bar_open)      # gap up through the target
+    price = np.select([reason == 0, reason == 1], [stop_fill, target_fill], w_close[rows, step])
+
+    offset = np.where(available[None, :] > 0, step + 1, 0)
+    return offset, price, reason
+
+
+# ============================================================
+# Backtest
+# ============================================================
+
+def _account(offset, returns, position_size):
+    """One position at a time: re-enter at the close of each exit bar (or the next bar that can trade)."""
+    equity, peak, max_dd, trades = 1.0, 1.0, 0.0, 0
+    i, n = 0, len(offset)
+    while i < n:
+        if offset[i] == 0:
+            i += 1
+            continue
+        equity *= 1 + returns[i] * position_size
+        peak = max(peak, equity)
+        max_dd = max(max_dd, 1 - equity / peak)
+        trades += 1
+        i += offset[i]
+    return {'trades': trades, 'total_return': equity - 1, 'max_drawdown': max_dd}
+
+
+def backtest_strategy(df, strategy_type='swing', risk_levels=None):
+    """
+    Backtest the risk brackets of `strategy_type` on an OHLCV history.
+
+    Returns {'regimes': DataFrame, 'account': DataFrame}:
+    - regimes: per (risk_level, regime) over all entries - trades, win rate,
+      average trade return, expectancy on capital (return × position size),
+      average bars held and the share of stop / target exits
+    - account: per risk level, trading one position at a time - number of
+      trades, total return and max drawdown
+    """
+    risk_levels = list(risk_levels or RISK_PARAMS)
+    params = [RISK_PARAMS[r] for r in risk_levels]
+    df = df.dropna(subset=['Open', 'High', 'Low', 'Close'])
+    max_hold = STRATEGY_DATA[strategy_type]['max_hold']
+    sessions = bar_sessions(df) if STRATEGY_DATA[strategy_type].get('session_exit') else None
+
+    offset, price, reason = bracket_exits(df, [p['stop_loss'] for p in params],
+                                          [p['take_profit'] for p in params], max_hold, sessions)
+    entry = df['Close'].to_numpy(dtype=float)
+    returns = price / entry - 1
+    regime = detect_regimes(entry)
+    traded = offset[0] > 0
+
+    sizes = np.array([p['position_size'] for p in params])[:, None]
+    frame = pd.DataFrame({
+        'risk_level': pd.Categorical(np.repeat(risk_levels, traded.sum()), categories=risk_levels),
+        'regime': pd.Categorical(np.tile(regime[traded], len(risk_levels)), categories=REGIMES),
+        'return': returns[:, traded].ravel(),
+        'pnl': (returns * sizes)[:, traded].ravel(),
+        'bars': offset[:, traded].ravel(),
+        'stop': (reason == 0)[:, traded].ravel(),
+        'target': (reason == 1)[:, traded].ravel(),
+    })
+    frame['win'] = frame['return'] > 0
+    grouped = frame.groupby(['risk_level', 'regime'], observed=True)
+    regimes = grouped.agg(trades=('return', 'size'), win_rate=('win', 'mean'),
+                          avg_return=('return', 'mean'), expectancy=('pnl', 'mean'),
+                          avg_bars=('bars', 'mean'), stop_rate=('stop', 'mean'),
+                          target_rate=('target', 'mean'))
+
+    account = pd.DataFrame([_account(offset[k], returns[k], params[k]['position_size'])
+                            for k in range(len(params))], index=pd.Index(risk_levels, name='risk_level'))
+    return {'regimes': regimes, 'account': account}
+
+
+def backtest_grid(histories, risk_levels=None):
+    """
+    Backtest every strategy type × risk level.
+
+    `histories` maps strategy type to its OHLCV history (one frame may be
+    reused for several types). Returns the account tables stacked by
+    strategy type.
+    """
+    tables = {s: backtest_strategy(df, s, risk_levels)['account'] for s, df in histories.items()}
+    return pd.concat(tables, names=['strategy'])
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    import time
+
+    parser = argparse.ArgumentParser(description='Backtest the strategy simulator brackets offline')
+    parser.add_argument('--source', required=True, help='Long-format OHLCV CSV')
+    parser.add_argument('--ticker', required=True)
+    parser.add_argument('--bars', type=int, default=252, help='Use the last N bars')
+    args = parser.parse_args()
+
+    prices = pd.read_csv(args.source)
+    df = prices[prices['Ticker'] == args.ticker].tail(args.bars)
+    if df.empty:
+        raise SystemExit(f"❌ {args.ticker} not found in {args.source}")
+
+    start = time.perf_counter()
+    grid = backtest_grid({s: df for s in STRATEGY_DATA})
+    regimes = backtest_strategy(df, 'swing')['regimes']
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.width', 160, 'display.max_columns', 10, 'display.precision', 3):
+        print(f"\n📊 {args.ticker}: last {len(df)} bars\n")
+        print(grid)
+        print(f"\nSwing trades by regime:\n{regimes}")
+    print(f"\n⏱️  3 strategies × {len(RISK_PARAMS)} risk levels in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
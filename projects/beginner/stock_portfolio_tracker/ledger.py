@@ -0,0 +1,352 @@
+"""
+📒 Transaction Ledger
+=====================
+Lot-level bookkeeping for the portfolio tracker.
+
+Buy and sell fills (such as data/transaction_history.csv) are matched into
+tax lots with FIFO, LIFO or average-cost accounting. The ledger reports
+realized P&L per sell, open lots and unrealized P&L at given prices.
+
+- ``Ledger.ingest``  - bulk replay of a transaction table
+- ``Ledger.apply``   - incremental update for a single new fill
+
+FIFO bulk replay is fully vectorized: the cost of shares removed by a sell
+depends only on how many shares have been sold before it, so all sells are
+priced at once by interpolating the cumulative-cost curve of the buys.
+LIFO and average cost depend on the order of fills, so they use one tight
+sequential pass over plain arrays instead.
+
+Sells larger than the open position are clipped (this ledger does not open
+short positions). The uncovered part is reported in the 'Unmatched' column.
+
+Usage:
+    ledger = Ledger('fifo').ingest(load_transactions('data/transaction_history.csv'))
+    ledger.realized()               # one row per sell
+    ledger.unrealized(current_prices)
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('fifo', 'lifo', 'average')
+
+TRANSACTION_COLUMNS = ['Date', 'Ticker', 'Type', 'Shares', 'Price', 'Commission']
+REALIZED_COLUMNS = ['Date', 'Ticker', 'Shares', 'Proceeds', 'Cost Basis', 'Realized P&L', 'Unmatched']
+LOT_COLUMNS = ['Ticker', 'Date', 'Shares', 'Unit Cost']
+
+
+def load_transactions(path):
+    """Load a Date/Ticker/Type/Shares/Price[/Commission] CSV of fills."""
+    df = pd.read_csv(path, parse_dates=['Date'])
+    if 'Commission' not in df.columns:
+        df['Commission'] = 0.0
+    return df[TRANSACTION_COLUMNS]
+
+
+# ============================================================
+# Matching kernels
+# ============================================================
+
+def _group_cumsum(values, first_row):
+    """Cumulative sum that restarts at every group start (`first_row` marks them)."""
+    total = np.cumsum(values)
+    starts = np.flatnonzero(first_row)
+    base = np.repeat(total[starts] - values[starts], np.diff(np.append(starts, len(values))))
+    return total - base
+
+
+def _match_fifo(codes, first_row, is_buy, shares, buy_cost):
+    """
+    Vectorized FIFO matching.
+
+    Returns (matched shares, matched cost, remaining shares per row). Rows are
+    grouped by ticker and time-ordered within each group.
+    """
+    buy_q = np.where(is_buy, shares, 0.0)
+    sell_q = np.where(is_buy, 0.0, shares)
+
+    bought = _group_cumsum(buy_q, first_row)        # shares bought so far
+    requested = _group_cumsum(sell_q, first_row)    # shares asked to sell so far
+
+    # Clipped cumulative sales follow sold_k = min(sold_{k-1} + q_k, bought_k),
+    # which unrolls to requested + min(0, running min of (bought - requested)).
+    shortfall = pd.Series(bought - requested).groupby(codes).cummin().to_numpy()
+    sold = requested + np.minimum(0.0, shortfall)
+    sold_before = np.where(first_row, 0.0, np.roll(sold, 1))
+    matched = sold - sold_before
+
+    # One cumulative-cost curve over all groups laid end to end
+    global_bought = np.cumsum(buy_q)
+    offset = global_bought - bought
+    knots_x = np.concatenate([[0.0], global_bought[is_buy]])
+    knots_y = np.concatenate([[0.0], np.cumsum(buy_cost)[is_buy]])
+    cost = (np.interp(offset + sold, knots_x, knots_y)
+            - np.interp(offset + sold_before, knots_x, knots_y))
+
+    # Remaining shares of each buy lot after all sales of its ticker
+    last_row = np.append(np.flatnonzero(first_row)[1:], len(codes)) - 1
+    sold_total = np.repeat(sold[last_row], np.diff(np.append(np.flatnonzero(first_row), len(codes))))
+    remaining = np.where(is_buy, np.clip(bought - sold_total, 0.0, buy_q), 0.0)
+
+    return matched, cost, remaining
+
+
+def _match_sequential(method, first_row, is_buy, shares, buy_cost):
+    """
+    LIFO / average-cost matching in a single pass over plain lists.
+
+    Same return layout as `_match_fifo`. For average cost, the open position
+    is reported as remaining shares on the ticker's latest buy row, and its
+    cost is the average cost.
+    """
+    n = len(shares)
+    matched = [0.0] * n
+    cost = [0.0] * n
+    remaining = [0.0] * n
+    unit = [0.0] * n
+
+    first_row = first_row.tolist()
+    is_buy = is_buy.tolist()
+    shares = shares.tolist()
+    buy_cost = buy_cost.tolist()
+
+    stack = []          # LIFO: [row, shares left, unit cost]
+    pos = basis = 0.0   # average cost
+    last_buy = -1
+
+    def flush():
+        if method == 'lifo':
+            for row, left, unit_cost in stack:
+                remaining[row] = left
+                unit[row] = unit_cost
+        elif last_buy >= 0 and pos > 0:
+            remaining[last_buy] = pos
+            unit[last_buy] = basis / pos
+
+    for k in range(n):
+        if first_row[k] and k:
+            flush()
+            stack, pos, basis, last_buy = [], 0.0, 0.0, -1
+
+        q = shares[k]
+        if is_buy[k]:
+            if method == 'lifo':
+                stack.append([k, q, buy_cost[k] / q])
+            else:
+                pos += q
+                basis += buy_cost[k]
+                last_buy = k
+            continue
+
+        if method == 'lifo':
+            need, spent = q, 0.0
+            while need > 0 and stack:
+                lot = stack[-1]
+                take = min(need, lot[1])
+                spent += take * lot[2]
+                lot[1] -= take
+                need -= take
+                if lot[1] <= 0:
+                    stack.pop()
+            matched[k] = q - need
+            cost[k] = spent
+        else:
+            take = min(q, pos)
+            if take > 0:
+                spent = basis * take / pos
+                pos -= take
+                basis -= spent
+                matched[k] = take
+                cost[k] = spent
+
+    flush()
+    return np.array(matched), np.array(cost), np.array(remaining), np.array(unit)
+
+
+# ============================================================
+# Ledger
+# ============================================================
+
+class Ledger:
+    """Tax-lot ledger with FIFO, LIFO or average-cost matching."""
+
+    def __init__(self, method='fifo'):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        self.method = method
+        self._pending = {}      # ticker -> open lots from the last bulk pass (frames)
+        self._lots = {}         # ticker -> deque of [date, shares, unit cost]
+        self._realized = []     # realized P&L frames and incremental records
+        self._bought = []       # Date/Ticker/Shares of every buy fill
+
+    # ----- bulk -------------------------------------------------
+
+    def ingest(self, transactions):
+        """
+        Replay a table of fills in one pass and return the ledger.
+
+        Existing open lots are carried in as the oldest buys, so several
+        ingests in a row behave like one long replay.
+        """
+        tx = transactions[TRANSACTION_COLUMNS[:5]].copy()
+        tx['Commission'] = transactions['Commission'] if 'Commission' in transactions else 0.0
+        tx['Date'] = pd.to_datetime(tx['Date'])
+
+        new_buys = tx[tx['Type'].str.lower().eq('buy') & (tx['Shares'] > 0)]
+        self._bought.append(new_buys[['Date', 'Ticker', 'Shares']].reset_index(drop=True))
+
+        carried = self.open_lots()
+        if len(carried):
+            carried = pd.DataFrame({
+                'Date': carried['Date'], 'Ticker': carried['Ticker'], 'Type': 'Buy',
+                'Shares': carried['Shares'], 'Price': carried['Unit Cost'], 'Commission': 0.0,
+            })
+            tx = pd.concat([carried, tx], ignore_index=True)
+        self._pending, self._lots = {}, {}
+
+        tx = tx[tx['Shares'] > 0]
+        tx = tx.sort_values(['Ticker', 'Date'], kind='stable', ignore_index=True)
+        if tx.empty:
+            return self
+
+        codes = pd.factorize(tx['Ticker'])[0]
+        first_row = np.r_[True, codes[1:] != codes[:-1]]
+        is_buy = tx['Type'].str.lower().eq('buy').to_numpy()
+        shares = tx['Shares'].to_numpy(dtype=float)
+        price = tx['Price'].to_numpy(dtype=float)
+        commission = tx['Commission'].to_numpy(dtype=float)
+        buy_cost = np.where(is_buy, shares * price + commission, 0.0)
+
+        if self.method == 'fifo':
+            matched, cost, remaining = _match_fifo(codes, first_row, is_buy, shares, buy_cost)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                unit = np.where(is_buy, buy_cost / shares, 0.0)
+        else:
+            matched, cost, remaining, unit = _match_sequential(self.method, first_row, is_buy, shares, buy_cost)
+
+        sells = ~is_buy
+        proceeds = matched * price - commission
+        self._realized.append(pd.DataFrame({
+            'Date': tx['Date'].to_numpy()[sells],
+            'Ticker': tx['Ticker'].to_numpy()[sells],
+            'Shares': matched[sells],
+            'Proceeds': proceeds[sells],
+            'Cost Basis': cost[sells],
+            'Realized P&L': proceeds[sells] - cost[sells],
+            'Unmatched': (shares - matched)[sells],
+        }))
+
+        open_rows = remaining > 0
+        lots = pd.DataFrame({
+            'Ticker': tx['Ticker'].to_numpy()[open_rows],
+            'Date': tx['Date'].to_numpy()[open_rows],
+            'Shares': remaining[open_rows],
+            'Unit Cost': unit[open_rows],
+        })
+        self._pending = {t: g for t, g in lots.groupby('Ticker', sort=False)}
+        return self
+
+    # ----- incremental ------------------------------------------
+
+    def _book(self, ticker):
+        """Open lots of one ticker as a deque, materialized on first touch."""
+        book = self._lots.get(ticker)
+        if book is None:
+            pending = self._pending.pop(ticker, None)
+            book = deque()
+            if pending is not None:
+                book.extend([d, s, u] for d, s, u in zip(pending['Date'], pending['Shares'], pending['Unit Cost']))
+            self._lots[ticker] = book
+        return book
+
+    def apply(self, date, ticker, side, shares, price, commission=0.0):
+        """
+        Apply one new fill and return its realized P&L (0 for buys).
+
+        Only the lots of `ticker` are touched.
+        """
+        book = self._book(ticker)
+        date = pd.Timestamp(date)
+
+        if side.lower() == 'buy':
+            self._bought.append(pd.DataFrame([{'Date': date, 'Ticker': ticker, 'Shares': shares}]))
+            unit_cost = (shares * price + commission) / shares
+            if self.method == 'average' and book:
+                _, held, avg = book[0]
+                total = held + shares
+                book[0] = [date, total, (held * avg + shares * unit_cost) / total]
+            else:
+                book.append([date, shares, unit_cost])
+            return 0.0
+
+        need, spent = float(shares), 0.0
+        while need > 0 and book:
+            lot = book[-1] if self.method == 'lifo' else book[0]
+            take = min(need, lot[1])
+            spent += take * lot[2]
+            lot[1] -= take
+            need -= take
+            if lot[1] <= 0:
+                if self.method == 'lifo':
+                    book.pop()
+                else:
+                    book.popleft()
+
+        matched = shares - need
+        proceeds = matched * price - commission
+        self._realized.append(pd.DataFrame([{
+            'Date': date, 'Ticker': ticker, 'Shares': matched, 'Proceeds': proceeds,
+            'Cost Basis': spent, 'Realized P&L': proceeds - spent, 'Unmatched': need,
+        }]))
+        return proceeds - spent
+
+    # ----- reports ----------------------------------------------
+
+    def open_lots(self):
+        """All open lots: Ticker, Date, Shares, Unit Cost."""
+        frames = list(self._pending.values())
+        rows = [(t, d, s, u) for t, book in self._lots.items() for d, s, u in book if s > 0]
+        if rows:
+            frames.append(pd.DataFrame(rows, columns=LOT_COLUMNS))
+        if not frames:
+            return pd.DataFrame(columns=LOT_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def realized(self):
+        """Realized P&L, one row per sell."""
+        if not self._realized:
+            return pd.DataFrame(columns=REALIZED_COLUMNS)
+        return pd.concat(self._realized, ignore_index=True)
+
+    def share_flows(self):
+        """Signed share changes per fill: buys positive, matched sells negative."""
+        sells = self.realized()
+        frames = self._bought + [pd.DataFrame({
+            'Date': sells['Date'], 'Ticker': sells['Ticker'], 'Shares': -sells['Shares'],
+        })]
+        return pd.concat(frames, ignore_index=True)
+
+    def positions(self):
+        """Per-ticker open shares, average cost and cost basis."""
+        lots = self.open_lots()
+        lots['Cost Basis'] = lots['Shares'] * lots['Unit Cost']
+        pos = lots.groupby('Ticker')[['Shares', 'Cost Basis']].sum()
+        pos['Avg Cost'] = pos['Cost Basis'] / pos['Shares']
+        return pos.reset_index()[['Ticker', 'Shares', 'Avg Cost', 'Cost Basis']]
+
+    def unrealized(self, prices):
+        """Unrealized P&L per open lot, valued at `prices` (ticker -> price)."""
+        lots = self.open_lots()
+        price = lots['Ticker'].map(prices).to_numpy(dtype=float)
+        lots['Price'] = price
+        lots['Market Value'] = lots['Shares'] * price
+        lots['Unrealized P&L'] = lots['Market Value'] - lots['Shares'] * lots['Unit Cost']
+        return lots
+
+    def to_portfolio(self):
+        """Open positions in the tracker's `portfolio` dict format."""
+        pos = self.positions()
+        return {t: {'shares': s, 'avg_cost': c}
+                for t, s, c in zip(pos['Ticker'], pos['Shares'], pos['Avg Cost'])}
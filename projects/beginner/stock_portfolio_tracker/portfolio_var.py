@@ -0,0 +1,297 @@
+"""
+📉 Portfolio Value at Risk
+==========================
+VaR and CVaR (expected shortfall) for a whole book of holdings, using the
+three methods of the risk-metrics notebook (historical, parametric and
+Monte Carlo), plus the per-holding numbers a risk check needs:
+
+- marginal VaR   - change in VaR per extra dollar held in a ticker
+- component VaR  - each ticker's share of VaR (the components sum to VaR)
+- incremental VaR - change in VaR from a set of trades, without a rebuild
+
+The simulation methods keep the portfolio P&L of every scenario as one
+vector. A trade only adds (trade size × that ticker's scenario returns)
+to it, and VaR is then a partial sort of the vector. Monte Carlo normal
+draws come from one seeded stream in chunks of at most `max_cells`
+numbers, so memory stays bounded and the chunk size does not change the
+results. Draws that fit in `max_cells` are kept in memory; larger sets are
+regenerated from the seed whenever ticker columns or scenario rows are
+needed.
+
+VaR and CVaR are positive dollar losses over `horizon` days. Parametric
+figures scale the mean return with the horizon and the volatility with its
+square root; the simulation methods scale 1-day figures by the square root
+of time.
+
+Usage:
+    from portfolio_var import PortfolioVaR, returns_from_closes
+
+    engine = PortfolioVaR(returns, exposures, method='historical')   # exposures: $ per ticker
+    engine.var, engine.cvar
+    engine.breakdown()                          # marginal / component VaR and CVaR per ticker
+    engine.incremental_var({'AAPL': -5_000})    # VaR change if $5k of AAPL is sold
+    engine.apply({'AAPL': -5_000})              # commit the trade
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('historical', 'parametric', 'monte_carlo')
+
+BREAKDOWN_COLUMNS = ['Exposure', 'Weight %', 'Marginal VaR', 'Component VaR',
+                     'Component VaR %', 'Marginal CVaR', 'Component CVaR']
+
+
+def returns_from_closes(closes):
+    """
+    Daily simple returns from a dates × tickers close matrix.
+
+    Zeros (no price yet, as filled by `stock_tracker.load_close_history`)
+    are treated as missing, and days with no return are 0.
+    """
+    returns = closes.replace(0.0, np.nan).pct_change(fill_method=None)
+    return returns.iloc[1:].fillna(0.0)
+
+
+class PortfolioVaR:
+    """
+    Value at Risk of a book of dollar exposures.
+
+    `returns` is a dates × tickers frame of daily returns and `exposures`
+    maps ticker to dollars held (a Series or dict; repeated lots should be
+    summed first). Tickers without return history are left out and listed
+    in `missing`.
+    """
+
+    def __init__(self, returns, exposures, method='historical', confidence=0.95, horizon=1,
+                 n_simulations=20_000, seed=42, max_cells=10_000_000):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        exposures = pd.Series(exposures, dtype=float).groupby(level=0).sum()
+        self.missing = [t for t in exposures.index if t not in returns.columns]
+        exposures = exposures.drop(self.missing)
+
+        self.tickers = list(exposures.index)
+        self.column = {t: j for j, t in enumerate(self.tickers)}
+        self.x = exposures.to_numpy(dtype=float)
+        self.method = method
+        self.confidence = confidence
+        self.horizon = horizon
+        self.seed = seed
+        self.max_cells = max_cells
+
+        history = returns[self.tickers].to_numpy(dtype=float)
+        self.mean = history.mean(axis=0)
+        self._history = history
+        self._cov = None
+        self._scale = np.sqrt(horizon)
+
+        self._scenarios = self._draws = None
+        if method == 'historical':
+            self._scenarios = history
+            self.n_scenarios = len(history)
+        elif method == 'monte_carlo':
+            self.n_scenarios = n_simulations
+            self._loading = self._mc_loading()
+            if n_simulations * self._loading.shape[1] <= max_cells:
+                self._draws = np.vstack(list(self._normal_chunks()))
+        self._refresh()
+
+    @property
+    def cov(self):
+        """Covariance of daily returns (computed on first use)."""
+        if self._cov is None:
+            self._cov = np.atleast_2d(np.cov(self._history, rowvar=False))
+        return self._cov
+
+    # ------------------------------------------------------------
+    # Scenarios
+    # ------------------------------------------------------------
+
+    def _mc_loading(self):
+        """
+        Matrix L with L @ L.T = covariance; scenarios are mean + L @ z.
+
+        Books with more tickers than days of history use the centred returns
+        themselves (rank = number of days), so the draws per scenario scale
+        with the history length instead of the number of tickers.
+        """
+        n_days, n = self._history.shape
+        if n > n_days:
+            return (self._history - self.mean).T / np.sqrt(max(n_days - 1, 1))
+        # Small jitter keeps the factorization valid for collinear tickers
+        jitter = 1e-12 * max(np.trace(self.cov) / n, 1e-12)
+        return np.linalg.cholesky(self.cov + jitter * np.eye(n))
+
+    def _normal_chunks(self):
+        """Standard normal draws (scenarios × factors) from one seeded stream, in row chunks."""
+        if self._draws is not None:
+            yield self._draws
+            return
+        factors = self._loading.shape[1]
+        rows = max(1, self.max_cells // factors)
+        rng = np.random.default_rng(self.seed)
+        for start in range(0, self.n_scenarios, rows):
+            yield rng.standard_normal((min(rows, self.n_scenarios - start), factors))
+
+    def _columns(self, columns):
+        """Scenario returns of some tickers (scenarios × len(columns))."""
+        if self._scenarios is not None:
+            return self._scenarios[:, columns]
+        loading = self._loading[columns]
+        return np.vstack([z @ loading.T for z in self._normal_chunks()]) + self.mean[columns]
+
+    def _rows(self, scenarios):
+        """Return vectors of the given (sorted) scenario rows."""
+        if self._scenarios is not None:
+            return self._scenarios[scenarios]
+        picked, start = [], 0
+        for z in self._normal_chunks():
+            stop = start + len(z)
+            lo, hi = np.searchsorted(scenarios, [start, stop])
+            picked.append(z[scenarios[lo:hi] - start])
+            start = stop
+        return np.vstack(picked) @ self._loading.T + self.mean
+
+    def _portfolio_pnl(self):
+        if self._scenarios is not None:
+            return self._scenarios @ self.x
+        exposure = self._loading.T @ self.x
+        return np.concatenate([z @ exposure for z in self._normal_chunks()]) + self.mean @ self.x
+
+    # ------------------------------------------------------------
+    # Risk Measures
+    # ------------------------------------------------------------
+
+    def _parametric(self, x, sigma_x):
+        """(VaR, CVaR) from exposures and the matching covariance product Σx."""
+        sigma_p = np.sqrt(max(x @ sigma_x, 0.0))
+        z = NormalDist().inv_cdf(self.confidence)
+        tail = NormalDist().pdf(z) / (1 - self.confidence)
+        drift = self.mean @ x * self.horizon
+        sigma_p *= self._scale
+        return -drift + z * sigma_p, -drift + tail * sigma_p
+
+    def _simulated(self, pnl):
+        """(VaR, CVaR) from scenario P&L, as historical_var / conditional_var in the notebook."""
+        cutoff = np.quantile(pnl, 1 - self.confidence)
+        return -cutoff * self._scale, -pnl[pnl <= cutoff].mean() * self._scale
+
+    def _refresh(self):
+        if self.method == 'parametric':
+            self._sigma_x = self.cov @ self.x
+            self.var, self.cvar = self._parametric(self.x, self._sigma_x)
+        else:
+            self._pnl = self._portfolio_pnl()
+            self.var, self.cvar = self._simulated(self._pnl)
+
+    @property
+    def value(self):
+        return self.x.sum()
+
+    def _trade_vector(self, trades):
+        columns = []
+        for ticker in trades:
+            if ticker not in self.column:
+                raise KeyError(f"No return history for {ticker}; it cannot be added to the book")
+            columns.append(self.column[ticker])
+        return np.array(columns, dtype=int), np.array(list(trades.values()), dtype=float)
+
+    def _after(self, trades):
+        """Exposures and the P&L vector (or Σx) after `trades` ({ticker: $ change})."""
+        columns, change = self._trade_vector(trades)
+        x = self.x.copy()
+        np.add.at(x, columns, change)
+        if self.method == 'parametric':
+            return x, self._sigma_x + self.cov[:, columns] @ change
+        return x, self._pnl + self._columns(columns) @ change
+
+    def incremental_var(self, trades):
+        """
+        VaR change from `trades` ({ticker: dollar change in exposure}).
+
+        Only the traded tickers are touched, so the cost does not depend on
+        the size of the book. Returns (ΔVaR, ΔCVaR); the book is unchanged.
+        """
+        x, state = self._after(trades)
+        var, cvar = self._parametric(x, state) if self.method == 'parametric' else self._simulated(state)
+        return var - self.var, cvar - self.cvar
+
+    def apply(self, trades):
+        """Commit `trades` to the book and update VaR/CVaR incrementally."""
+        self.x, state = self._after(trades)
+        if self.method == 'parametric':
+            self._sigma_x = state
+            self.var, self.cvar = self._parametric(self.x, state)
+        else:
+            self._pnl = state
+            self.var, self.cvar = self._simulated(state)
+        return self
+
+    def breakdown(self, window=0.1):
+        """
+        Per-ticker marginal and component VaR/CVaR as a DataFrame.
+
+        Parametric figures are the analytic gradients. For the simulation
+        methods, marginal CVaR is the average loss of each ticker over the
+        tail scenarios. Marginal VaR averages the scenarios ranked around
+        the VaR scenario: ± `window` × the tail size, and at least one on
+        each side. The components are rescaled to sum to VaR exactly.
+        Component CVaR always sums to CVaR.
+        """
+        if self.method == 'parametric':
+            sigma_p = np.sqrt(max(self.x @ self._sigma_x, 0.0))
+            z = NormalDist().inv_cdf(self.confidence)
+            tail = NormalDist().pdf(z) / (1 - self.confidence)
+            unit = self._sigma_x / sigma_p if sigma_p > 0 else np.zeros_like(self.x)
+            marginal_var = -self.mean * self.horizon + z * unit * self._scale
+            marginal_cvar = -self.mean * self.horizon + tail * unit * self._scale
+        else:
+            n = len(self._pnl)
+            order = np.argsort(self._pnl, kind='stable')
+            tail_count = max(1, int(np.ceil((1 - self.confidence) * n)))
+            half = max(1, int(window * tail_count))
+            rank = min(tail_count - 1, n - 1)
+            near = order[max(0, rank - half):min(n, rank + half + 1)]
+            in_tail = np.flatnonzero(self._pnl <= np.quantile(self._pnl, 1 - self.confidence))
+
+            scenarios = np.union1d(near, in_tail)
+            rows = self._rows(scenarios)
+            position = {s: i for i, s in enumerate(scenarios)}
+            near_returns = rows[[position[s] for s in near]]
+            tail_returns = rows[[position[s] for s in in_tail]]
+
+            marginal_var = -near_returns.mean(axis=0) * self._scale
+            near_loss = marginal_var @ self.x
+            if near_loss != 0:
+                marginal_var *= self.var / near_loss
+            marginal_cvar = -tail_returns.mean(axis=0) * self._scale
+
+        component_var = marginal_var * self.x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = component_var / self.var * 100
+            weight = self.x / self.value * 100
+        return pd.DataFrame({
+            'Exposure': self.x,
+            'Weight %': weight,
+            'Marginal VaR': marginal_var,
+            'Component VaR': component_var,
+            'Component VaR %': share,
+            'Marginal CVaR': marginal_cvar,
+            'Component CVaR': marginal_cvar * self.x,
+        }, index=pd.Index(self.tickers, name='Ticker'))[BREAKDOWN_COLUMNS]
+
+    def summary(self):
+        """Headline numbers as a dict."""
+        return {
+            'method': self.method,
+            'confidence': self.confidence,
+            'horizon': self.horizon,
+            'scenarios': getattr(self, 'n_scenarios', None),
+            'value': self.value,
+            'var': self.var,
+            'cvar': self.cvar,
+            'var_pct': self.var / self.value * 100 if self.value else 0.0,
+        }
@@ -13,10 +13,16 @@ This project helps you:
 Run: python stock_tracker.py
 """
 
+import argparse
+import importlib.util
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+
+from ledger import Ledger, load_transactions, METHODS
+from portfolio_var import METHODS as VAR_METHODS, PortfolioVaR, returns_from_closes
 
 # ============================================================
 # SECTION 1: Portfolio Definition
@@ -30,6 +36,12 @@ portfolio = {
     'AMZN': {'shares': 25, 'avg_cost': 165.00},
 }
 
+# Daily closes used to rebuild value history, read from the binary price
+# store (scripts/price_store.py) when it has been built from this CSV
+REPO_ROOT = Path(__file__).resolve().parents[3]
+PRICE_HISTORY_PATH = REPO_ROOT / 'data' / 'sample_stock_prices.csv'
+PRICE_STORE_DIR = REPO_ROOT / 'data' / 'store'
+
 # Current prices (in real app, fetch from API)
 current_prices = {
     'AAPL': 185.50,
@@ -42,32 +54,75 @@ current_prices = {
 # SECTION 2: Portfolio Calculations
 # ============================================================
 
-def calculate_portfolio_value():
+def holdings_frame(holdings=None):
+    """
+    Convert holdings to a DataFrame with one row per position or lot.
+    
+    Accepts the `portfolio` dict format or a DataFrame that already has
+    'Ticker', 'Shares' and 'Avg Cost' columns (tickers may repeat, one row per lot).
+    """
+    if holdings is None:
+        holdings = portfolio
+    if isinstance(holdings, pd.DataFrame):
+        return holdings[['Ticker', 'Shares', 'Avg Cost']].reset_index(drop=True)
+    
+    return pd.DataFrame({
+        'Ticker': list(holdings.keys()),
+        'Shares': [h['shares'] for h in holdings.values()],
+        'Avg Cost': [h['avg_cost'] for h in holdings.values()],
+    })
+
+
+def load_holdings(path):
+    """Load a Ticker/Shares/AvgCost CSV (such as data/sample_portfolio.csv) as holdings rows."""
+    df = pd.read_csv(path).rename(columns={'AvgCost': 'Avg Cost'})
+    return holdings_frame(df)
+
+
+def revalue(shares, avg_cost, prices):
+    """
+    Vectorized valuation of aligned arrays.
+    
+    Returns (cost_basis, current_value, gain_loss, return_pct) as NumPy arrays.
+    """
+    cost_basis = shares * avg_cost
+    current_value = shares * prices
+    gain_loss = current_value - cost_basis
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return_pct = gain_loss / cost_basis * 100
+    return cost_basis, current_value, gain_loss, return_pct
+
+
+def calculate_portfolio_value(holdings=None, prices=None):
     """Calculate current portfolio value and returns."""
-    data = []
+    df = holdings_frame(holdings)
+    prices = current_prices if prices is None else prices
     
-    for ticker, holdings in portfolio.items():
-        shares = holdings['shares']
-        avg_cost = holdings['avg_cost']
-        current_price = current_prices.get(ticker, avg_cost)
-        
-        cost_basis = shares * avg_cost
-        current_value = shares * current_price
-        gain_loss = current_value - cost_basis
-        return_pct = (gain_loss / cost_basis) * 100
-        
-        data.append({
-            'Ticker': ticker,
-            'Shares': shares,
-            'Avg Cost': avg_cost,
-            'Current Price': current_price,
-            'Cost Basis': cost_basis,
-            'Current Value': current_value,
-            'Gain/Loss': gain_loss,
-            'Return %': return_pct
-        })
+    # Align prices to rows once; unknown tickers are valued at cost
+    avg_cost = df['Avg Cost'].to_numpy(dtype=float)
+    price = df['Ticker'].map(prices).to_numpy(dtype=float)
+    price = np.where(np.isnan(price), avg_cost, price)
+    
+    cost_basis, current_value, gain_loss, return_pct = revalue(
+        df['Shares'].to_numpy(dtype=float), avg_cost, price
+    )
     
-    return pd.DataFrame(data)
+    df['Current Price'] = price
+    df['Cost Basis'] = cost_basis
+    df['Current Value'] = current_value
+    df['Gain/Loss'] = gain_loss
+    df['Return %'] = return_pct
+    return df
+
+
+DISPLAY_FORMATTERS = {
+    'Avg Cost': '${:.2f}'.format,
+    'Current Price': '${:.2f}'.format,
+    'Cost Basis': '${:,.2f}'.format,
+    'Current Value': '${:,.2f}'.format,
+    'Gain/Loss': '${:+,.2f}'.format,
+    'Return %': '{:+.1f}%'.format,
+}
 
 
 def portfolio_summary(df):
@@ -87,20 +142,193 @@ def portfolio_summary(df):
     print("\n" + "-" * 60)
     print("\n📋 HOLDINGS BREAKDOWN:\n")
     
-    # Format for display
-    display_df = df.copy()
-    display_df['Avg Cost'] = display_df['Avg Cost'].apply(lambda x: f"${x:.2f}")
-    display_df['Current Price'] = display_df['Current Price'].apply(lambda x: f"${x:.2f}")
-    display_df['Cost Basis'] = display_df['Cost Basis'].apply(lambda x: f"${x:,.2f}")
-    display_df['Current Value'] = display_df['Current Value'].apply(lambda x: f"${x:,.2f}")
-    display_df['Gain/Loss'] = display_df['Gain/Loss'].apply(lambda x: f"${x:+,.2f}")
-    display_df['Return %'] = display_df['Return %'].apply(lambda x: f"{x:+.1f}%")
+    # Format only at the print boundary; the numbers stay numeric
+    print(df.to_string(index=False, formatters=DISPLAY_FORMATTERS))
+
+
+def _open_price_store(root, csv_path):
+    """`PriceStore` at `root`, or None if it is missing or older than `csv_path`."""
+    manifest = Path(root) / 'manifest.json'
+    if not manifest.exists() or manifest.stat().st_mtime < Path(csv_path).stat().st_mtime:
+        return None
+    spec = importlib.util.spec_from_file_location('price_store', REPO_ROOT / 'scripts' / 'price_store.py')
+    price_store = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(price_store)
+    return price_store.PriceStore(root)
+
+
+def load_close_history(path=PRICE_HISTORY_PATH, store=PRICE_STORE_DIR):
+    """
+    Daily closes as a dates × tickers matrix.
+    
+    Read from the price store at `store` when it is at least as new as the
+    CSV at `path` (only the Close column is loaded), otherwise from the CSV.
+    Gaps are forward-filled; dates before a ticker's first close are 0 so the
+    matrix is NaN-free and can go straight into `value_history`.
+    """
+    price_store = _open_price_store(store, path) if store else None
+    if price_store is not None:
+        closes = price_store.closes().sort_index(axis=1).rename_axis(columns='Ticker')
+    else:
+        prices = pd.read_csv(path, usecols=['Date', 'Ticker', 'Close'], parse_dates=['Date'])
+        closes = prices.pivot_table(index='Date', columns='Ticker', values='Close', aggfunc='last')
+    return closes.ffill().fillna(0.0)
+
+
+def holdings_history(closes, holdings=None, ledger=None):
+    """
+    Shares held per ticker, aligned with the columns of `closes`.
+    
+    With a `Ledger`, positions follow its buys and matched sells over time
+    and a dates × tickers frame is returned. Otherwise the current holdings
+    are assumed to have been held throughout and a per-ticker Series is
+    returned.
+    """
+    if ledger is None:
+        df = holdings_frame(holdings)
+        return df.groupby('Ticker')['Shares'].sum().reindex(closes.columns, fill_value=0).astype(float)
+    
+    # Trades after the last close count from that close, so the last row
+    # holds the ledger's open positions
+    flows = ledger.share_flows()
+    flows['Date'] = flows['Date'].clip(upper=closes.index[-1])
+    flows = flows.pivot_table(index='Date', columns='Ticker', values='Shares', aggfunc='sum')
+    flows = flows.reindex(columns=closes.columns).fillna(0.0)
+    
+    # Positions as of each trading day = cumulative flows up to that day
+    positions = flows.cumsum().reindex(flows.index.union(closes.index)).ffill()
+    return positions.reindex(closes.index).fillna(0.0)
+
+
+def value_history(positions, closes):
+    """
+    Daily portfolio value from positions and a NaN-free close matrix.
+    
+    Constant holdings (a Series) take one matrix-vector product; time-varying
+    positions (a DataFrame) take a row-wise dot product.
+    """
+    prices = closes.to_numpy(dtype=float)
+    if isinstance(positions, pd.Series):
+        values = prices @ positions.to_numpy(dtype=float)
+    else:
+        values = np.einsum('ij,ij->i', positions.to_numpy(dtype=float), prices)
+    return pd.Series(values, index=closes.index, name='Value')
+
+
+# ============================================================
+# SECTION 3: Live Revaluation
+# ============================================================
+
+class LivePortfolio:
+    """
+    Portfolio that stays revalued as price ticks arrive.
+    
+    Holdings are laid out once as aligned arrays. A tick for one ticker only
+    rewrites that ticker's rows and adjusts the running totals by the change
+    in its value, so the cost of a tick does not depend on portfolio size.
+    """
+    
+    RESYNC_EVERY = 100_000  # ticks between exact re-sums of the running total
     
-    print(display_df.to_string(index=False))
+    def __init__(self, holdings=None, prices=None):
+        df = calculate_portfolio_value(holdings, prices)
+        
+        self.tickers = df['Ticker'].to_numpy(copy=True)
+        self.shares = df['Shares'].to_numpy(copy=True)
+        self.avg_cost = df['Avg Cost'].to_numpy(dtype=float, copy=True)
+        self.price = df['Current Price'].to_numpy(dtype=float, copy=True)
+        self.value = df['Current Value'].to_numpy(dtype=float, copy=True)
+        
+        # Row lookup and per-ticker share totals, built once
+        self.rows = {t: idx for t, idx in df.groupby('Ticker', sort=False).indices.items()}
+        self.ticker_shares = {t: self.shares[idx].sum() for t, idx in self.rows.items()}
+        self.ticker_price = {t: self.price[idx[0]] for t, idx in self.rows.items()}
+        
+        self.total_cost = df['Cost Basis'].sum()
+        self.total_value = self.value.sum()
+        self.tick_count = 0
+    
+    def on_tick(self, ticker, price):
+        """Apply one price update. Returns False for tickers not held."""
+        rows = self.rows.get(ticker)
+        if rows is None:
+            return False
+        
+        self.total_value += self.ticker_shares[ticker] * (price - self.ticker_price[ticker])
+        self.ticker_price[ticker] = price
+        self.price[rows] = price
+        self.value[rows] = self.shares[rows] * price
+        
+        self.tick_count += 1
+        if self.tick_count % self.RESYNC_EVERY == 0:
+            self.total_value = self.value.sum()  # bound floating-point drift
+        return True
+    
+    @property
+    def total_gain(self):
+        return self.total_value - self.total_cost
+    
+    @property
+    def total_return(self):
+        return self.total_gain / self.total_cost * 100 if self.total_cost else 0.0
+    
+    def weight(self, ticker):
+        """Current weight of one ticker in the portfolio."""
+        return self.ticker_shares[ticker] * self.ticker_price[ticker] / self.total_value
+    
+    def weights(self):
+        """Current per-row weights (aligned with the holdings rows)."""
+        return self.value / self.total_value
+    
+    def snapshot(self):
+        """Holdings table in the `calculate_portfolio_value` layout."""
+        cost_basis, current_value, gain_loss, return_pct = revalue(self.shares, self.avg_cost, self.price)
+        return pd.DataFrame({
+            'Ticker': self.tickers,
+            'Shares': self.shares,
+            'Avg Cost': self.avg_cost,
+            'Current Price': self.price,
+            'Cost Basis': cost_basis,
+            'Current Value': current_value,
+            'Gain/Loss': gain_loss,
+            'Return %': return_pct,
+            'Weight %': self.weights() * 100,
+        })
+
+
+def replay_ticks(path, price_column='Close'):
+    """
+    Yield (ticker, price) updates from a CSV of prices, in time order.
+    
+    Works with data/sample_stock_prices.csv or any file with 'Date', 'Ticker'
+    and a price column.
+    """
+    prices = pd.read_csv(path, usecols=['Date', 'Ticker', price_column])
+    prices = prices.sort_values('Date', kind='stable')
+    yield from zip(prices['Ticker'].to_numpy(), prices[price_column].to_numpy(dtype=float))
+
+
+def queue_ticks(tick_queue, sentinel=None):
+    """Yield (ticker, price) updates from an in-process queue until `sentinel` arrives."""
+    while True:
+        item = tick_queue.get()
+        if item is sentinel:
+            return
+        yield item
+
+
+def run_stream(live, ticks, report_every=0):
+    """Feed ticks into a LivePortfolio, optionally printing a status line every N ticks."""
+    for n, (ticker, price) in enumerate(ticks, 1):
+        live.on_tick(ticker, price)
+        if report_every and n % report_every == 0:
+            print(f"  tick {n:>9,}  value ${live.total_value:,.2f}  "
+                  f"P&L ${live.total_gain:+,.2f} ({live.total_return:+.2f}%)")
+    return live
 
 
 # ============================================================
-# SECTION 3: Visualization
+# SECTION 4: Visualization
 # ============================================================
 
 def plot_allocation(df):
@@ -130,34 +358,24 @@ def plot_allocation(df):
     plt.show()
 
 
-def plot_value_history():
-    """Simulate and plot portfolio value history."""
-    # Generate simulated historical data
-    np.random.seed(42)
-    days = 90
-    dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-    
-    # Calculate initial portfolio value
-    df = calculate_portfolio_value()
-    current_value = df['Current Value'].sum()
+def plot_value_history(days=90, ledger=None, holdings=None):
+    """Rebuild and plot portfolio value history from daily closes."""
+    closes = load_close_history()
     
-    # Simulate historical values (random walk backward)
-    returns = np.random.normal(0.0008, 0.012, days)[::-1]
-    values = [current_value]
-    for r in returns[:-1]:
-        values.append(values[-1] / (1 + r))
-    values = values[::-1]
+    missing = sorted(set(holdings_frame(holdings)['Ticker']) - set(closes.columns)) if ledger is None else []
+    if missing:
+        print(f"⚠️  No price history for {', '.join(missing)}; excluded from history chart")
     
-    # Create DataFrame
-    history = pd.DataFrame({'Date': dates, 'Value': values})
-    history.set_index('Date', inplace=True)
+    positions = holdings_history(closes, holdings, ledger)
+    history = value_history(positions, closes).tail(days).to_frame()
+    current_value = history['Value'].iloc[-1]
     
     # Plot
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(history.index, history['Value'], 'b-', linewidth=2)
     ax.fill_between(history.index, history['Value'], alpha=0.3)
     
-    ax.set_title('Portfolio Value (Last 90 Days)', fontsize=14, fontweight='bold')
+    ax.set_title(f'Portfolio Value (Last {len(history)} Trading Days)', fontsize=14, fontweight='bold')
     ax.set_ylabel('Portfolio Value ($)')
     ax.set_xlabel('Date')
     ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
@@ -177,11 +395,105 @@ def plot_value_history():
 
 
 # ============================================================
-# SECTION 4: Main Execution
+# SECTION 5: Main Execution
 # ============================================================
 
+def stream_main(path, report_every):
+    """Replay a price file through a LivePortfolio and print the final state."""
+    print(f"\n📡 Streaming prices from {path}...")
+    live = run_stream(LivePortfolio(), replay_ticks(path), report_every)
+    
+    print(f"\n✅ Applied {live.tick_count:,} ticks")
+    portfolio_summary(live.snapshot().drop(columns='Weight %'))
+
+
+def ledger_main(path, method):
+    """Build holdings from a transaction history and show realized + unrealized P&L."""
+    print(f"\n📒 Replaying transactions from {path} ({method.upper()})...")
+    ledger = Ledger(method).ingest(load_transactions(path))
+    realized = ledger.realized()
+    
+    print(f"\n💵 Realized P&L:        ${realized['Realized P&L'].sum():+,.2f} "
+          f"over {len(realized)} sells")
+    unmatched = realized['Unmatched'].sum()
+    if unmatched:
+        print(f"⚠️  {unmatched:,.0f} shares sold beyond the open position were ignored")
+    
+    # Lots become the holdings rows, valued at the last daily close like the
+    # value history chart (tickers without a close stay at cost)
+    lots = ledger.open_lots().rename(columns={'Unit Cost': 'Avg Cost'})
+    last_close = load_close_history().iloc[-1]
+    missing = sorted(set(lots['Ticker']) - set(last_close.index))
+    if missing:
+        print(f"⚠️  No price history for {', '.join(missing)}; valued at cost")
+    portfolio_summary(calculate_portfolio_value(lots, last_close.to_dict()))
+    plot_value_history(days=365, ledger=ledger)
+
+
+RISK_FORMATTERS = {
+    'Exposure': '${:,.2f}'.format,
+    'Weight %': '{:.1f}%'.format,
+    'Marginal VaR': '{:.4f}'.format,
+    'Component VaR': '${:,.2f}'.format,
+    'Component VaR %': '{:.1f}%'.format,
+    'Marginal CVaR': '{:.4f}'.format,
+    'Component CVaR': '${:,.2f}'.format,
+}
+
+
+def risk_main(path, method, confidence):
+    """Value at Risk of a holdings file, valued and simulated from the daily closes."""
+    closes = load_close_history()
+    df = calculate_portfolio_value(load_holdings(path), closes.iloc[-1].to_dict())
+    exposures = df.groupby('Ticker')['Current Value'].sum()
+    
+    print(f"\n📉 Value at Risk for {path} ({confidence:.0%}, 1 day)")
+    methods = VAR_METHODS if method == 'all' else [method]
+    for name in methods:
+        engine = PortfolioVaR(returns_from_closes(closes), exposures, name, confidence)
+        print(f"  {name:<12} VaR ${engine.var:>10,.2f}   CVaR ${engine.cvar:>10,.2f}   "
+              f"({engine.var / engine.value:.2%} of ${engine.value:,.0f})")
+    if engine.missing:
+        print(f"⚠️  No price history for {', '.join(engine.missing)}; left out of VaR")
+    
+    print(f"\n📋 RISK BREAKDOWN ({methods[-1]}):\n")
+    print(engine.breakdown().to_string(formatters=RISK_FORMATTERS))
+
+
 def main():
     """Main function to run portfolio tracker."""
+    parser = argparse.ArgumentParser(description='Stock Portfolio Tracker')
+    parser.add_argument('--stream', metavar='CSV',
+                        help='Replay Date/Ticker/Close price updates from a CSV, '
+                             'e.g. ../../../data/sample_stock_prices.csv')
+    parser.add_argument('--report-every', type=int, default=1000,
+                        help='Print a status line every N ticks in stream mode')
+    parser.add_argument('--transactions', metavar='CSV',
+                        help='Build holdings from a transaction history, '
+                             'e.g. ../../../data/transaction_history.csv')
+    parser.add_argument('--method', choices=METHODS, default='fifo',
+                        help='Lot matching method for --transactions')
+    parser.add_argument('--risk', metavar='CSV',
+                        help='Value at Risk of a holdings file, '
+                             'e.g. ../../../data/sample_portfolio.csv')
+    parser.add_argument('--var-method', choices=('all',) + VAR_METHODS, default='all',
+                        help='VaR method for --risk')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='VaR confidence level for --risk')
+    args = parser.parse_args()
+    
+    if args.risk:
+        risk_main(args.risk, args.var_method, args.confidence)
+        return
+    
+    if args.transactions:
+        ledger_main(args.transactions, args.method)
+        return
+    
+    if args.stream:
+        stream_main(args.stream, args.report_every)
+        return
+    
     print("\n🚀 Starting Stock Portfolio Tracker...")
     
     # Calculate portfolio
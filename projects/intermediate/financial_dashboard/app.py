@@ -11,7 +11,9 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime, timedelta
+
+from downsampling import points_for_width, lttb_indices, downsample_ohlc
+from market_data import MINUTES_PER_SESSION, generate_stock_data, calculate_metrics
 
 # Page config
 st.set_page_config(
@@ -50,53 +52,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# ============================================================
-# Data Generation Functions
-# ============================================================
-
-@st.cache_data
-def generate_stock_data(ticker: str, days: int = 252) -> pd.DataFrame:
-    """Generate synthetic stock data."""
-    np.random.seed(hash(ticker) % 2**32)
-    
-    dates = pd.date_range(end=datetime.now(), periods=days, freq='B')
-    
-    # Random walk with drift
-    returns = np.random.normal(0.0005, 0.02, days)
-    prices = 100 * np.exp(np.cumsum(returns))
-    
-    # Generate OHLCV
-    df = pd.DataFrame({
-        'Date': dates,
-        'Open': prices * (1 + np.random.normal(0, 0.005, days)),
-        'High': prices * (1 + np.abs(np.random.normal(0, 0.01, days))),
-        'Low': prices * (1 - np.abs(np.random.normal(0, 0.01, days))),
-        'Close': prices,
-        'Volume': np.random.randint(1000000, 10000000, days)
-    })
-    
-    df.set_index('Date', inplace=True)
-    return df
-
-
-def calculate_metrics(df: pd.DataFrame) -> dict:
-    """Calculate key financial metrics."""
-    returns = df['Close'].pct_change().dropna()
-    
-    return {
-        'current_price': df['Close'].iloc[-1],
-        'prev_close': df['Close'].iloc[-2],
-        'change': df['Close'].iloc[-1] - df['Close'].iloc[-2],
-        'change_pct': ((df['Close'].iloc[-1] / df['Close'].iloc[-2]) - 1) * 100,
-        'annual_return': returns.mean() * 252,
-        'volatility': returns.std() * np.sqrt(252),
-        'sharpe': (returns.mean() * 252) / (returns.std() * np.sqrt(252)),
-        'max_drawdown': ((df['Close'] / df['Close'].cummax()) - 1).min(),
-        'high_52w': df['Close'].max(),
-        'low_52w': df['Close'].min(),
-    }
-
-
 # ============================================================
 # Sidebar
 # ============================================================
@@ -111,19 +66,29 @@ selected_ticker = st.sidebar.selectbox("Select Stock", tickers)
 st.sidebar.markdown("### 📅 Date Range")
 period = st.sidebar.radio(
     "Period",
-    ["1M", "3M", "6M", "1Y"],
+    ["1M", "3M", "6M", "1Y", "5Y"],
     horizontal=True
 )
 
-period_map = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252}
+period_map = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252, "5Y": 1260}
 days = period_map[period]
 
+bar_size = st.sidebar.radio("Bar Size", ["Daily", "1 Minute"], horizontal=True)
+interval = '1d' if bar_size == "Daily" else '1m'
+periods_per_year = 252 if interval == '1d' else 252 * MINUTES_PER_SESSION
+
 # Technical indicators
 st.sidebar.markdown("### 📈 Technical Indicators")
 show_sma = st.sidebar.checkbox("SMA (20, 50)", value=True)
 show_bb = st.sidebar.checkbox("Bollinger Bands", value=False)
 show_volume = st.sidebar.checkbox("Volume", value=True)
 
+# Rendering: long histories are downsampled to roughly one point per pixel
+st.sidebar.markdown("### 🖥️ Rendering")
+chart_width = st.sidebar.slider("Chart Width (px)", 400, 3000, 1200, step=100)
+max_line_points = points_for_width(chart_width, points_per_pixel=2)
+max_candles = points_for_width(chart_width, points_per_pixel=1 / 3)
+
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 💼 Portfolio Settings")
 portfolio_value = st.sidebar.number_input(
@@ -143,8 +108,8 @@ st.markdown(f'<h1 class="main-header">📊 {selected_ticker} Dashboard</h1>', un
 st.markdown('<p class="sub-header">Real-time stock analysis and portfolio insights</p>', unsafe_allow_html=True)
 
 # Load data
-df = generate_stock_data(selected_ticker, days)
-metrics = calculate_metrics(df)
+df = generate_stock_data(selected_ticker, days, interval)
+metrics = calculate_metrics(df, periods_per_year)
 
 # ============================================================
 # Key Metrics Row
@@ -196,46 +161,55 @@ col_chart, col_stats = st.columns([2, 1])
 with col_chart:
     st.markdown("### 📈 Price Chart")
     
+    # Indicators are computed on full-resolution data, then only the points
+    # that can actually be drawn are sent to the browser.
+    candles = downsample_ohlc(df, max_candles)
+    line_idx = lttb_indices(df.index, df['Close'], max_line_points)
+    line_x = df.index[line_idx]
+    
+    if len(candles) < len(df):
+        st.caption(f"Showing {len(candles):,} aggregated candles for {len(df):,} bars")
+    
     # Create candlestick chart
     fig = go.Figure()
     
     # Candlestick
     fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
+        x=candles.index,
+        open=candles['Open'],
+        high=candles['High'],
+        low=candles['Low'],
+        close=candles['Close'],
         name='OHLC'
     ))
     
-    # Technical indicators
+    # Technical indicators (WebGL lines)
     if show_sma:
-        sma_20 = df['Close'].rolling(20).mean()
-        sma_50 = df['Close'].rolling(50).mean()
+        sma_20 = df['Close'].rolling(20).mean().to_numpy()
+        sma_50 = df['Close'].rolling(50).mean().to_numpy()
         
-        fig.add_trace(go.Scatter(
-            x=df.index, y=sma_20,
+        fig.add_trace(go.Scattergl(
+            x=line_x, y=sma_20[line_idx],
             mode='lines', name='SMA 20',
             line=dict(color='orange', width=1)
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, y=sma_50,
+        fig.add_trace(go.Scattergl(
+            x=line_x, y=sma_50[line_idx],
             mode='lines', name='SMA 50',
             line=dict(color='purple', width=1)
         ))
     
     if show_bb:
-        bb_mid = df['Close'].rolling(20).mean()
-        bb_std = df['Close'].rolling(20).std()
+        bb_mid = df['Close'].rolling(20).mean().to_numpy()
+        bb_std = df['Close'].rolling(20).std().to_numpy()
         
-        fig.add_trace(go.Scatter(
-            x=df.index, y=bb_mid + 2*bb_std,
+        fig.add_trace(go.Scattergl(
+            x=line_x, y=(bb_mid + 2*bb_std)[line_idx],
             mode='lines', name='Upper BB',
             line=dict(color='gray', width=1, dash='dash')
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, y=bb_mid - 2*bb_std,
+        fig.add_trace(go.Scattergl(
+            x=line_x, y=(bb_mid - 2*bb_std)[line_idx],
             mode='lines', name='Lower BB',
             line=dict(color='gray', width=1, dash='dash'),
             fill='tonexty', fillcolor='rgba(128,128,128,0.1)'
@@ -253,11 +227,10 @@ with col_chart:
     
     if show_volume:
         # Volume chart
-        colors = ['#26a69a' if df['Close'].iloc[i] >= df['Open'].iloc[i] 
-                  else '#ef5350' for i in range(len(df))]
+        colors = np.where(candles['Close'] >= candles['Open'], '#26a69a', '#ef5350')
         
         fig_vol = go.Figure(go.Bar(
-            x=df.index, y=df['Volume'],
+            x=candles.index, y=candles['Volume'],
             marker_color=colors,
             name='Volume'
         ))
@@ -293,13 +266,16 @@ with col_stats:
     
     st.markdown("### 📊 Return Distribution")
     
+    # Bin locally so only 30 bars are sent, however long the history is
     returns = df['Close'].pct_change().dropna() * 100
-    fig_hist = px.histogram(
-        returns, nbins=30,
-        template='plotly_white',
-        labels={'value': 'Daily Return (%)'}
-    )
+    counts, edges = np.histogram(returns, bins=30)
+    fig_hist = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts,
+        width=np.diff(edges), marker_color='#636efa'
+    ))
     fig_hist.update_layout(
+        template='plotly_white',
+        xaxis_title='Return per Bar (%)',
         height=200,
         showlegend=False,
         margin=dict(l=0, r=0, t=10, b=0)
@@ -336,14 +312,18 @@ with col_port2:
     st.markdown("#### Performance Comparison")
     
     # Generate comparison data
-    benchmark = generate_stock_data('SPY', days)
+    benchmark = generate_stock_data('SPY', days, interval)
     
     stock_norm = df['Close'] / df['Close'].iloc[0] * 100
     bench_norm = benchmark['Close'] / benchmark['Close'].iloc[0] * 100
+    stock_idx = lttb_indices(stock_norm.index, stock_norm, max_line_points)
+    bench_idx = lttb_indices(bench_norm.index, bench_norm, max_line_points)
     
     fig_comp = go.Figure()
-    fig_comp.add_trace(go.Scatter(x=df.index, y=stock_norm, name=selected_ticker, line=dict(color='#1f77b4')))
-    fig_comp.add_trace(go.Scatter(x=benchmark.index, y=bench_norm, name='S&P 500', line=dict(color='#ff7f0e')))
+    fig_comp.add_trace(go.Scattergl(x=stock_norm.index[stock_idx], y=stock_norm.iloc[stock_idx],
+                                    name=selected_ticker, line=dict(color='#1f77b4')))
+    fig_comp.add_trace(go.Scattergl(x=bench_norm.index[bench_idx], y=bench_norm.iloc[bench_idx],
+                                    name='S&P 500', line=dict(color='#ff7f0e')))
     
     fig_comp.update_layout(
         height=300,
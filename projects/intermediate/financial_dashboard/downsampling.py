@@ -0,0 +1,99 @@
+"""
+📉 Chart Downsampling
+=====================
+Helpers that shrink long price series to roughly one point per screen pixel
+before they are handed to Plotly.
+
+A browser cannot draw more points than the chart has pixels, so sending every
+minute bar of a multi-year history only costs serialisation and render time.
+These helpers keep the visual shape of the series while bounding the payload:
+
+- ``lttb_indices``      - Largest-Triangle-Three-Buckets selection for lines
+- ``downsample_ohlc``   - aggregates bars into wider candles
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def points_for_width(width_px: int, points_per_pixel: float = 1.0) -> int:
+    """Number of points worth sending for a chart `width_px` pixels wide."""
+    return max(3, int(width_px * points_per_pixel))
+
+
+def _as_float(x) -> np.ndarray:
+    """Convert numbers or datetimes to a float array usable for geometry."""
+    arr = np.asarray(x)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return arr.astype(float)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Select `n_out` indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Every bucket in between
+    contributes the point that forms the largest triangle with the previously
+    selected point and the average of the next bucket. NaNs (e.g. the warm-up
+    of a rolling indicator) are never selected unless a bucket is all-NaN.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        avg_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end]
+        avg_y = np.nanmean(next_y) if not np.isnan(next_y).all() else y[a]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        if np.isnan(area).all():
+            a = start
+        else:
+            a = start + int(np.nanargmax(area))
+        idx[i + 1] = a
+
+    return idx
+
+
+def downsample_ohlc(df: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into at most `n_out` wider bars.
+
+    Each output bar takes the first Open, highest High, lowest Low, last Close
+    and summed Volume of its bucket, indexed by the bucket's first timestamp.
+    """
+    n = len(df)
+    if n <= n_out:
+        return df
+
+    starts = np.linspace(0, n, n_out, endpoint=False).astype(np.int64)
+    starts = np.unique(starts)
+    ends = np.append(starts[1:], n) - 1
+
+    out = {
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[ends],
+    }
+    if 'Volume' in df.columns:
+        out['Volume'] = np.add.reduceat(df['Volume'].to_numpy(), starts)
+
+    return pd.DataFrame(out, index=df.index[starts])
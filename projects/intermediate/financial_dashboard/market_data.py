@@ -0,0 +1,159 @@
+"""
+📦 Dashboard Market Data
+========================
+Synthetic data generation and metric calculations shared by the dashboard
+pages (``app.py`` and everything under ``pages/``).
+
+Single-ticker views use ``generate_stock_data``; watchlist views build one
+aligned close matrix and one returns matrix (``load_close_matrix`` and
+``load_returns_matrix``, both cached) and score every column at once with
+``calculate_metrics_table``.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from datetime import datetime
+
+MINUTES_PER_SESSION = 390  # 09:30 - 16:00
+
+METRIC_COLUMNS = [
+    'current_price', 'prev_close', 'change', 'change_pct',
+    'annual_return', 'volatility', 'sharpe', 'max_drawdown',
+    'high_52w', 'low_52w',
+]
+
+
+# ============================================================
+# Data Generation Functions
+# ============================================================
+
+def _bar_timestamps(days: int, interval: str) -> pd.DatetimeIndex:
+    """Business-day timestamps, optionally expanded to regular-session minutes."""
+    sessions = pd.date_range(end=datetime.now().date(), periods=days, freq='B')
+    if interval == '1d':
+        return sessions
+
+    minutes = pd.to_timedelta(np.arange(MINUTES_PER_SESSION), unit='min') + pd.Timedelta(hours=9, minutes=30)
+    stamps = sessions.values[:, None] + minutes.values[None, :]
+    return pd.DatetimeIndex(stamps.ravel())
+
+
+def _return_params(interval: str) -> tuple:
+    """Per-bar drift and volatility of the synthetic random walk."""
+    scale = 1.0 if interval == '1d' else 1 / np.sqrt(MINUTES_PER_SESSION)
+    return 0.0005 * scale**2, 0.02 * scale, scale
+
+
+def _ticker_seed(ticker: str) -> int:
+    return hash(ticker) % 2**32
+
+
+@st.cache_data
+def generate_stock_data(ticker: str, days: int = 252, interval: str = '1d') -> pd.DataFrame:
+    """Generate synthetic stock data ('1d' daily bars or '1m' minute bars)."""
+    np.random.seed(_ticker_seed(ticker))
+
+    dates = _bar_timestamps(days, interval)
+    n = len(dates)
+    mu, sigma, scale = _return_params(interval)
+
+    # Random walk with drift
+    returns = np.random.normal(mu, sigma, n)
+    prices = 100 * np.exp(np.cumsum(returns))
+
+    # Generate OHLCV
+    df = pd.DataFrame({
+        'Date': dates,
+        'Open': prices * (1 + np.random.normal(0, 0.005 * scale, n)),
+        'High': prices * (1 + np.abs(np.random.normal(0, 0.01 * scale, n))),
+        'Low': prices * (1 - np.abs(np.random.normal(0, 0.01 * scale, n))),
+        'Close': prices,
+        'Volume': np.random.randint(1000000, 10000000, n) // (1 if interval == '1d' else MINUTES_PER_SESSION)
+    })
+
+    df.set_index('Date', inplace=True)
+    return df
+
+
+@st.cache_data
+def load_close_matrix(tickers: tuple, days: int = 252, interval: str = '1d') -> pd.DataFrame:
+    """
+    Build one aligned close-price matrix (dates × tickers) for a watchlist.
+
+    Each column matches ``generate_stock_data(ticker, ...)['Close']`` exactly,
+    but only the return draws are made, so a 500-name watchlist costs one
+    cumulative sum instead of 500 OHLCV frames. Pass a tuple so the result
+    can be cached.
+    """
+    dates = _bar_timestamps(days, interval)
+    mu, sigma, _ = _return_params(interval)
+
+    returns = np.empty((len(dates), len(tickers)))
+    for j, ticker in enumerate(tickers):
+        returns[:, j] = np.random.RandomState(_ticker_seed(ticker)).normal(mu, sigma, len(dates))
+
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    return pd.DataFrame(prices, index=pd.Index(dates, name='Date'), columns=list(tickers))
+
+
+def to_returns(closes: pd.DataFrame) -> pd.DataFrame:
+    """Simple per-bar returns of a close matrix (first row dropped)."""
+    values = closes.to_numpy(dtype=float)
+    return pd.DataFrame(values[1:] / values[:-1] - 1, index=closes.index[1:], columns=closes.columns)
+
+
+@st.cache_data
+def load_returns_matrix(tickers: tuple, days: int = 252, interval: str = '1d') -> pd.DataFrame:
+    """``to_returns`` of ``load_close_matrix``, cached under the same arguments."""
+    return to_returns(load_close_matrix(tickers, days, interval))
+
+
+# ============================================================
+# Metrics
+# ============================================================
+
+def calculate_metrics_table(closes: pd.DataFrame, periods_per_year: int = 252,
+                            returns: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Calculate key financial metrics for every column of a close matrix.
+
+    Returns a DataFrame indexed by ticker with the same fields as
+    ``calculate_metrics``. Everything is computed with column-wise NumPy
+    reductions, so cost grows with the matrix size, not the ticker count.
+    Pass ``returns`` (e.g. from ``load_returns_matrix``) to reuse them
+    instead of recomputing them from the closes.
+    """
+    c = closes.to_numpy(dtype=float)
+    returns = c[1:] / c[:-1] - 1 if returns is None else returns.to_numpy(dtype=float)
+
+    mean = np.nanmean(returns, axis=0)
+    std = np.nanstd(returns, axis=0, ddof=1)
+    annual_return = mean * periods_per_year
+    volatility = std * np.sqrt(periods_per_year)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = annual_return / volatility
+
+    running_max = np.fmax.accumulate(c, axis=0)
+
+    table = pd.DataFrame({
+        'current_price': c[-1],
+        'prev_close': c[-2],
+        'change': c[-1] - c[-2],
+        'change_pct': (c[-1] / c[-2] - 1) * 100,
+        'annual_return': annual_return,
+        'volatility': volatility,
+        'sharpe': sharpe,
+        'max_drawdown': np.nanmin(c / running_max - 1, axis=0),
+        'high_52w': np.nanmax(c, axis=0),
+        'low_52w': np.nanmin(c, axis=0),
+    }, index=closes.columns)
+    table.index.name = 'Ticker'
+    return table
+
+
+def calculate_metrics(df: pd.DataFrame, periods_per_year: int = 252) -> dict:
+    """Calculate key financial metrics."""
+    table = calculate_metrics_table(df[['Close']], periods_per_year)
+    return {k: float(v) for k, v in table.iloc[0].items()}
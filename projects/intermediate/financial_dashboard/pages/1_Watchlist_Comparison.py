@@ -0,0 +1,172 @@
+"""
+📊 Watchlist Comparison
+=======================
+Compare a whole watchlist at once: correlation heatmap, relative performance
+and ranked metrics, all computed from one cached, aligned returns matrix.
+
+Opened from the sidebar page menu of `streamlit run app.py`.
+"""
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+import plotly.express as px
+
+from downsampling import points_for_width, lttb_indices
+from market_data import MINUTES_PER_SESSION, load_close_matrix, load_returns_matrix, calculate_metrics_table
+
+st.set_page_config(
+    page_title="Watchlist Comparison",
+    page_icon="📊",
+    layout="wide",
+)
+
+DEFAULT_WATCHLIST = "AAPL, GOOGL, MSFT, AMZN, META, TSLA, NVDA, SPY"
+
+METRIC_LABELS = {
+    'annual_return': 'Annual Return',
+    'volatility': 'Volatility',
+    'sharpe': 'Sharpe Ratio',
+    'max_drawdown': 'Max Drawdown',
+    'change_pct': 'Last Change %',
+}
+
+# Largest close matrix (bars × tickers) built at once: 20M float64 cells is
+# ~160 MB, so 1-minute bars on big watchlists get a shorter period
+MAX_MATRIX_CELLS = 20_000_000
+
+
+# ============================================================
+# Sidebar
+# ============================================================
+
+st.sidebar.markdown("## 🎛️ Watchlist")
+
+watchlist_text = st.sidebar.text_area("Tickers (comma separated)", DEFAULT_WATCHLIST)
+n_synthetic = st.sidebar.number_input(
+    "Add synthetic tickers",
+    min_value=0,
+    max_value=500,
+    value=0,
+    step=50,
+    help="Pad the watchlist with generated names to try large universes"
+)
+
+period = st.sidebar.radio("Period", ["3M", "6M", "1Y", "5Y"], index=2, horizontal=True)
+days = {"3M": 63, "6M": 126, "1Y": 252, "5Y": 1260}[period]
+
+bar_size = st.sidebar.radio("Bar Size", ["Daily", "1 Minute"], horizontal=True)
+interval = '1d' if bar_size == "Daily" else '1m'
+periods_per_year = 252 if interval == '1d' else 252 * MINUTES_PER_SESSION
+
+rank_by = st.sidebar.selectbox("Rank By", list(METRIC_LABELS), format_func=METRIC_LABELS.get, index=2)
+top_n = st.sidebar.slider("Lines in performance chart", 2, 20, 8)
+
+# Deduplicate while keeping the user's order; the tuple is the cache key
+tickers = [t.strip().upper() for t in watchlist_text.split(',') if t.strip()]
+tickers += [f"SYN{i:03d}" for i in range(1, n_synthetic + 1)]
+tickers = tuple(dict.fromkeys(tickers))
+
+if interval == '1m':
+    max_days = max(1, MAX_MATRIX_CELLS // (MINUTES_PER_SESSION * max(len(tickers), 1)))
+    if days > max_days:
+        st.sidebar.warning(f"1-minute bars for {len(tickers)} tickers are limited to "
+                           f"the last {max_days} sessions")
+        days = max_days
+
+# ============================================================
+# Main Content
+# ============================================================
+
+st.markdown(f"# 📊 Watchlist Comparison ({len(tickers)} tickers)")
+
+if len(tickers) < 2:
+    st.info("Add at least two tickers to compare.")
+    st.stop()
+
+closes = load_close_matrix(tickers, days, interval)
+returns = load_returns_matrix(tickers, days, interval)
+metrics = calculate_metrics_table(closes, periods_per_year, returns)
+ranked = metrics.sort_values(rank_by, ascending=(rank_by in ('volatility',)))
+
+# ============================================================
+# Ranked Metrics
+# ============================================================
+
+st.markdown("### 🏆 Ranked Metrics")
+
+display = ranked[['current_price', 'change_pct', 'annual_return', 'volatility', 'sharpe', 'max_drawdown']]
+st.dataframe(
+    display.style.format({
+        'current_price': '${:.2f}',
+        'change_pct': '{:+.2f}%',
+        'annual_return': '{:.1%}',
+        'volatility': '{:.1%}',
+        'sharpe': '{:.2f}',
+        'max_drawdown': '{:.1%}',
+    }),
+    use_container_width=True,
+    height=min(400, 35 * (len(display) + 1)),
+)
+
+col_perf, col_corr = st.columns(2)
+
+# ============================================================
+# Relative Performance
+# ============================================================
+
+with col_perf:
+    st.markdown(f"### 📈 Relative Performance (top & bottom by {METRIC_LABELS[rank_by]})")
+
+    shown = list(dict.fromkeys(list(ranked.index[:top_n // 2]) + list(ranked.index[-(top_n - top_n // 2):])))
+    normalized = closes[shown] / closes[shown].iloc[0] * 100
+    max_points = points_for_width(800, points_per_pixel=2)
+
+    fig_perf = go.Figure()
+    for ticker in shown:
+        idx = lttb_indices(normalized.index, normalized[ticker], max_points)
+        fig_perf.add_trace(go.Scattergl(
+            x=normalized.index[idx], y=normalized[ticker].iloc[idx],
+            mode='lines', name=ticker, line=dict(width=1)
+        ))
+    fig_perf.update_layout(
+        height=450,
+        template='plotly_white',
+        yaxis_title='Normalized (Base=100)',
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    st.plotly_chart(fig_perf, use_container_width=True)
+
+# ============================================================
+# Correlation Heatmap
+# ============================================================
+
+with col_corr:
+    st.markdown("### 🔗 Return Correlations")
+
+    corr = np.corrcoef(returns.to_numpy(), rowvar=False)
+    order = ranked.index.get_indexer(closes.columns).argsort()
+    corr = corr[np.ix_(order, order)]
+    labels = closes.columns[order]
+
+    fig_corr = px.imshow(
+        corr, x=labels, y=labels,
+        color_continuous_scale='RdBu_r', zmin=-1, zmax=1,
+        aspect='auto'
+    )
+    fig_corr.update_layout(height=450, margin=dict(l=0, r=0, t=30, b=0))
+    st.plotly_chart(fig_corr, use_container_width=True)
+
+avg_corr = (corr.sum() - len(corr)) / (len(corr) * (len(corr) - 1))
+st.caption(f"Average pairwise correlation: {avg_corr:.3f} · matrix {closes.shape[0]:,} bars × {closes.shape[1]} tickers")
+
+st.markdown("---")
+st.markdown(
+    """
+    <div style='text-align: center; color: #666; font-size: 0.9rem;'>
+        📊 Python Finance Academy | Financial Dashboard Demo<br>
+        Data is simulated for educational purposes only
+    </div>
+    """,
+    unsafe_allow_html=True
+)
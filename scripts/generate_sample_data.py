@@ -1,152 +1,465 @@
 """
 Generate Sample Financial Data
 ================================
-This script creates realistic sample datasets for the curriculum.
+This script creates realistic sample datasets for the curriculum, and large
+synthetic price fixtures for load tests.
+
+Usage:
+    # Curriculum datasets -> data/
+    python generate_sample_data.py
+
+    # Streamed price fixture, e.g. 10k tickers x 20 years of minute bars
+    python generate_sample_data.py prices --tickers 10000 --years 20 \\
+        --freq 1min --format npy --out ../data/fixtures/minute_10k
+
+    # Sector-correlated, fat-tailed, volatility-clustered fixture for stress tests
+    python generate_sample_data.py prices --tickers 500 --model correlated \\
+        --t-df 4 --garch --out ../data/fixtures/stress_500
+
+Fixtures are generated in (ticker block x time block) chunks and written as
+they are produced, so memory use is bounded by --chunk-cells, not by the
+size of the dataset. All randomness comes from seeded numpy Generators:
+the same arguments always produce the same files.
 """
 
-import pandas as pd
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
 import numpy as np
-from datetime import datetime, timedelta
+import pandas as pd
+
+from market_simulator import MarketSimulator, synthetic_sectors
+from price_store import PRICES_DIR
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+DEFAULT_SEED = 42
+
+SAMPLE_TICKERS = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']
+
+# Bars per regular 09:30-16:00 session for each supported frequency
+BARS_PER_DAY = {'1d': 1, '1h': 7, '5min': 78, '1min': 390}
+BAR_MINUTES = {'1h': 60, '5min': 5, '1min': 1}
+TRADING_DAYS_PER_YEAR = 252
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
 
-np.random.seed(42)
 
 # ============================================================
 # 1. Stock Prices Dataset
 # ============================================================
 
-def generate_stock_prices(ticker, start_date='2020-01-01', periods=1260):
+def generate_stock_prices(ticker, rng, start_date='2020-01-01', periods=1260):
     """Generate realistic stock price data."""
     dates = pd.date_range(start=start_date, periods=periods, freq='B')
-    
+
     # Random walk with drift
-    returns = np.random.normal(0.0005, 0.015, periods)
+    returns = rng.normal(0.0005, 0.015, periods)
     prices = 100 * np.exp(np.cumsum(returns))
-    
+
     # Generate OHLCV
     df = pd.DataFrame({
         'Date': dates,
-        'Open': prices * (1 + np.random.normal(0, 0.005, periods)),
-        'High': prices * (1 + np.abs(np.random.normal(0, 0.01, periods))),
-        'Low': prices * (1 - np.abs(np.random.normal(0, 0.01, periods))),
+        'Open': prices * (1 + rng.normal(0, 0.005, periods)),
+        'High': prices * (1 + np.abs(rng.normal(0, 0.01, periods))),
+        'Low': prices * (1 - np.abs(rng.normal(0, 0.01, periods))),
         'Close': prices,
-        'Volume': np.random.randint(1000000, 10000000, periods)
+        'Volume': rng.integers(1000000, 10000000, periods)
     })
-    
+
     df['Ticker'] = ticker
     return df
 
-# Generate for multiple stocks
-tickers = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']
-all_stocks = pd.concat([generate_stock_prices(t) for t in tickers])
-all_stocks.to_csv('../data/sample_stock_prices.csv', index=False)
-print("✅ Created: data/sample_stock_prices.csv")
 
 # ============================================================
 # 2. Portfolio Holdings Dataset
 # ============================================================
 
-portfolio_data = pd.DataFrame({
-    'Ticker': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META'],
-    'Shares': [50, 20, 30, 25, 15, 40, 18],
-    'AvgCost': [150.00, 125.00, 350.00, 165.00, 220.00, 280.00, 310.00],
-    'Sector': ['Technology', 'Technology', 'Technology', 'Consumer', 'Automotive', 'Technology', 'Technology'],
-    'PurchaseDate': pd.to_datetime(['2022-01-15', '2022-02-20', '2021-11-05', '2022-03-10', 
-                                     '2021-12-01', '2022-04-15', '2022-05-20'])
-})
-portfolio_data.to_csv('../data/sample_portfolio.csv', index=False)
-print("✅ Created: data/sample_portfolio.csv")
+def generate_portfolio():
+    """Sample portfolio holdings."""
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META'],
+        'Shares': [50, 20, 30, 25, 15, 40, 18],
+        'AvgCost': [150.00, 125.00, 350.00, 165.00, 220.00, 280.00, 310.00],
+        'Sector': ['Technology', 'Technology', 'Technology', 'Consumer', 'Automotive', 'Technology', 'Technology'],
+        'PurchaseDate': pd.to_datetime(['2022-01-15', '2022-02-20', '2021-11-05', '2022-03-10',
+                                        '2021-12-01', '2022-04-15', '2022-05-20'])
+    })
+
 
 # ============================================================
 # 3. Financial Ratios Dataset
 # ============================================================
 
-financial_ratios = pd.DataFrame({
-    'Ticker': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA'],
-    'PE_Ratio': [28.5, 24.3, 34.2, 58.1, 52.4],
-    'PB_Ratio': [45.2, 6.1, 11.8, 12.3, 15.2],
-    'ROE': [1.472, 0.291, 0.442, 0.185, 0.234],
-    'DebtToEquity': [1.96, 0.09, 0.41, 0.71, 0.32],
-    'CurrentRatio': [0.93, 2.46, 1.78, 1.09, 1.52],
-    'ProfitMargin': [0.256, 0.214, 0.369, 0.053, 0.152],
-    'RevenueGrowth': [0.085, 0.112, 0.067, 0.095, 0.238]
-})
-financial_ratios.to_csv('../data/financial_ratios.csv', index=False)
-print("✅ Created: data/financial_ratios.csv")
+def generate_financial_ratios():
+    """Key financial ratios for the sample tickers."""
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA'],
+        'PE_Ratio': [28.5, 24.3, 34.2, 58.1, 52.4],
+        'PB_Ratio': [45.2, 6.1, 11.8, 12.3, 15.2],
+        'ROE': [1.472, 0.291, 0.442, 0.185, 0.234],
+        'DebtToEquity': [1.96, 0.09, 0.41, 0.71, 0.32],
+        'CurrentRatio': [0.93, 2.46, 1.78, 1.09, 1.52],
+        'ProfitMargin': [0.256, 0.214, 0.369, 0.053, 0.152],
+        'RevenueGrowth': [0.085, 0.112, 0.067, 0.095, 0.238]
+    })
+
+
+def generate_fundamentals():
+    """Balance sheet / income items for Altman Z'' scoring (USD billions)."""
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META'],
+        'CurrentAssets': [143.6, 171.5, 184.3, 172.4, 49.6, 44.3, 85.4],
+        'CurrentLiabilities': [145.3, 81.8, 104.1, 164.9, 28.7, 10.6, 32.0],
+        'TotalAssets': [352.6, 402.4, 411.9, 527.9, 106.6, 65.7, 229.6],
+        'TotalLiabilities': [290.4, 119.0, 205.8, 326.0, 43.0, 22.8, 76.5],
+        'RetainedEarnings': [-0.2, 211.2, 118.8, 113.6, 27.9, 29.8, 82.1],
+        'EBIT': [114.3, 84.3, 88.5, 36.9, 8.9, 33.0, 46.8],
+        'MarketCap': [2990.0, 1760.0, 2790.0, 1570.0, 790.0, 1220.0, 910.0],
+    })
+
 
 # ============================================================
 # 4. Options Chain Dataset
 # ============================================================
 
-strike_prices = np.arange(80, 121, 5)
-options_data = []
+def generate_options_chain(rng, spot=100, strikes=np.arange(80, 121, 5)):
+    """Calls and puts for every strike, interleaved Call/Put per strike."""
+    n = len(strikes)
+    strike = np.repeat(strikes, 2)
+    is_call = np.tile([True, False], n)
+    intrinsic = np.where(is_call, spot - strike, strike - spot)
 
-for strike in strike_prices:
-    # Call options
-    options_data.append({
-        'Type': 'Call',
-        'Strike': strike,
-        'Bid': max(0.05, 100 - strike + np.random.uniform(-2, 2)),
-        'Ask': max(0.10, 100 - strike + np.random.uniform(-1, 3)),
-        'IV': 0.25 + np.random.uniform(-0.05, 0.05),
-        'Delta': max(0, min(1, 0.5 + (100-strike)/50)),
-        'Volume': np.random.randint(0, 5000)
-    })
-    
-    # Put options
-    options_data.append({
-        'Type': 'Put',
+    return pd.DataFrame({
+        'Type': np.where(is_call, 'Call', 'Put'),
         'Strike': strike,
-        'Bid': max(0.05, strike - 100 + np.random.uniform(-2, 2)),
-        'Ask': max(0.10, strike - 100 + np.random.uniform(-1, 3)),
-        'IV': 0.25 + np.random.uniform(-0.05, 0.05),
-        'Delta': min(0, max(-1, -0.5 + (100-strike)/50)),
-        'Volume': np.random.randint(0, 5000)
+        'Bid': np.maximum(0.05, intrinsic + rng.uniform(-2, 2, 2 * n)),
+        'Ask': np.maximum(0.10, intrinsic + rng.uniform(-1, 3, 2 * n)),
+        'IV': 0.25 + rng.uniform(-0.05, 0.05, 2 * n),
+        'Delta': np.where(is_call,
+                          np.clip(0.5 + (spot - strike) / 50, 0, 1),
+                          np.clip(-0.5 + (spot - strike) / 50, -1, 0)),
+        'Volume': rng.integers(0, 5000, 2 * n)
     })
 
-options_df = pd.DataFrame(options_data)
-options_df.to_csv('../data/sample_options_chain.csv', index=False)
-print("✅ Created: data/sample_options_chain.csv")
 
 # ============================================================
 # 5. Economic Indicators Dataset
 # ============================================================
 
-dates = pd.date_range('2020-01-01', '2024-12-31', freq='ME')
-economic_data = pd.DataFrame({
-    'Date': dates,
-    'GDP_Growth': np.random.normal(2.5, 1.0, len(dates)),
-    'Unemployment': np.maximum(3.5, 10 - np.linspace(0, 6, len(dates)) + np.random.normal(0, 0.3, len(dates))),
-    'Inflation': np.maximum(0, 2 + np.random.normal(0, 1.5, len(dates))),
-    'Interest_Rate': np.maximum(0, 5 - np.linspace(0, 4, len(dates)) + np.random.normal(0, 0.2, len(dates))),
-    'VIX': np.maximum(10, 20 + np.random.normal(0, 5, len(dates)))
-})
-economic_data.to_csv('../data/economic_indicators.csv', index=False)
-print("✅ Created: data/economic_indicators.csv")
+def generate_economic_indicators(rng):
+    """Monthly macro indicators, 2020-2024."""
+    dates = pd.date_range('2020-01-01', '2024-12-31', freq='ME')
+    n = len(dates)
+    return pd.DataFrame({
+        'Date': dates,
+        'GDP_Growth': rng.normal(2.5, 1.0, n),
+        'Unemployment': np.maximum(3.5, 10 - np.linspace(0, 6, n) + rng.normal(0, 0.3, n)),
+        'Inflation': np.maximum(0, 2 + rng.normal(0, 1.5, n)),
+        'Interest_Rate': np.maximum(0, 5 - np.linspace(0, 4, n) + rng.normal(0, 0.2, n)),
+        'VIX': np.maximum(10, 20 + rng.normal(0, 5, n))
+    })
+
 
 # ============================================================
 # 6. Transaction History
 # ============================================================
 
-transactions = []
-for _ in range(100):
-    transactions.append({
-        'Date': datetime(2024, 1, 1) + timedelta(days=np.random.randint(0, 365)),
-        'Ticker': np.random.choice(['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']),
-        'Type': np.random.choice(['Buy', 'Sell']),
-        'Shares': np.random.randint(10, 100),
-        'Price': np.random.uniform(100, 400),
+def generate_transactions(rng, n=100):
+    """Random buy/sell fills during 2024, sorted by date."""
+    transactions = pd.DataFrame({
+        'Date': pd.Timestamp(datetime(2024, 1, 1)) + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        'Ticker': rng.choice(SAMPLE_TICKERS, n),
+        'Type': rng.choice(['Buy', 'Sell'], n),
+        'Shares': rng.integers(10, 100, n),
+        'Price': rng.uniform(100, 400, n),
         'Commission': 0
     })
+    return transactions.sort_values('Date', kind='stable')
+
+
+def write_sample_datasets(out_dir=DATA_DIR, seed=DEFAULT_SEED):
+    """Write the seven curriculum datasets to `out_dir`."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    datasets = [
+        ('sample_stock_prices.csv', pd.concat([generate_stock_prices(t, rng) for t in SAMPLE_TICKERS])),
+        ('sample_portfolio.csv', generate_portfolio()),
+        ('financial_ratios.csv', generate_financial_ratios()),
+        ('fundamentals.csv', generate_fundamentals()),
+        ('sample_options_chain.csv', generate_options_chain(rng)),
+        ('economic_indicators.csv', generate_economic_indicators(rng)),
+        ('transaction_history.csv', generate_transactions(rng)),
+    ]
+    for name, df in datasets:
+        df.to_csv(out_dir / name, index=False)
+        print(f"✅ Created: {out_dir.name}/{name}")
+
+    print("\n✅ All sample datasets created successfully!")
+    print("\nDatasets available:")
+    print("  1. sample_stock_prices.csv - 5 stocks, 5 years of data")
+    print("  2. sample_portfolio.csv - Sample portfolio holdings")
+    print("  3. financial_ratios.csv - Key financial metrics")
+    print("  4. sample_options_chain.csv - Options chain data")
+    print("  5. economic_indicators.csv - Macro economic data")
+    print("  6. transaction_history.csv - Trading history")
+    print("  7. fundamentals.csv - Balance sheet items for credit scoring")
+
+
+# ============================================================
+# 7. Large Price Fixtures (streamed)
+# ============================================================
+
+def bar_timestamps(years, freq, start_date='2005-01-03'):
+    """Bar timestamps (datetime64[ns]) for `years` of business days at `freq`."""
+    sessions = pd.bdate_range(start=start_date, periods=int(years * TRADING_DAYS_PER_YEAR))
+    if freq == '1d':
+        return sessions.values
+
+    offsets = pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(
+        np.arange(BARS_PER_DAY[freq]) * BAR_MINUTES[freq], unit='min')
+    return (sessions.values[:, None] + offsets.values[None, :]).ravel()
+
+
+def ticker_names(n):
+    """Synthetic ticker symbols T00000, T00001, ..."""
+    width = max(5, len(str(n - 1)))
+    return [f"T{i:0{width}d}" for i in range(n)]
+
+
+def iter_price_chunks(n_tickers, n_bars, freq, seed=DEFAULT_SEED,
+                      tickers_per_chunk=100, chunk_cells=2_000_000):
+    """
+    Yield (ticker slice, bar slice, fields) blocks of a synthetic OHLCV panel.
+
+    `fields` maps Open/High/Low/Close/Volume to arrays shaped
+    (tickers in block, bars in block). Each ticker block has its own
+    Generator seeded from (seed, block index), and the last close is
+    carried from one time block to the next, so blocks stitch into
+    continuous price paths.
+    """
+    bars_per_year = TRADING_DAYS_PER_YEAR * BARS_PER_DAY[freq]
+    bars_per_chunk = max(1, chunk_cells // tickers_per_chunk)
+
+    for block, t0 in enumerate(range(0, n_tickers, tickers_per_chunk)):
+        t1 = min(t0 + tickers_per_chunk, n_tickers)
+        k = t1 - t0
+        rng = np.random.default_rng([seed, block])
+
+        # Per-ticker annual drift/vol, scaled to one bar
+        mu = rng.normal(0.06, 0.10, k)[:, None] / bars_per_year
+        sigma = rng.uniform(0.15, 0.60, k)[:, None] / np.sqrt(bars_per_year)
+        log_volume = rng.normal(np.log(5e6 / BARS_PER_DAY[freq]), 0.5, k)[:, None]
+        last_close = rng.uniform(20, 500, k)
+
+        for b0 in range(0, n_bars, bars_per_chunk):
+            b1 = min(b0 + bars_per_chunk, n_bars)
+            z = rng.standard_normal((5, k, b1 - b0))
+
+            close = last_close[:, None] * np.exp(np.cumsum(mu - 0.5 * sigma**2 + sigma * z[0], axis=1))
+            prev_close = np.concatenate([last_close[:, None], close[:, :-1]], axis=1)
+            open_ = prev_close * np.exp(0.1 * sigma * z[1])
+            high = np.maximum(open_, close) * np.exp(0.5 * sigma * np.abs(z[2]))
+            low = np.minimum(open_, close) * np.exp(-0.5 * sigma * np.abs(z[3]))
+            volume = np.exp(log_volume + 0.4 * z[4]).astype(np.int64)
+            last_close = close[:, -1]
+
+            yield slice(t0, t1), slice(b0, b1), {
+                'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+            }
+
+
+class NpyFixtureWriter:
+    """
+    One .npy per field, shaped (tickers, bars).
+
+    Files are memory-mapped one ticker block at a time and unmapped when the
+    block is done, so resident memory stays at about one block.
+    """
+
+    def __init__(self, out_dir, tickers, timestamps):
+        self.paths = {field: out_dir / f'{field.lower()}.npy' for field in FIELDS}
+        np.save(out_dir / 'timestamps.npy', timestamps.astype('datetime64[ns]'))
+        shape = (len(tickers), len(timestamps))
+        for field, path in self.paths.items():
+            dtype = np.int64 if field == 'Volume' else np.float32
+            np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape).flush()
+        self.arrays = None
+        self.block_start = None
+
+    def write(self, rows, cols, fields):
+        if rows.start != self.block_start:
+            self.close()
+            self.block_start = rows.start
+            self.arrays = {f: np.load(p, mmap_mode='r+') for f, p in self.paths.items()}
+        for field, values in fields.items():
+            self.arrays[field][rows, cols] = values
+
+    def close(self):
+        if self.arrays:
+            for arr in self.arrays.values():
+                arr.flush()
+        self.arrays = None
+
+
+class ParquetFixtureWriter:
+    """Long-format Parquet, one file per ticker block, one row group per chunk."""
+
+    def __init__(self, out_dir, tickers, timestamps):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SystemExit("❌ --format parquet needs pyarrow (pip install pyarrow)") from exc
+        self.pa, self.pq = pa, pq
+        self.out_dir = out_dir
+        self.tickers = pa.array(tickers)
+        self.timestamps = timestamps
+        self.writer = None
+        self.block_start = None
+
+    def write(self, rows, cols, fields):
+        pa = self.pa
+        if rows.start != self.block_start:
+            self.close()
+            self.block_start = rows.start
+            self.writer = None
+
+        k, n = fields['Close'].shape
+        table = pa.table({
+            'Timestamp': np.tile(self.timestamps[cols], k),
+            'Ticker': pa.DictionaryArray.from_arrays(
+                np.repeat(np.arange(rows.start, rows.stop, dtype=np.int32), n), self.tickers),
+            **{f: (fields[f].ravel() if f == 'Volume' else fields[f].astype(np.float32).ravel())
+               for f in FIELDS},
+        })
+        if self.writer is None:
+            path = self.out_dir / f'part-{rows.start:06d}.parquet'
+            self.writer = self.pq.ParquetWriter(path, table.schema, compression='zstd')
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class CsvFixtureWriter:
+    """Long-format CSV appended chunk by chunk (only sensible for small fixtures)."""
+
+    def __init__(self, out_dir, tickers, timestamps):
+        self.path = out_dir / 'prices.csv'
+        self.tickers = np.asarray(tickers)
+        self.timestamps = timestamps
+        self.header = True
+
+    def write(self, rows, cols, fields):
+        k, n = fields['Close'].shape
+        pd.DataFrame({
+            'Timestamp': np.tile(self.timestamps[cols], k),
+            'Ticker': np.repeat(self.tickers[rows], n),
+            **{f: fields[f].ravel() for f in FIELDS},
+        }).to_csv(self.path, mode='w' if self.header else 'a', header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+WRITERS = {'npy': NpyFixtureWriter, 'parquet': ParquetFixtureWriter, 'csv': CsvFixtureWriter}
+
+
+def write_price_fixture(out_dir, n_tickers, years, freq='1d', fmt='npy', seed=DEFAULT_SEED,
+                        tickers_per_chunk=100, chunk_cells=2_000_000, simulator=None):
+    """
+    Stream a synthetic OHLCV panel to `out_dir`/prices and write
+    `out_dir`/manifest.json beside it.
+
+    With a ``MarketSimulator`` the whole universe is drawn together (one
+    ticker block, time chunks of `chunk_cells` / tickers bars) so its
+    correlation structure is preserved; otherwise tickers are independent.
+    """
+    out_dir = Path(out_dir)
+    data_dir = out_dir / PRICES_DIR
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    tickers = simulator.tickers if simulator else ticker_names(n_tickers)
+    timestamps = bar_timestamps(years, freq)
+    writer = WRITERS[fmt](data_dir, tickers, timestamps)
+
+    if simulator:
+        chunks = simulator.iter_ohlcv_chunks(len(timestamps), max(1, chunk_cells // n_tickers))
+    else:
+        chunks = iter_price_chunks(n_tickers, len(timestamps), freq, seed, tickers_per_chunk, chunk_cells)
+
+    total = n_tickers * len(timestamps)
+    print(f"🏭 Generating {n_tickers:,} tickers × {len(timestamps):,} bars ({total:,} rows) as {fmt}")
+
+    done = 0
+    for rows, cols, fields in chunks:
+        writer.write(rows, cols, fields)
+        done += fields['Close'].size
+        if cols.stop == len(timestamps):
+            print(f"  {done / total:6.1%}  tickers {rows.start:,}-{rows.stop - 1:,}")
+    writer.close()
+
+    manifest = {
+        'format': fmt, 'freq': freq, 'years': years, 'seed': seed,
+        'model': 'correlated' if simulator else 'independent',
+        'n_tickers': n_tickers, 'n_bars': len(timestamps),
+        'start': str(timestamps[0]), 'end': str(timestamps[-1]),
+        'fields': FIELDS, 'layout': 'tickers x bars' if fmt == 'npy' else 'long',
+        'path': PRICES_DIR,
+        'tickers_per_chunk': tickers_per_chunk, 'chunk_cells': chunk_cells,
+        'tickers': tickers,
+    }
+    (out_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+    print(f"✅ Fixture written to {out_dir}")
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate sample financial datasets and price fixtures')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Random seed')
+    sub = parser.add_subparsers(dest='command')
+
+    samples = sub.add_parser('samples', help='Curriculum datasets (default)')
+    samples.add_argument('--out', type=Path, default=DATA_DIR, help='Output directory')
+
+    prices = sub.add_parser('prices', help='Large streamed OHLCV fixture for load tests')
+    prices.add_argument('--tickers', type=int, default=100, help='Number of tickers')
+    prices.add_argument('--years', type=float, default=5, help='Years of history')
+    prices.add_argument('--freq', choices=list(BARS_PER_DAY), default='1d', help='Bar frequency')
+    prices.add_argument('--format', dest='fmt', choices=list(WRITERS), default='npy', help='Output format')
+    prices.add_argument('--out', type=Path, default=DATA_DIR / 'fixtures', help='Output directory')
+    prices.add_argument('--tickers-per-chunk', type=int, default=100, help='Tickers generated together')
+    prices.add_argument('--chunk-cells', type=int, default=2_000_000,
+                        help='Bars x tickers per chunk (bounds memory use)')
+    prices.add_argument('--model', choices=['independent', 'correlated'], default='independent',
+                        help='Independent random walks or the sector-factor market simulator')
+    prices.add_argument('--sectors', type=int, default=11, help='Sectors (correlated model)')
+    prices.add_argument('--t-df', type=float, default=None, help='Student-t shocks (correlated model)')
+    prices.add_argument('--garch', action='store_true', help='GARCH(1,1) volatility (correlated model)')
+
+    args = parser.parse_args()
+
+    if args.command == 'prices':
+        simulator = None
+        if args.model == 'correlated':
+            simulator = MarketSimulator(
+                synthetic_sectors(args.tickers, args.sectors, args.seed),
+                t_df=args.t_df, garch=(0.08, 0.90) if args.garch else None,
+                periods_per_year=TRADING_DAYS_PER_YEAR * BARS_PER_DAY[args.freq], seed=args.seed)
+        write_price_fixture(args.out, args.tickers, args.years, args.freq, args.fmt, args.seed,
+                            args.tickers_per_chunk, args.chunk_cells, simulator)
+    else:
+        write_sample_datasets(getattr(args, 'out', DATA_DIR), args.seed)
+
 
-transactions_df = pd.DataFrame(transactions).sort_values('Date')
-transactions_df.to_csv('../data/transaction_history.csv', index=False)
-print("✅ Created: data/transaction_history.csv")
-
-print("\n✅ All sample datasets created successfully!")
-print("\nDatasets available:")
-print("  1. sample_stock_prices.csv - 5 stocks, 5 years of data")
-print("  2. sample_portfolio.csv - Sample portfolio holdings")
-print("  3. financial_ratios.csv - Key financial metrics")
-print("  4. sample_options_chain.csv - Options chain data")
-print("  5. economic_indicators.csv - Macro economic data")
-print("  6. transaction_history.csv - Trading history")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Columnar Price Store
+====================
+Converts the CSV datasets in data/ into a binary, columnar store once, so
+later runs can load just the slice they need instead of parsing whole files.
+
+Two layouts are supported:
+
+- npy (default): one directory per ticker holding a sorted date index and
+  one .npy per field. Queries memory-map the files and binary-search the
+  dates, so only the requested rows are touched.
+- parquet: hive-partitioned by ticker and year (zstd-compressed, needs
+  pyarrow). Queries prune partitions before reading.
+
+Usage:
+    python price_store.py build                  # data/*.csv -> data/store/
+    python price_store.py build --format parquet
+    python price_store.py query AAPL --start 2023-01-01 --end 2023-03-31
+
+    from price_store import PriceStore
+    store = PriceStore()
+    aapl = store.prices('AAPL', '2023-01-01', '2023-03-31')
+    closes = store.closes(['AAPL', 'MSFT'])
+    curve = store.yield_curve('2008-01-01', '2008-12-31')
+"""
+
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+STORE_DIR = DATA_DIR / 'store'
+PRICES_CSV = DATA_DIR / 'sample_stock_prices.csv'
+YIELD_CURVE_CSV = DATA_DIR / 'yield_curve.csv'
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+STORE_VERSION = 1
+
+# Price data lives in this subdirectory, with manifest.json beside it, so the
+# directory holds only data files (e.g. pd.read_parquet(root / PRICES_DIR))
+PRICES_DIR = 'prices'
+
+
+# ============================================================
+# CSV Parsing
+# ============================================================
+
+def read_prices_csv(path=PRICES_CSV):
+    """Long-format OHLCV CSV (Date, Ticker, fields) sorted by ticker and date."""
+    df = pd.read_csv(path, parse_dates=['Date'])
+    return df.sort_values(['Ticker', 'Date'], kind='stable', ignore_index=True)
+
+
+def read_yield_curve_csv(path=YIELD_CURVE_CSV):
+    """
+    Parse yield_curve.csv into (dates, tenors, rates).
+
+    The file stores one date per row in column `y` and one tenor per `z[i]`
+    column; the tenor labels sit in the first rows of column `x`. Missing
+    quotes are the string 'None' and become NaN.
+    """
+    df = pd.read_csv(path, na_values=['None'])
+    value_cols = [c for c in df.columns if c.startswith('z[')]
+    tenors = df['x'].dropna().tolist()[:len(value_cols)]
+    dates = pd.to_datetime(df['y']).to_numpy(dtype='datetime64[ns]')
+    rates = df[value_cols].to_numpy(dtype=float)
+    order = np.argsort(dates, kind='stable')
+    return dates[order], tenors, rates[order]
+
+
+# ============================================================
+# Building
+# ============================================================
+
+def _write_npy_prices(prices, root):
+    tickers = {}
+    for ticker, group in prices.groupby('Ticker', sort=True):
+        folder = root / PRICES_DIR / ticker
+        folder.mkdir(parents=True, exist_ok=True)
+        dates = group['Date'].to_numpy(dtype='datetime64[ns]')
+        np.save(folder / 'date.npy', dates)
+        for field in FIELDS:
+            if field in group:
+                np.save(folder / f'{field.lower()}.npy', group[field].to_numpy())
+        tickers[ticker] = {'rows': len(group), 'start': str(dates[0]), 'end': str(dates[-1])}
+    return tickers
+
+
+def _write_parquet_prices(prices, root):
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as exc:
+        raise SystemExit("❌ --format parquet needs pyarrow (pip install pyarrow)") from exc
+
+    table = pa.Table.from_pandas(prices.assign(Year=prices['Date'].dt.year), preserve_index=False)
+    ds.write_dataset(
+        table, root / PRICES_DIR, format='parquet',
+        partitioning=ds.partitioning(pa.schema([('Ticker', pa.string()), ('Year', pa.int32())]),
+                                     flavor='hive'),
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+        existing_data_behavior='delete_matching',
+    )
+    summary = prices.groupby('Ticker')['Date'].agg(['size', 'min', 'max'])
+    return {t: {'rows': int(r['size']), 'start': str(r['min']), 'end': str(r['max'])}
+            for t, r in summary.iterrows()}
+
+
+def build_store(root=STORE_DIR, prices_csv=PRICES_CSV, yield_csv=YIELD_CURVE_CSV, fmt='npy'):
+    """Convert the price and yield curve CSVs into a store at `root` (replacing it)."""
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    prices = read_prices_csv(prices_csv)
+    writer = _write_npy_prices if fmt == 'npy' else _write_parquet_prices
+    tickers = writer(prices, root)
+    print(f"✅ Prices: {len(prices):,} rows, {len(tickers)} tickers ({fmt})")
+
+    manifest = {'version': STORE_VERSION, 'format': fmt, 'fields': FIELDS, 'tickers': tickers}
+
+    if yield_csv and Path(yield_csv).exists():
+        dates, tenors, rates = read_yield_curve_csv(yield_csv)
+        folder = root / 'yield_curve'
+        folder.mkdir()
+        np.save(folder / 'date.npy', dates)
+        np.save(folder / 'rates.npy', rates)
+        manifest['yield_curve'] = {'tenors': tenors, 'rows': len(dates)}
+        print(f"✅ Yield curve: {len(dates):,} dates × {len(tenors)} tenors")
+
+    (root / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+    print(f"📦 Store written to {root}")
+
+
+# ============================================================
+# Querying
+# ============================================================
+
+def _date_slice(dates, start, end):
+    """Row slice of a sorted datetime64 array covering [start, end]."""
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left')
+    hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), 'right')
+    return slice(int(lo), int(hi))
+
+
+class PriceStore:
+    """Read-only access to a store built by `build_store`."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        manifest_path = self.root / 'manifest.json'
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No price store at {self.root}; run `python price_store.py build` first")
+        self.manifest = json.loads(manifest_path.read_text())
+        self.format = self.manifest['format']
+
+    @property
+    def tickers(self):
+        return list(self.manifest['tickers'])
+
+    def prices(self, ticker, start=None, end=None, fields=None):
+        """OHLCV rows of one ticker between `start` and `end` (inclusive), indexed by Date."""
+        if ticker not in self.manifest['tickers']:
+            raise KeyError(f"{ticker} not in store")
+        fields = fields or self.manifest['fields']
+
+        if self.format == 'parquet':
+            return self._parquet_prices(ticker, start, end, fields)
+
+        folder = self.root / PRICES_DIR / ticker
+        dates = np.load(folder / 'date.npy', mmap_mode='r')
+        rows = _date_slice(dates, start, end)
+        data = {f: np.load(folder / f'{f.lower()}.npy', mmap_mode='r')[rows] for f in fields}
+        return pd.DataFrame(data, index=pd.DatetimeIndex(dates[rows], name='Date'))
+
+    def _parquet_prices(self, ticker, start, end, fields):
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(self.root / PRICES_DIR, format='parquet', partitioning='hive')
+        condition = ds.field('Ticker') == ticker
+        if start is not None:
+            start = pd.Timestamp(start)
+            condition &= (ds.field('Year') >= start.year) & (ds.field('Date') >= start)
+        if end is not None:
+            end = pd.Timestamp(end)
+            condition &= (ds.field('Year') <= end.year) & (ds.field('Date') <= end)
+
+        df = dataset.to_table(columns=['Date', *fields], filter=condition).to_pandas()
+        return df.sort_values('Date', kind='stable').set_index('Date')
+
+    def closes(self, tickers=None, start=None, end=None, field='Close'):
+        """Wide dates × tickers matrix of one field (outer-joined on dates)."""
+        tickers = tickers or self.tickers
+        columns = {t: self.prices(t, start, end, [field])[field] for t in tickers}
+        return pd.DataFrame(columns).sort_index()
+
+    def yield_curve(self, start=None, end=None, tenors=None):
+        """Yield curve rows between `start` and `end`, dates × tenors (NaN where unquoted)."""
+        if 'yield_curve' not in self.manifest:
+            raise KeyError("store has no yield curve")
+        all_tenors = self.manifest['yield_curve']['tenors']
+        cols = [all_tenors.index(t) for t in tenors] if tenors else list(range(len(all_tenors)))
+
+        folder = self.root / 'yield_curve'
+        dates = np.load(folder / 'date.npy', mmap_mode='r')
+        rows = _date_slice(dates, start, end)
+        rates = np.load(folder / 'rates.npy', mmap_mode='r')[rows][:, cols]
+        return pd.DataFrame(rates, index=pd.DatetimeIndex(dates[rows], name='Date'),
+                            columns=[all_tenors[c] for c in cols])
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the columnar price store')
+    parser.add_argument('--root', type=Path, default=STORE_DIR, help='Store directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='Convert data/*.csv into the store')
+    build.add_argument('--format', dest='fmt', choices=['npy', 'parquet'], default='npy')
+    build.add_argument('--prices', type=Path, default=PRICES_CSV, help='Long-format OHLCV CSV')
+    build.add_argument('--yield-curve', type=Path, default=YIELD_CURVE_CSV, help='Yield curve CSV')
+
+    query = sub.add_parser('query', help='Print a ticker/date-range slice')
+    query.add_argument('ticker')
+    query.add_argument('--start')
+    query.add_argument('--end')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_store(args.root, args.prices, args.yield_curve, args.fmt)
+    else:
+        t0 = time.perf_counter()
+        df = PriceStore(args.root).prices(args.ticker, args.start, args.end)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(df.to_string(max_rows=20))
+        print(f"\n⏱️  {len(df):,} rows in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()